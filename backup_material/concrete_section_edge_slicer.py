@@ -6,7 +6,13 @@ Created on Fri Feb 07 15:46:59 2020
 """
 from __future__ import division
 
-import matplotlib.pyplot as plt
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from concretexsection import plotting
+from concretexsection.stress_strain.section_slicer import slice_segments, stress_band_bounds
 
 # Function to take x and y section coordinates and create lists of
 # segment coordinates pairs that fit in the bounds of integration
@@ -25,71 +31,23 @@ strain_bounds = [ec2]
 
 na_depth = 7.5744 # depth of the neutral axis
 
-y_na = max(y)-na_depth
-
-y_bounds = [y_na]
-y_bounds.extend([((i*na_depth)/eu)+y_na for i in strain_bounds])
-y_bounds.append(max(y))
-
-# work thru each section segment and pull out (x1,y1) (x2,y2) pairs
-# for use in the stress block functions
-stress_block_segments = []
-for i in range(1,len(x)):
-    
-    x1 = x[i-1]
-    y1 = y[i-1]
-    x2 = x[i]
-    y2 = y[i]
-    
-    if x1==x2:
-        for j in enumerate(y_bounds):
-            if j[0] == 0:
-                pass
-            else:
-                if y2>=j[1]:
-                    stress_block_segments.append([[x1,y_bounds[j[0]-1]],[x1,j[1]]])
-                elif y1 >= j[1]:
-                    stress_block_segments.append([[x1,j[1]],[x1,y_bounds[j[0]-1]]])
-                
-    elif y2==y1 and y2>y_na:
-        
-        if x2 > x1:
-            stress_block_segments.append([[x2,y2],[x1,y1]])
-        else:
-            stress_block_segments.append([[x1,y1],[x2,y2]])
-    elif y2>y_na or y1>y_na:
-        
-        m = (y2-y1)/(x2-x1)
-        for j in enumerate(y_bounds):
-            if j[0] == 0:
-                pass
-            else:
-                x3 = ((y_bounds[j[0]-1]-y1)/m)+x1
-                x4 = ((j[1]-y1)/m)+x1
-                if y2>=j[1]:
-                   stress_block_segments.append([[x3,y_bounds[j[0]-1]],[x4,j[1]]])
-                elif y1>=j[1]:
-                    stress_block_segments.append([[x4,j[1]],[x3,y_bounds[j[0]-1]]])
-    
-    else:
-        pass
+# The band slicing now lives in concretexsection.stress_strain.section_slicer
+y_bounds = stress_band_bounds(max(y), na_depth, eu, strain_bounds)
+
+segments = [[[x[i-1],y[i-1]],[x[i],y[i]]] for i in range(1,len(x))]
+
+# (bands, edges, 2, 2), drop the zero length pieces for plotting
+stress_block_segments = [s for band in slice_segments(segments, y_bounds)
+                         for s in band if s[0,1] != s[1,1]]
         
+plt = plotting.pyplot()
+
 plt.close('all')
 
 ax1 = plt.subplot2grid((2, 1), (0, 0))
 ax2 = plt.subplot2grid((2, 1), (1, 0))
-ax1.plot(x, y, 'c-')
-
-colors = "bgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrkbgrk"
 
-for k, segment in enumerate(stress_block_segments):
-    xp = [i[0] for i in segment]
-    yp = [j[1] for j in segment]
-    
-    ax2.plot(xp, yp, c=colors[k])
-    
-    label='s_'+str(k)
-    
-    ax2.text((xp[0]+xp[1])/2,(yp[0]+yp[1])/2,label)
+plotting.plot_polygon(x, y, ax=ax1)
+plotting.plot_segments(stress_block_segments, ax=ax2, labels=True)
 
-plt.show()   
+plt.show()
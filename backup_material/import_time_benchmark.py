@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Import time guard for the analysis modules.
+
+Each module is imported in a fresh interpreter and timed. The run fails
+if an analysis module pulls in matplotlib, or if stress_strain.py needs
+anything beyond the standard library. Plotting lives in
+concretexsection.plotting and imports matplotlib on first use.
+"""
+from __future__ import division
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# module, third party packages it may load
+MODULES = [('concretexsection.stress_strain.stress_strain', []),
+           ('concretexsection.stress_strain.p_m_by_segment', ['numpy']),
+           ('concretexsection.stress_strain.stress_strain_array', ['numpy']),
+           ('concretexsection.stress_strain.material_curves', ['numpy']),
+           ('concretexsection.geometry.ConcreteSectionPolygon', ['numpy']),
+           ('concretexsection.plotting', [])]
+
+THIRD_PARTY = ['numpy', 'scipy', 'matplotlib', 'pandas']
+
+PROBE = '''
+import json, sys, time
+t = time.perf_counter()
+import {0}
+t = time.perf_counter() - t
+print(json.dumps([t, [m for m in {1!r} if m in sys.modules]]))
+'''
+
+def import_time(module):
+    '''
+    time the import of module in a fresh interpreter,
+    returns the seconds taken and the third party packages loaded
+    '''
+    out = subprocess.check_output([sys.executable, '-c', PROBE.format(module, THIRD_PARTY)],
+                                  cwd=ROOT)
+
+    t, loaded = json.loads(out.decode('utf-8').strip().splitlines()[-1])
+
+    return t, loaded
+
+if __name__ == '__main__':
+    failed = False
+
+    for module, allowed in MODULES:
+        t, loaded = import_time(module)
+
+        extra = [m for m in loaded if m not in allowed]
+
+        print('{0:<52} {1:8.1f} ms  {2}'.format(module, t*1000, ', '.join(loaded) or 'stdlib only'))
+
+        if extra:
+            print('    FAIL: unexpected import of {0}'.format(', '.join(extra)))
+            failed = True
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,129 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import numpy as np
+from .polygon_properties import edge_properties
+from .PolygonSection import _cached_property
+
+
+class CompositeSection(object):
+    '''
+    A solid polygon section with any number of voids integrated as a
+    single set of edges.
+
+    The solid edges run counter-clockwise and the void edges clockwise,
+    VoidSectionPolygon enforces a negative signed area, so the Green's
+    theorem line integrals over the merged edges give the net section
+    directly and every stress block kernel runs once over the merged
+    array instead of once per void with a subtraction.
+    '''
+
+    __slots__ = ('solid', 'voids', '_segments', '_cache')
+
+    def __init__(self, solid, voids=()):
+        '''
+        Inputs:
+
+        solid = ConcreteSectionPolygon, or any section with segments and area
+        voids = list of VoidSectionPolygon
+
+        the edges are merged once here, call merge() after changing
+        the vertices of the solid or any void
+        '''
+        self.solid = solid
+        self.voids = list(voids)
+        self._cache = {}
+
+        self.merge()
+
+    def merge(self):
+        '''
+        rebuild the merged (N,2,2) edge array from the solid and voids,
+        any void given with a positive signed area is reversed
+        '''
+        parts = [np.asarray(self.solid.segments)]
+
+        for void in self.voids:
+            segments = np.asarray(void.segments)
+
+            if void.area > 0:
+                segments = segments[::-1,::-1,:]
+
+            parts.append(segments)
+
+        merged = np.concatenate(parts, axis=0)
+        merged.flags.writeable = False
+
+        self._segments = merged
+        self._cache.clear()
+
+    @property
+    def segments(self):
+        '''
+        (N,2,2) read only array of the solid and void edges
+        '''
+        return self._segments
+
+    # --- net properties about the global x and y axis ---
+
+    @_cached_property
+    def _global(self):
+        s = self._segments
+
+        return edge_properties(s[:,0,0], s[:,0,1], s[:,1,0], s[:,1,1])
+
+    @_cached_property
+    def area(self):
+        return self._global[0]
+
+    @_cached_property
+    def cx(self):
+        return self._global[1]
+
+    @_cached_property
+    def cy(self):
+        return self._global[2]
+
+    @_cached_property
+    def Ix(self):
+        return self._global[3]
+
+    @_cached_property
+    def Iy(self):
+        return self._global[4]
+
+    @_cached_property
+    def Ixy(self):
+        return self._global[5]
+
+    def integrate(self, kernel, *args, **kwargs):
+        '''
+        run a stress block function of p_m_by_segment, or any function
+        taking the segments as its first argument, once over the merged
+        edges, ie. section.integrate(ec2_stress_block_batch, fcd, n, eu, ec2, c)
+        '''
+        return kernel(self._segments, *args, **kwargs)
@@ -0,0 +1,486 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import math
+import numpy as np
+from .polygon_properties import polygon_properties
+from ..stress_strain.p_m_by_segment import _project_points
+
+
+class _cached_property(object):
+    '''
+    read only section property computed on first access and kept in the
+    section's _cache until the vertices change
+    '''
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+
+        cache = obj._cache
+
+        try:
+            return cache[self.name]
+        except KeyError:
+            value = cache[self.name] = self.func(obj)
+            return value
+
+
+class PolygonSection(object):
+    '''
+    Common vertex handling and geometric properties for sections
+    defined by (x,y) vertices, ie. ConcreteSectionPolygon,
+    SteelSectionPolygon, and VoidSectionPolygon.
+
+    Section properties are computed lazily on first access and cached,
+    the cache is cleared whenever the vertices are replaced. The text
+    log of the properties, log and log_strings, is generated on demand.
+
+    The vertices are stored in a single contiguous, read only, (n,2)
+    float64 buffer, x and y are views of its columns and segments is a
+    zero copy strided (n-1,2,2) view of it. Sections use __slots__ so no
+    per instance __dict__ is kept.
+
+    The vertices should be replaced, ie. section.x = new_x or
+    section.set_vertices(new_x, new_y), so the cached properties are invalidated.
+
+    x, y, vertices and the values returned by transformed_vertices_*,
+    translate_vertices and calc_s_at_vertices are numpy float64 arrays,
+    not lists. x and y are read only, list methods such as append and
+    item assignment are no longer available, build a new sequence and
+    replace the vertices instead.
+    '''
+
+    __slots__ = ('material', 'units', 'shape', 'warnings', '_xy', '_cache')
+
+    # (label, attribute) pairs of the property log, headings have a
+    # separator string in place of the attribute which is logged as is
+    _LOG = [('Area', 'area'),
+            ('Cx', 'cx'),
+            ('Cy', 'cy'),
+            ('Global Axis:', '---'),
+            ('Ix', 'Ix'),
+            ('Iy', 'Iy'),
+            ('Ixy', 'Ixy'),
+            ('Jz', 'Jz'),
+            ('Sx,top', 'sx_top'),
+            ('Sx,botom', 'sx_bottom'),
+            ('Sy,right', 'sy_right'),
+            ('Sy,left', 'sy_left'),
+            ('rx', 'rx'),
+            ('ry', 'ry'),
+            ('rz', 'rz'),
+            ('Shape Centroidal Axis:', '--'),
+            ('Ixx', 'Ixx'),
+            ('Iyy', 'Iyy'),
+            ('Ixxyy', 'Ixxyy'),
+            ('Jzz', 'Jzz'),
+            ('Sxx,top', 'sxx_top'),
+            ('Sxx,bottom', 'sxx_bottom'),
+            ('Syy,right', 'syy_right'),
+            ('Syy,left', 'syy_left'),
+            ('rxx', 'rxx'),
+            ('ryy', 'ryy'),
+            ('rzz', 'rzz'),
+            ('Shape Principal Axis:', '--'),
+            ('Iuu', 'Iuu'),
+            ('Ivv', 'Ivv'),
+            ('Iuuvv', 'Iuuvv'),
+            ('Theta1,u', 'theta1'),
+            ('Theta2,v', 'theta2')]
+
+    def __init__(self, x, y):
+        self._cache = {}
+        self.set_vertices(x, y)
+
+    def set_vertices(self, x, y):
+        '''
+        replace the section vertices, x and y may change length
+        '''
+        xy = np.empty((len(x),2))
+        xy[:,0] = x
+        xy[:,1] = y
+        xy.flags.writeable = False
+
+        self._xy = xy
+        self._cache.clear()
+
+    @property
+    def x(self):
+        return self._xy[:,0]
+
+    @x.setter
+    def x(self, value):
+        self.set_vertices(value, self._xy[:,1])
+
+    @property
+    def y(self):
+        return self._xy[:,1]
+
+    @y.setter
+    def y(self, value):
+        self.set_vertices(self._xy[:,0], value)
+
+    @property
+    def vertices(self):
+        '''
+        (n,2) read only array of the section vertices
+        '''
+        return self._xy
+
+    @property
+    def segments(self):
+        '''
+        (n-1,2,2) read only, zero copy, view of the vertex buffer
+        where segment i is [[x[i],y[i]],[x[i+1],y[i+1]]]
+        '''
+        xy = self._xy
+
+        return np.lib.stride_tricks.as_strided(xy,
+                                                shape=(xy.shape[0]-1,2,2),
+                                                strides=(xy.strides[0], xy.strides[0], xy.strides[1]),
+                                                writeable=False)
+
+    def calc_props(self):
+        '''
+        Clear the cached geometric section properties so they are
+        recomputed from the current vertices on next access
+        '''
+        self._cache.clear()
+
+    # --- properties about the global x and y axis ---
+
+    @_cached_property
+    def _global(self):
+        '''
+        area, centroid, global axis properties, and vertex extents
+        from a single pass over the vertices
+        '''
+        return polygon_properties(self.x, self.y)
+
+    @_cached_property
+    def area(self):
+        return self._global[0]
+
+    @_cached_property
+    def cx(self):
+        return self._global[1]
+
+    @_cached_property
+    def cy(self):
+        return self._global[2]
+
+    @_cached_property
+    def Ix(self):
+        return self._global[3]
+
+    @_cached_property
+    def Iy(self):
+        return self._global[4]
+
+    @_cached_property
+    def Ixy(self):
+        return self._global[5]
+
+    @_cached_property
+    def Jz(self):
+        return self.Ix + self.Iy
+
+    @_cached_property
+    def sx_top(self):
+        return self.Ix / abs(self._global[9] - self.cy)
+
+    @_cached_property
+    def sx_bottom(self):
+        return self.Ix / abs(self._global[8] - self.cy)
+
+    @_cached_property
+    def sy_right(self):
+        return self.Iy / abs(self._global[7] - self.cx)
+
+    @_cached_property
+    def sy_left(self):
+        return self.Iy / abs(self._global[6] - self.cx)
+
+    @_cached_property
+    def rx(self):
+        return math.sqrt(self.Ix/self.area)
+
+    @_cached_property
+    def ry(self):
+        return math.sqrt(self.Iy/self.area)
+
+    @_cached_property
+    def rz(self):
+        return math.sqrt(self.Jz/self.area)
+
+    # --- properties about the cross section centroidal x and y axis ---
+    # parallel axis theorem Ix = Ixx + A*d^2
+    # therefore to go from the global axis to the local
+    # Ixx = Ix - A*d^2
+
+    @_cached_property
+    def Ixx(self):
+        return self.Ix - (self.area*self.cy*self.cy)
+
+    @_cached_property
+    def Iyy(self):
+        return self.Iy - (self.area*self.cx*self.cx)
+
+    @_cached_property
+    def Ixxyy(self):
+        return self.Ixy - (self.area*self.cx*self.cy)
+
+    @_cached_property
+    def Jzz(self):
+        return self.Ixx + self.Iyy
+
+    @_cached_property
+    def sxx_top(self):
+        return self.Ixx / abs(self._global[9] - self.cy)
+
+    @_cached_property
+    def sxx_bottom(self):
+        return self.Ixx / abs(self._global[8] - self.cy)
+
+    @_cached_property
+    def syy_right(self):
+        return self.Iyy / abs(self._global[7] - self.cx)
+
+    @_cached_property
+    def syy_left(self):
+        return self.Iyy / abs(self._global[6] - self.cx)
+
+    @_cached_property
+    def rxx(self):
+        return math.sqrt(self.Ixx/self.area)
+
+    @_cached_property
+    def ryy(self):
+        return math.sqrt(self.Iyy/self.area)
+
+    @_cached_property
+    def rzz(self):
+        return math.sqrt(self.Jzz/self.area)
+
+    # --- Cross section principle Axis ---
+
+    @_cached_property
+    def _principal(self):
+        '''
+        [Iuu, Ivv, Iuuvv, theta1, theta2]
+        '''
+        two_theta = math.atan((-1.0*2.0*self.Ixxyy)/(1E-16+(self.Ixx - self.Iyy)))
+        temp = (self.Ixx+self.Iyy)/2.0
+        temp2 = (self.Ixx-self.Iyy)/2.0
+        I1 = temp + math.sqrt((temp2*temp2)+(self.Ixxyy*self.Ixxyy))
+
+        Iuu = temp + temp2*math.cos(two_theta) - self.Ixxyy*math.sin(two_theta)
+        Ivv = temp - temp2*math.cos(two_theta) + self.Ixxyy*math.sin(two_theta)
+        Iuuvv = temp2*math.sin(two_theta) + self.Ixxyy*math.cos(two_theta)
+
+        if I1-0.000001 <= Iuu <= I1+0.000001:
+            theta1 = math.degrees(two_theta/2.0)
+            theta2 = theta1 + 90.0
+        else:
+            theta2 = math.degrees(two_theta/2.0)
+            theta1 = theta2 - 90.0
+
+        return [Iuu, Ivv, Iuuvv, theta1, theta2]
+
+    @_cached_property
+    def Iuu(self):
+        return self._principal[0]
+
+    @_cached_property
+    def Ivv(self):
+        return self._principal[1]
+
+    @_cached_property
+    def Iuuvv(self):
+        return self._principal[2]
+
+    @_cached_property
+    def theta1(self):
+        return self._principal[3]
+
+    @_cached_property
+    def theta2(self):
+        return self._principal[4]
+
+    # --- Text log, generated on demand ---
+
+    @property
+    def log(self):
+        return [a if a in ('---','--') else getattr(self, a) for l, a in self._LOG]
+
+    @property
+    def log_strings(self):
+        return [l for l, a in self._LOG]
+
+    def calc_s_at_vertices(self):
+        '''
+        calculate the first moment of area at each vertex
+        '''
+        y = np.where(self.y == 0, 0.00000000000001, self.y)
+        x = np.where(self.x == 0, 0.00000000000001, self.x)
+
+        sx = self.Ixx / np.abs(y - self.cy)
+        sy = self.Iyy / np.abs(x - self.cx)
+
+        return sx,sy
+
+    def parallel_axis_theorem(self, x, y):
+        '''
+        given a new global x,y coordinate for a new
+        set of x, y axis return the associated Ix, Iy, and Ixy
+        '''
+        if self.area == 0:
+            return [0,0,0]
+        else:
+            dx = self.cx - x
+            dy = self.cy - y
+
+            Ix = self.Ixx + (self.area*dy*dy)
+            Iy = self.Iyy + (self.area*dx*dx)
+            Ixy = self.Ixxyy + (self.area*dx*dy)
+
+            return [Ix,Iy,Ixy]
+
+    def transformed_vertices_degrees(self, xo, yo, angle, commit=0):
+        '''
+        given an angle in degrees
+        and coordinate to translate about
+        return the transformed values of the shape vertices
+        '''
+        return self.transformed_vertices_radians(xo, yo, math.radians(angle), commit)
+
+    def transformed_vertices_radians(self, xo, yo, angle, commit=0):
+        '''
+        given an angle in radians
+        and coordinate to translate about
+        return the transformed values of the shape vertices
+        '''
+        xy = self.transformed_vertices_batch_radians(xo, yo, [angle])[0]
+
+        x_tr = xy[:,0]
+        y_tr = xy[:,1]
+
+        # Commit transformation to Section
+        if commit == 1:
+            self.set_vertices(x_tr, y_tr)
+        else:
+            pass
+
+        return [x_tr, y_tr]
+
+    def transformed_vertices_batch_degrees(self, xo, yo, angles):
+        '''
+        given an array of angles in degrees
+        and coordinate to translate about
+        return the transformed shape vertices for every angle
+        as an (n_angles, n_vertices, 2) array
+        '''
+        return self.transformed_vertices_batch_radians(xo, yo, np.radians(angles))
+
+    def transformed_vertices_batch_radians(self, xo, yo, angles):
+        '''
+        given an array of angles in radians
+        and coordinate to translate about
+        return the transformed shape vertices for every angle
+        as an (n_angles, n_vertices, 2) array
+
+        the transformation is never committed to the section
+        '''
+        theta = np.asarray(angles, dtype=float).reshape(-1,1)
+
+        xy = np.empty((theta.shape[0], self._xy.shape[0], 2))
+        xy[:,:,0], xy[:,:,1] = _project_points(self._xy[:,0], self._xy[:,1], xo, yo, theta)
+
+        return xy
+
+    def translate_vertices(self, xo, yo, commit=0):
+        '''
+        give an x and y translation
+        shift or return the shifted
+        shape vertices by the x and y amount
+        '''
+        x_t = self.x + xo
+        y_t = self.y + yo
+
+        # Commit the translation to the shape
+        if commit == 1:
+            self.set_vertices(x_t, y_t)
+        else:
+            pass
+
+        return [x_t, y_t]
+
+    def convert_metric(self):
+        '''
+        Assuming the original inputs were Imperial/US units
+        convert the vertices to metric, mm and recompute
+        the section properties
+
+        '''
+
+        'Check if already in metric'
+        if self.units == "Metric":
+            pass
+        else:
+            'Convert vertices from in to mm, 1:25.4'
+            self.set_vertices(self.x*25.4, self.y*25.4)
+
+    def convert_imperial(self):
+        '''
+        Assuming the original inputs were Metric units
+        convert the vertices to Imperial/US, inches and
+        recompute the section properties.
+
+        '''
+
+        'Check if already in Imperial/US'
+        if self.units == "Imperial/US":
+            pass
+        else:
+            'Convert vertices from mm to in, 25.4:1'
+            self.set_vertices(self.x/25.4, self.y/25.4)
+
+    def define_segments(self):
+        '''
+        return ordered coordinate pairs defining the line segments
+        of each side of the section.
+
+        returned as the (n-1,2,2) zero copy view of the vertex buffer,
+        see segments
+        '''
+        return self.segments
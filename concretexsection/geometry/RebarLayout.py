@@ -0,0 +1,204 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import math
+import numpy as np
+from ..stress_strain.neutral_axis import rebar_axial_load
+from ..stress_strain.p_m_by_segment import _project_points
+from ..stress_strain.stress_strain_array import strain_at_depth_array
+
+
+def _bar_properties(bar):
+    '''
+    As, fy, and E of a SteelRebar.ASTM bar
+    '''
+    return bar.As, bar.material.fy, bar.material.E
+
+
+def _array(values, n):
+    a = np.array(np.broadcast_to(np.asarray(values, dtype=float), (n,)))
+    a.setflags(write=False)
+    return a
+
+
+class RebarLayout(object):
+    '''
+    A set of reinforcing bars stored as contiguous arrays of the bar
+    x and y coordinates, area, yield stress, and modulus so the strain
+    compatibility of every bar is done in a single vectorized call.
+
+    Compression is (+), bars are elastic-perfectly plastic and the
+    concrete displaced by the bars is not deducted.
+    '''
+
+    __slots__ = ('x', 'y', 'As', 'fy', 'Es')
+
+    def __init__(self, x, y, As, fy, Es):
+        '''
+        Inputs:
+
+        x = bar x coordinates
+        y = bar y coordinates
+        As = bar areas, a single value or one per bar
+        fy = bar yield stresses, a single value or one per bar
+        Es = bar moduli, a single value or one per bar
+        '''
+        n = np.asarray(x, dtype=float).reshape(-1).shape[0]
+
+        self.x = _array(np.asarray(x, dtype=float).reshape(-1), n)
+        self.y = _array(np.asarray(y, dtype=float).reshape(-1), n)
+        self.As = _array(As, n)
+        self.fy = _array(fy, n)
+        self.Es = _array(Es, n)
+
+    @classmethod
+    def from_bars(cls, bars, x, y):
+        '''
+        layout from a list of SteelRebar.ASTM bars and their x and y coordinates
+        '''
+        props = np.array([_bar_properties(bar) for bar in bars], dtype=float).reshape(-1,3)
+
+        return cls(x, y, props[:,0], props[:,1], props[:,2])
+
+    @classmethod
+    def row(cls, x1, y1, x2, y2, n_bars, bar):
+        '''
+        n_bars SteelRebar.ASTM bars equally spaced on the line from
+        (x1,y1) to (x2,y2), both end points included
+        '''
+        t = np.linspace(0, 1, n_bars)
+
+        As, fy, Es = _bar_properties(bar)
+
+        return cls(x1 + t*(x2-x1), y1 + t*(y2-y1), As, fy, Es)
+
+    @classmethod
+    def perimeter(cls, x, y, n_bars, bar):
+        '''
+        n_bars SteelRebar.ASTM bars equally spaced along the closed path
+        through the x and y coordinates, ie. the section outline offset
+        by the cover, starting at the first coordinate
+        '''
+        px = np.asarray(x, dtype=float)
+        py = np.asarray(y, dtype=float)
+
+        if px[0] != px[-1] or py[0] != py[-1]:
+            px = np.append(px, px[0])
+            py = np.append(py, py[0])
+
+        s = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(px), np.diff(py)))))
+        positions = np.arange(n_bars)*(s[-1]/n_bars)
+
+        As, fy, Es = _bar_properties(bar)
+
+        return cls(np.interp(positions, s, px), np.interp(positions, s, py), As, fy, Es)
+
+    @classmethod
+    def circle(cls, xc, yc, r, n_bars, bar, start_angle=0):
+        '''
+        n_bars SteelRebar.ASTM bars equally spaced on a circle of radius r
+        centered at (xc,yc), the first bar at start_angle in radians
+        '''
+        angles = start_angle + np.arange(n_bars)*((2*math.pi)/n_bars)
+
+        As, fy, Es = _bar_properties(bar)
+
+        return cls(xc + r*np.cos(angles), yc + r*np.sin(angles), As, fy, Es)
+
+    @classmethod
+    def combine(cls, layouts):
+        '''
+        single layout with the bars of all the layouts
+        '''
+        return cls(np.concatenate([l.x for l in layouts]),
+                   np.concatenate([l.y for l in layouts]),
+                   np.concatenate([l.As for l in layouts]),
+                   np.concatenate([l.fy for l in layouts]),
+                   np.concatenate([l.Es for l in layouts]))
+
+    def __len__(self):
+        return self.x.shape[0]
+
+    @property
+    def area(self):
+        return float(self.As.sum())
+
+    def transformed_coordinates(self, xo, yo, angle):
+        '''
+        given an angle in radians and coordinate to translate about
+        return the transformed bar coordinates, with the same
+        transformation as PolygonSection.transformed_vertices_radians
+        '''
+        return _project_points(self.x, self.y, xo, yo, angle)
+
+    def strains(self, eu, c, y_max, xo=0, yo=0, angle=0):
+        '''
+        bar strains for a neutral axis depth c, or an (M,) array of depths,
+        measured from y_max in the section rotated by angle about (xo,yo)
+
+        returns an (M,B) array, compression (+)
+        '''
+        y_tr = self.transformed_coordinates(xo, yo, angle)[1]
+
+        C = np.asarray(c, dtype=float).reshape(-1,1)
+
+        return strain_at_depth_array(eu, C, y_max - y_tr)
+
+    def stresses(self, eu, c, y_max, xo=0, yo=0, angle=0):
+        '''
+        bar stresses for a neutral axis depth c, or an (M,) array of depths,
+        see strains, returns an (M,B) array
+        '''
+        strain = self.strains(eu, c, y_max, xo, yo, angle)
+
+        return np.clip(strain*self.Es, -self.fy, self.fy)
+
+    def forces(self, eu, c, y_max, xo=0, yo=0, angle=0):
+        '''
+        P, Mx, and My of the bars for a neutral axis depth c, or an (M,)
+        array of depths, in the section rotated by angle about (xo,yo)
+
+        moments are about (xo,yo) in the unrotated section axes
+        returns an (M,3) array like the p_m_by_segment batch functions
+        '''
+        force = self.stresses(eu, c, y_max, xo, yo, angle)*self.As
+
+        results = np.empty((force.shape[0],3))
+        results[:,0] = force.sum(axis=1)
+        results[:,1] = force.dot(self.y - yo)
+        results[:,2] = force.dot(self.x - xo)
+
+        return results
+
+    def axial_load(self, eu, c, y_max, xo=0, yo=0, angle=0):
+        '''
+        P of the bars and dP/dc for a neutral axis depth c, see
+        neutral_axis.rebar_axial_load, for use with neutral_axis_depth
+        '''
+        y_tr = self.transformed_coordinates(xo, yo, angle)[1]
+
+        return rebar_axial_load(y_tr, self.As, self.fy, self.Es, eu, c, y_max)
@@ -0,0 +1,342 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import os
+import numpy as np
+from ..stress_strain.p_m_by_segment import (_project_segments, _rotate_resultants, _clip_segments,
+                                            _constant_segment_integrals, _ec2_segment_integrals,
+                                            _pca_segment_integrals)
+
+
+_ARRAYS = ('x', 'y', 'offsets', 'sections')
+
+
+def _rings(section):
+    '''
+    closed vertex rings of a section, a CompositeSection gives its solid
+    followed by its voids with the voids clockwise
+    '''
+    if hasattr(section, 'solid'):
+        rings = [np.asarray(section.solid.vertices)]
+
+        for void in section.voids:
+            xy = np.asarray(void.vertices)
+
+            if void.area > 0:
+                xy = xy[::-1]
+
+            rings.append(xy)
+
+        return rings
+
+    return [np.asarray(section.vertices)]
+
+
+class SectionCatalog(object):
+    '''
+    Many sections packed in compressed sparse row form so section
+    properties and stress blocks of the whole catalog are computed
+    in single vectorized calls.
+
+    x, y = flat vertex coordinates of every ring, each ring closed
+            with first vertex = last vertex
+    offsets = (R+1,) ring i is vertices offsets[i] to offsets[i+1]
+    sections = (S+1,) section j is rings sections[j] to sections[j+1],
+                the first ring of a section is the solid, counter-clockwise,
+                any further rings are voids, clockwise
+
+    the per edge Green's theorem terms are summed per section with
+    np.add.reduceat over the section edge offsets.
+    '''
+
+    __slots__ = ('x', 'y', 'offsets', 'sections', '_edges', '_cache')
+
+    def __init__(self, x, y, offsets, sections=None):
+        '''
+        Inputs:
+
+        x = flat x coordinates of every ring
+        y = flat y coordinates of every ring
+        offsets = ring start offsets into x and y with the total
+                    vertex count appended
+        sections = section start offsets into the rings with the
+                    total ring count appended, default one ring
+                    per section
+
+        the arrays are used as given, so arrays loaded with a
+        mmap_mode stay memory mapped
+        '''
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.offsets = np.asarray(offsets, dtype=np.intp)
+
+        if sections is None:
+            self.sections = np.arange(self.offsets.shape[0], dtype=np.intp)
+        else:
+            self.sections = np.asarray(sections, dtype=np.intp)
+
+        if self.offsets[0] != 0 or self.offsets[-1] != self.x.shape[0] or self.y.shape != self.x.shape:
+            raise ValueError('offsets must start at 0 and end at the vertex count of x and y')
+
+        if np.any(np.diff(self.offsets) < 4):
+            raise ValueError('every ring needs at least 3 vertices plus the closing vertex')
+
+        if self.sections[0] != 0 or self.sections[-1] != self.offsets.shape[0]-1 or np.any(np.diff(self.sections) < 1):
+            raise ValueError('sections must start at 0, end at the ring count, and give every section a ring')
+
+        self._edges = None
+        self._cache = {}
+
+    @classmethod
+    def from_sections(cls, sections):
+        '''
+        catalog of a list of ConcreteSectionPolygon or CompositeSection
+        sections, in order
+        '''
+        rings = []
+        counts = []
+
+        for section in sections:
+            r = _rings(section)
+            rings.extend(r)
+            counts.append(len(r))
+
+        xy = np.concatenate(rings, axis=0)
+        offsets = np.concatenate(([0], np.cumsum([r.shape[0] for r in rings])))
+        section_offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        return cls(xy[:,0], xy[:,1], offsets, section_offsets)
+
+    def save(self, path):
+        '''
+        write x, y, offsets, and sections as .npy files in the directory path
+        '''
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        for name in _ARRAYS:
+            np.save(os.path.join(path, name+'.npy'), getattr(self, name))
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        '''
+        catalog saved with save, the arrays are memory mapped
+        unless mmap_mode is None
+        '''
+        arrays = [np.load(os.path.join(path, name+'.npy'), mmap_mode=mmap_mode) for name in _ARRAYS]
+
+        return cls(*arrays)
+
+    def __len__(self):
+        return self.sections.shape[0]-1
+
+    def section_vertices(self, index):
+        '''
+        list of the (n,2) vertex arrays of the rings of section index
+        '''
+        r0 = self.sections[index]
+        r1 = self.sections[index+1]
+
+        return [np.column_stack((self.x[i:j], self.y[i:j]))
+                for i, j in zip(self.offsets[r0:r1], self.offsets[r0+1:r1+1])]
+
+    def edges(self):
+        '''
+        x1, y1, x2, y2 of every edge, the section each edge belongs to,
+        and the (S+1,) section start offsets into the edges
+        '''
+        if self._edges is None:
+            n = self.x.shape[0]
+
+            # every vertex but the closing vertex of a ring starts an edge
+            start = np.ones(n, dtype=bool)
+            start[self.offsets[1:]-1] = False
+            i = np.flatnonzero(start)
+
+            ring_edges = self.offsets - np.arange(self.offsets.shape[0])
+            edge_offsets = ring_edges[self.sections]
+
+            owner = np.repeat(np.arange(len(self)), np.diff(edge_offsets))
+
+            self._edges = (self.x[i], self.y[i], self.x[i+1], self.y[i+1], owner, edge_offsets)
+
+        return self._edges
+
+    def _reduce(self, terms):
+        return np.add.reduceat(terms, self.edges()[5][:-1], axis=-1)
+
+    def properties(self):
+        '''
+        (S,6) array of [area, cx, cy, Ix, Iy, Ixy] of every section,
+        see polygon_properties.edge_properties
+        '''
+        try:
+            return self._cache['properties']
+        except KeyError:
+            pass
+
+        xi, yi, xj, yj = self.edges()[:4]
+
+        cross = (xi*yj)-(xj*yi)
+
+        terms = np.stack((cross/2.0,
+                          (xi+xj)*cross,
+                          (yi+yj)*cross,
+                          ((yi*yi)+(yi*yj)+(yj*yj))*cross/12.0,
+                          ((xi*xi)+(xi*xj)+(xj*xj))*cross/12.0,
+                          ((xi*yj)+(2*xi*yi)+(2*xj*yj)+(xj*yi))*cross/24.0))
+
+        props = self._reduce(terms).T.copy()
+
+        area = props[:,0]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            props[:,1] = np.where(area == 0, 0, props[:,1]/(6*area))
+            props[:,2] = np.where(area == 0, 0, props[:,2]/(6*area))
+
+        props.flags.writeable = False
+        self._cache['properties'] = props
+
+        return props
+
+    def centroidal(self):
+        '''
+        catalog with every section moved so its centroid is at 0,0
+        '''
+        props = self.properties()
+
+        ring_section = np.repeat(np.arange(len(self)), np.diff(self.sections))
+        vertex_section = np.repeat(ring_section, np.diff(self.offsets))
+
+        return SectionCatalog(self.x - props[vertex_section,1],
+                              self.y - props[vertex_section,2],
+                              self.offsets,
+                              self.sections)
+
+    def _projected_edges(self, angle):
+        x1, y1, x2, y2, owner, edge_offsets = self.edges()
+
+        if angle is not None:
+            x1, y1, x2, y2 = _project_segments(x1, y1, x2, y2, 0, 0, angle)
+
+        y_max = np.maximum.reduceat(np.maximum(y1, y2), edge_offsets[:-1])
+
+        return x1, y1, x2, y2, owner, y_max
+
+    def _depths(self, c):
+        C = np.asarray(c, dtype=float)
+
+        if C.ndim < 2:
+            C = C.reshape(-1,1)
+
+        return np.broadcast_to(C, (C.shape[0], len(self)))
+
+    def _stress_block(self, c, angle, max_elements, integrate):
+        x1, y1, x2, y2, owner, y_max = self._projected_edges(angle)
+
+        C = self._depths(c)
+
+        results = np.empty((C.shape[0], len(self), 3))
+
+        # depths are done in chunks to bound the (M,E) temporaries
+        step = max(1, max_elements//max(1, x1.shape[0]))
+
+        for m in range(0, C.shape[0], step):
+            Ce = C[m:m+step][:,owner]
+
+            # depths c <= 0 have no compression block, their edges are
+            # integrated with a stand in depth and zeroed
+            dead = Ce <= 0
+            Ce = np.where(dead, 1.0, Ce)
+
+            Ye = y_max[owner] - Ce
+
+            for i, r in enumerate(integrate(x1, y1, x2, y2, Ce, Ye, y_max[owner])):
+                results[m:m+step,:,i] = self._reduce(np.where(dead, 0.0, r))
+
+        if angle is not None:
+            _rotate_resultants(results, angle)
+
+        return results
+
+    def ec2_stress_block(self, fcd, n, eu, ec2, c, angle=None, max_elements=2**18):
+        '''
+        P, Mx, and My of the EN 1992.1.1.2004 parabolic + constant stress
+        block of every section, see p_m_by_segment.ec2_stress_block_batch
+
+        Inputs:
+
+        fcd, n, eu, ec2 = see ec2_stress_block_batch
+        c = neutral axis depth from the peak y coordinate of each section,
+            a float or (M,) array shared by every section, or an (M,S)
+            array of depths per section, depths c <= 0 give zeros
+        angle = optional, radians, the sections are projected onto axes
+                rotated by angle about 0,0 and the moments rotated back
+        max_elements = bound on the depth x edge temporaries
+
+        Returns:
+
+        (M,S,3) array of P, Mx, My with moments about 0,0,
+        see centroidal
+        '''
+        K = eu/ec2
+        ratio = ec2/eu
+
+        def integrate(x1, y1, x2, y2, C, Y, y_max):
+            yec2 = Y + (C*ratio)
+
+            A, D, B, E = _clip_segments(x1, y1, x2, y2, Y, yec2)
+            parabolic = _ec2_segment_integrals(A, B, D, E, fcd, K, n, C, Y)
+
+            A, D, B, E = _clip_segments(x1, y1, x2, y2, yec2, y_max)
+            constant = _constant_segment_integrals(A, D, B, E, fcd)
+
+            return [p + q for p, q in zip(parabolic, constant)]
+
+        return self._stress_block(c, angle, max_elements, integrate)
+
+    def pca_stress_block(self, fc, eu, Ec, c, angle=None, max_elements=2**18):
+        '''
+        P, Mx, and My of the PCA parabolic + constant stress block of
+        every section, see p_m_by_segment.pca_stress_block_batch and
+        ec2_stress_block for the inputs and returns
+        '''
+        eo = (2*0.85*fc)/Ec
+        ratio = eo/eu
+
+        def integrate(x1, y1, x2, y2, C, Y, y_max):
+            yeo = Y + (C*ratio)
+
+            A, D, B, E = _clip_segments(x1, y1, x2, y2, Y, yeo)
+            parabolic = _pca_segment_integrals(A, B, D, E, fc, eu/(C*eo), Y)
+
+            A, D, B, E = _clip_segments(x1, y1, x2, y2, yeo, y_max)
+            constant = _constant_segment_integrals(A, D, B, E, 0.85*fc)
+
+            return [p + q for p, q in zip(parabolic, constant)]
+
+        return self._stress_block(c, angle, max_elements, integrate)
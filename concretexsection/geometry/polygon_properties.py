@@ -0,0 +1,97 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import numpy as np
+
+def polygon_properties(x, y):
+    '''
+    Single pass computation of the basic geometric properties of a
+    closed polygon defined by (x,y) vertices, first vertex = last vertex.
+
+    The cross product x[i]*y[i+1]-x[i+1]*y[i] of each edge is computed
+    once over contiguous coordinate arrays and shared by all of the
+    Green's theorem sums.
+
+    Inputs:
+
+    x = list or array of x coordinate values
+    y = list or array of y coordinate values
+
+    Returns:
+
+    [area, cx, cy, Ix, Iy, Ixy, xmin, xmax, ymin, ymax]
+
+    area = signed area, positive for counter-clockwise vertices
+    cx, cy = centroid, 0 if the area is 0
+    Ix, Iy, Ixy = second moments of area about the global x and y axis
+    xmin, xmax, ymin, ymax = extents of the vertices
+    '''
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    props = edge_properties(x[:-1], y[:-1], x[1:], y[1:])
+
+    return props + [float(x.min()), float(x.max()), float(y.min()), float(y.max())]
+
+def edge_properties(xi, yi, xj, yj):
+    '''
+    area, centroid, and global axis properties from the Green's theorem
+    sums over a set of directed edges (xi,yi) -> (xj,yj)
+
+    the edges need not form a single polygon, ie. the edges of a solid
+    and of its voids, with opposite orientation, give the net properties
+
+    Returns:
+
+    [area, cx, cy, Ix, Iy, Ixy], see polygon_properties
+    '''
+    cross = (xi*yj)-(xj*yi)
+
+    area = cross.sum()/2.0
+
+    if area == 0:
+        cx = 0
+        cy = 0
+    else:
+        cx = np.dot(xi+xj, cross)/(6*area)
+        cy = np.dot(yi+yj, cross)/(6*area)
+
+    Ix = np.dot((yi*yi)+(yi*yj)+(yj*yj), cross)/12.0
+    Iy = np.dot((xi*xi)+(xi*xj)+(xj*xj), cross)/12.0
+    Ixy = np.dot((xi*yj)+(2*xi*yi)+(2*xj*yj)+(xj*yi), cross)/24.0
+
+    return [float(area), float(cx), float(cy), float(Ix), float(Iy), float(Ixy)]
+
+def signed_area(x, y):
+    '''
+    signed area of a closed polygon defined by (x,y) vertices,
+    positive for counter-clockwise vertices
+    '''
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    return float(((x[:-1]*y[1:])-(x[1:]*y[:-1])).sum()/2.0)
@@ -0,0 +1,118 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+
+# Optional plotting helpers
+#
+# matplotlib is only imported the first time a plot is made so the
+# analysis modules load without it, and without a display backend probe,
+# on machines that never plot.
+
+_plt = None
+
+def pyplot():
+    '''
+    return matplotlib.pyplot, importing it on first use
+    '''
+    global _plt
+
+    if _plt is None:
+        import matplotlib.pyplot as plt
+        _plt = plt
+
+    return _plt
+
+def _axes(ax):
+    if ax is None:
+        return pyplot().gca()
+    else:
+        return ax
+
+def plot_polygon(x, y, ax=None, style='c-'):
+    '''
+    plot the outline of a polygon given its x and y coordinates
+    returns the matplotlib axes
+    '''
+    ax = _axes(ax)
+
+    ax.plot(x, y, style)
+
+    return ax
+
+def plot_section(section, voids=(), bar_x=None, bar_y=None, ax=None):
+    '''
+    plot a polygon section, its voids, and optionally
+    the reinforcing bar locations
+    returns the matplotlib axes
+    '''
+    ax = _axes(ax)
+
+    ax.plot(section.x, section.y, 'c-')
+
+    for void in voids:
+        ax.plot(void.x, void.y, 'r--')
+
+    if bar_x is not None:
+        ax.plot(bar_x, bar_y, 'ko')
+
+    ax.set_aspect('equal')
+
+    return ax
+
+def plot_segments(segments, ax=None, labels=False):
+    '''
+    plot stress block segments, [[x1,y1],[x2,y2]] pairs or an (N,2,2) array,
+    each segment in its own color and labeled s_i if labels
+    returns the matplotlib axes
+    '''
+    ax = _axes(ax)
+
+    colors = "bgrk"
+
+    for k, segment in enumerate(segments):
+        xp = [i[0] for i in segment]
+        yp = [j[1] for j in segment]
+
+        ax.plot(xp, yp, c=colors[k % len(colors)])
+
+        if labels:
+            ax.text((xp[0]+xp[1])/2, (yp[0]+yp[1])/2, 's_'+str(k))
+
+    return ax
+
+def plot_interaction_diagram(P, M, ax=None, style='b-'):
+    '''
+    plot an interaction diagram, M on the horizontal and P on the vertical axis
+    returns the matplotlib axes
+    '''
+    ax = _axes(ax)
+
+    ax.plot(M, P, style)
+    ax.set_xlabel('M')
+    ax.set_ylabel('P')
+
+    return ax
@@ -0,0 +1,149 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import hashlib
+import numbers
+import numpy as np
+
+# bump when the encoding below or the meaning of cached results changes
+_VERSION = b'concretexsection-fingerprint-3'
+
+# diagnostic attributes, the warnings and log text, are not hashed so
+# they can change without changing the fingerprint, every other public
+# attribute is taken as an input to the analysis
+_DIAGNOSTIC = ('warnings', 'log', 'log_strings')
+
+def _feed(h, obj):
+    '''
+    write a canonical, type tagged encoding of obj into the hash h
+
+    numbers are hashed as float64 so 60000 and 60000.0 agree, sequences
+    of numbers are hashed as arrays, and objects by class name and their
+    public attributes less the _DIAGNOSTIC ones. Polygon sections are
+    hashed by their vertices in place of x and y, the class name gives
+    the solid or void role.
+    '''
+    if obj is None:
+        h.update(b'N')
+
+    elif isinstance(obj, (bool, np.bool_)):
+        h.update(b'B1' if obj else b'B0')
+
+    elif isinstance(obj, numbers.Number):
+        # + 0.0 folds -0.0 into 0.0
+        h.update(b'F' + (float(obj) + 0.0).hex().encode('ascii'))
+
+    elif isinstance(obj, str):
+        s = obj.encode('utf-8')
+        h.update(b'S' + str(len(s)).encode('ascii') + b':' + s)
+
+    elif isinstance(obj, np.ndarray):
+        a = np.ascontiguousarray(obj, dtype='<f8') + 0.0
+        h.update(b'A' + str(a.shape).encode('ascii'))
+        h.update(a.tobytes())
+
+    elif isinstance(obj, (list, tuple)):
+        if len(obj) > 0 and all(isinstance(i, numbers.Number) and not isinstance(i, bool) for i in obj):
+            _feed(h, np.asarray(obj, dtype=float))
+        else:
+            h.update(b'L' + str(len(obj)).encode('ascii'))
+            for i in obj:
+                _feed(h, i)
+
+    elif isinstance(obj, dict):
+        h.update(b'D' + str(len(obj)).encode('ascii'))
+        for key in sorted(obj, key=str):
+            _feed(h, str(key))
+            _feed(h, obj[key])
+
+    else:
+        h.update(b'O' + type(obj).__name__.encode('utf-8'))
+
+        vertices = getattr(obj, 'vertices', None)
+
+        if isinstance(vertices, np.ndarray):
+            _feed(h, vertices)
+
+        _feed(h, _public_attributes(obj, isinstance(vertices, np.ndarray)))
+
+def _public_attributes(obj, has_vertices=False):
+    '''
+    the public, non callable, attributes of an object from its __dict__
+    and the __slots__ of its classes, less the _DIAGNOSTIC ones, x and y
+    are left to the vertices when the object has them
+    '''
+    names = set(getattr(obj, '__dict__', ()))
+
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        names.update((slots,) if isinstance(slots, str) else slots)
+
+    attrs = {}
+
+    for name in names:
+        if name.startswith('_') or name in _DIAGNOSTIC:
+            continue
+        if has_vertices and name in ('x', 'y'):
+            continue
+
+        try:
+            value = getattr(obj, name)
+        except AttributeError:
+            continue
+
+        if not callable(value):
+            attrs[name] = value
+
+    return attrs
+
+def section_fingerprint(section, voids=(), rebar=None, material=None, stress_block=None, **params):
+    '''
+    deterministic sha256 hex digest identifying an analysis of a section
+
+    Inputs:
+    section = ConcreteSectionPolygon
+    voids = list of VoidSectionPolygon
+    rebar = reinforcing description, ie. a dict of bar_x, bar_y, bar_As
+            arrays, a list of bars, or a layout object
+    material = material object(s) or parameters of the concrete and steel
+    stress_block = name of the stress block, ie. 'ec2', 'pca', 'whitney'
+    params = any further inputs that change the result,
+            ie. fcd=4250, n=2, eu=0.0035, ec2=0.002, angles=...
+
+    The same inputs give the same fingerprint across runs and machines,
+    any change to a vertex, bar, or parameter gives a different one.
+    '''
+    h = hashlib.sha256(_VERSION)
+
+    _feed(h, section)
+    _feed(h, list(voids))
+    _feed(h, rebar)
+    _feed(h, material)
+    _feed(h, stress_block)
+    _feed(h, params)
+
+    return h.hexdigest()
@@ -0,0 +1,263 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import os
+import json
+import sqlite3
+import numpy as np
+
+class ResultStore(object):
+
+    def __init__(self, path, shape=None, fields=('P', 'Mx', 'My', 'c'), dtype='float64', block_size=1024, mode='a'):
+        '''
+        A store of fixed shape analysis results, ie. the (A,D) P, Mx, My,
+        and c arrays of interaction_surface for tens of thousands of
+        sections, keyed by a fingerprint from storage.fingerprint.section_fingerprint
+
+        results are written into .npy blocks of block_size slots, each
+        block an (block_size, fields, *shape) array written and read
+        through numpy memory maps, so neither writing nor reading holds
+        more than the pages in use. A sqlite index maps each key to its
+        slot and records the shape, fields, and dtype of the store.
+
+        Inputs:
+        path = directory for the store, created if it does not exist
+        shape = shape of each field of a result, required for a new store
+        fields = names of the arrays of a result
+        dtype = dtype the results are stored as
+        block_size = results per .npy block
+        mode = 'a' to read and write, 'r' to read only
+
+        an existing store keeps the shape, fields, dtype, and block_size
+        it was created with, the arguments given are then ignored except
+        a shape that does not match raises a ValueError.
+
+        Writes reach the index with flush, which is also done when a block
+        fills and on close. The store is meant for a single writing
+        process, any number of processes may read it in mode 'r'.
+        '''
+        self.path = path
+        self.mode = mode
+
+        if mode not in ('a', 'r'):
+            raise ValueError("mode must be 'a' or 'r'")
+
+        if mode == 'a' and not os.path.isdir(path):
+            os.makedirs(path)
+
+        index = os.path.join(path, 'index.sqlite')
+
+        if mode == 'r':
+            if not os.path.isfile(index):
+                raise IOError('no result store at {0}'.format(path))
+            self._db = sqlite3.connect('file:{0}?mode=ro'.format(index), uri=True)
+        else:
+            self._db = sqlite3.connect(index)
+            self._db.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, slot INTEGER)')
+
+        meta = dict(self._db.execute('SELECT name, value FROM meta').fetchall())
+
+        if meta:
+            self.shape = tuple(json.loads(meta['shape']))
+            self.fields = tuple(json.loads(meta['fields']))
+            self.dtype = np.dtype(meta['dtype'])
+            self.block_size = int(meta['block_size'])
+
+            if shape is not None and tuple(shape) != self.shape:
+                raise ValueError('store results have shape {0}, not {1}'.format(self.shape, tuple(shape)))
+
+        elif mode == 'r' or shape is None:
+            raise ValueError('a new result store needs the result shape')
+
+        else:
+            self.shape = tuple(int(s) for s in shape)
+            self.fields = tuple(fields)
+            self.dtype = np.dtype(dtype)
+            self.block_size = int(block_size)
+
+            self._db.executemany('INSERT INTO meta (name, value) VALUES (?,?)',
+                                 [('shape', json.dumps(self.shape)),
+                                  ('fields', json.dumps(self.fields)),
+                                  ('dtype', self.dtype.str),
+                                  ('block_size', str(self.block_size))])
+            self._db.commit()
+
+        self._field_index = dict((name, i) for i, name in enumerate(self.fields))
+        self._blocks = {}
+        self._slots = self._db.execute('SELECT COALESCE(MAX(slot)+1, 0) FROM results').fetchone()[0]
+
+    def _file(self, block):
+        return os.path.join(self.path, 'block_{0:06d}.npy'.format(block))
+
+    def _block(self, block, create=False):
+        try:
+            return self._blocks[block]
+        except KeyError:
+            pass
+
+        fname = self._file(block)
+
+        if create and not os.path.isfile(fname):
+            data = np.lib.format.open_memmap(fname, mode='w+', dtype=self.dtype,
+                                             shape=(self.block_size, len(self.fields)) + self.shape)
+        else:
+            data = np.load(fname, mmap_mode='r+' if self.mode == 'a' else 'r')
+
+        self._blocks[block] = data
+
+        return data
+
+    def _slot(self, key):
+        row = self._db.execute('SELECT slot FROM results WHERE key=?', (key,)).fetchone()
+
+        return None if row is None else row[0]
+
+    def __contains__(self, key):
+        return self._slot(key) is not None
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def keys(self):
+        '''
+        list of the stored keys in the order they were written
+        '''
+        return [key for (key,) in self._db.execute('SELECT key FROM results ORDER BY slot').fetchall()]
+
+    def put(self, key, **arrays):
+        '''
+        write the named field arrays under key, replacing any existing
+        result in place, every field of the store is required
+        '''
+        if self.mode == 'r':
+            raise IOError('result store is open read only')
+
+        missing = set(self.fields).difference(arrays)
+
+        if missing:
+            raise ValueError('missing result fields: {0}'.format(', '.join(sorted(missing))))
+
+        values = [np.asarray(arrays[name]) for name in self.fields]
+
+        for name, a in zip(self.fields, values):
+            if a.shape != self.shape:
+                raise ValueError('field {0} has shape {1}, the store holds {2}'.format(name, a.shape, self.shape))
+
+        slot = self._slot(key)
+        new = slot is None
+
+        if new:
+            slot = self._slots
+
+        block, row = divmod(slot, self.block_size)
+        data = self._block(block, create=True)
+
+        for i, a in enumerate(values):
+            data[row,i] = a
+
+        if new:
+            self._db.execute('INSERT INTO results (key, slot) VALUES (?,?)', (key, slot))
+            self._slots += 1
+
+            if self._slots % self.block_size == 0:
+                self.flush()
+
+    def get(self, key):
+        '''
+        return a dict of read only (shape) views of the fields stored
+        under key or None, the data is paged in as it is used
+        '''
+        slot = self._slot(key)
+
+        if slot is None:
+            return None
+
+        block, row = divmod(slot, self.block_size)
+        data = self._block(block)[row]
+
+        # the blocks are open for writing in mode 'a', only put may write
+        views = {}
+        for name, i in self._field_index.items():
+            view = data[i]
+            view.flags.writeable = False
+            views[name] = view
+
+        return views
+
+    def get_many(self, keys, fields=None):
+        '''
+        return a dict of (K, shape) arrays of the fields, default all,
+        for the list of keys, reading only the slots of those keys,
+        a KeyError is raised for a key not in the store
+        '''
+        fields = self.fields if fields is None else tuple(fields)
+        columns = [self._field_index[name] for name in fields]
+
+        slots = []
+        for key in keys:
+            slot = self._slot(key)
+            if slot is None:
+                raise KeyError(key)
+            slots.append(slot)
+
+        slots = np.asarray(slots, dtype=np.intp)
+        out = np.empty((slots.shape[0], len(fields)) + self.shape, dtype=self.dtype)
+
+        blocks, rows = np.divmod(slots, self.block_size)
+
+        for block in np.unique(blocks):
+            take = np.flatnonzero(blocks == block)
+            data = self._block(int(block))
+
+            for j, c in enumerate(columns):
+                out[take,j] = data[rows[take],c]
+
+        return dict((name, out[:,j]) for j, name in enumerate(fields))
+
+    def flush(self):
+        '''
+        write the block memory maps to disk then commit the index, so
+        the index never refers to a result that is not on disk
+        '''
+        for data in self._blocks.values():
+            if isinstance(data, np.memmap) and self.mode == 'a':
+                data.flush()
+
+        if self.mode == 'a':
+            self._db.commit()
+
+    def close(self):
+        self.flush()
+        self._blocks = {}
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
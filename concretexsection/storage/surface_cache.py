@@ -0,0 +1,184 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import os
+import sqlite3
+import numpy as np
+
+class SurfaceCache(object):
+
+    def __init__(self, path, max_bytes=2**30):
+        '''
+        A persistent store of analysis results, ie. interaction surfaces,
+        keyed by a fingerprint from storage.fingerprint.section_fingerprint
+
+        each entry is a .npz file of named arrays in the directory path,
+        a sqlite index records the file sizes and the order of use so the
+        least recently used entries are evicted to keep the store under
+        max_bytes.
+
+        Inputs:
+        path = directory for the store, created if it does not exist
+        max_bytes = size cap of the stored .npz files
+
+        The store is meant for use by a single process at a time.
+        '''
+        self.path = path
+        self.max_bytes = max_bytes
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        self._db = sqlite3.connect(os.path.join(path, 'index.sqlite'))
+        self._db.execute('CREATE TABLE IF NOT EXISTS entries '
+                         '(key TEXT PRIMARY KEY, size INTEGER, access INTEGER)')
+        self._db.commit()
+
+        self._clock = self._db.execute('SELECT COALESCE(MAX(access), 0) FROM entries').fetchone()[0]
+
+    def _file(self, key):
+        return os.path.join(self.path, key + '.npz')
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def __contains__(self, key):
+        return self._db.execute('SELECT 1 FROM entries WHERE key=?', (key,)).fetchone() is not None
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    @property
+    def size(self):
+        '''
+        total bytes of the stored .npz files
+        '''
+        return self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def get(self, key):
+        '''
+        return a dict of the arrays stored under key or None
+        '''
+        if key not in self:
+            return None
+
+        try:
+            with np.load(self._file(key), allow_pickle=False) as data:
+                arrays = dict((name, data[name]) for name in data.files)
+        except (IOError, OSError, ValueError):
+            # file lost or damaged, drop the entry
+            self._db.execute('DELETE FROM entries WHERE key=?', (key,))
+            self._db.commit()
+            return None
+
+        # committed now so the order of use survives an exit without close
+        self._db.execute('UPDATE entries SET access=? WHERE key=?', (self._tick(), key))
+        self._db.commit()
+
+        return arrays
+
+    def put(self, key, **arrays):
+        '''
+        store the named arrays under key, replacing any existing entry,
+        then evict the least recently used entries over the size cap
+        '''
+        fname = self._file(key)
+        tmp = os.path.join(self.path, key + '.tmp.npz')
+
+        np.savez(tmp, **arrays)
+        os.replace(tmp, fname)
+
+        self._db.execute('INSERT OR REPLACE INTO entries (key, size, access) VALUES (?,?,?)',
+                         (key, os.path.getsize(fname), self._tick()))
+
+        self._evict(keep=key)
+        self._db.commit()
+
+    def get_or_compute(self, key, compute):
+        '''
+        return the arrays stored under key, on a miss call compute(),
+        which should return a dict of named arrays, and store the result
+        '''
+        arrays = self.get(key)
+
+        if arrays is None:
+            arrays = dict((name, np.asarray(a)) for name, a in compute().items())
+            self.put(key, **arrays)
+
+        return arrays
+
+    def _evict(self, keep=None):
+        total = self.size
+
+        if total <= self.max_bytes:
+            return
+
+        rows = self._db.execute('SELECT key, size FROM entries ORDER BY access').fetchall()
+
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+
+            self._remove(key)
+            total -= size
+
+    def _remove(self, key):
+        try:
+            os.remove(self._file(key))
+        except OSError:
+            pass
+
+        self._db.execute('DELETE FROM entries WHERE key=?', (key,))
+
+    def delete(self, key):
+        '''
+        remove the entry stored under key
+        '''
+        self._remove(key)
+        self._db.commit()
+
+    def clear(self):
+        '''
+        remove every entry
+        '''
+        for (key,) in self._db.execute('SELECT key FROM entries').fetchall():
+            self._remove(key)
+
+        self._db.commit()
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
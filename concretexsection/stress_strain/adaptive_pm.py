@@ -0,0 +1,177 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import numpy as np
+
+def _chord_deviation(a, m, b, scale):
+    '''
+    distance of the points m from the chords a-b with each
+    column of the points divided by scale
+    '''
+    a = a/scale
+    m = m/scale
+    b = b/scale
+
+    chord = b - a
+    offset = m - a
+
+    length = np.hypot(chord[:,0], chord[:,1])
+    cross = np.abs((chord[:,0]*offset[:,1]) - (chord[:,1]*offset[:,0]))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dev = np.where(length > 0, cross/length, np.hypot(offset[:,0], offset[:,1]))
+
+    return dev
+
+def adaptive_pm_diagram(pm_function, c_min, c_max, tol=1e-3, n_initial=9, max_evaluations=400, moment=1):
+    """
+    Sample a P-M interaction diagram with neutral axis depths placed
+    where the diagram bends instead of at uniform steps.
+
+    Starting from n_initial depths spaced geometrically between c_min and
+    c_max every interval is split at its geometric mid depth. Intervals
+    whose mid point lies further than tol from the chord of its end
+    points are split again, the rest are accepted. All the mid points of
+    a refinement pass are evaluated in a single pm_function call.
+
+    The deviation is measured with P and M each divided by the extent of
+    the diagram sampled so far, so tol is a fraction of the diagram size.
+
+    Parameters
+    ----------
+    pm_function: function
+                (M,) array of depths -> (M,3) array of P, Mx, My,
+                ie. lambda c: ec2_stress_block_batch(segments, fcd, n, eu, ec2, c)
+                plus the bar forces
+    c_min: float
+            smallest neutral axis depth, > 0
+    c_max: float
+            largest neutral axis depth
+    tol: float
+        allowed chord deviation as a fraction of the diagram size
+    n_initial: int
+            number of depths in the starting sample, >= 2
+    max_evaluations: int
+            cap on the number of depths evaluated, at least the
+            2*n_initial - 1 depths of the starting sample and its
+            first refinement pass so every interval is measured
+    moment: int
+            column of the pm_function results used as M, 1 for Mx, 2 for My
+
+    Returns:
+    ---------
+    c: (K,) numpy array
+        sorted neutral axis depths
+    results: (K,3) numpy array
+            P, Mx, My at each depth
+    error: float
+            largest chord deviation left in the diagram, <= tol
+            unless max_evaluations was reached. The deviation is
+            measured at the mid depth of each accepted interval, a kink
+            elsewhere in the interval, ie. a bar yielding, can leave the
+            diagram up to about twice as far from the chord
+    """
+    if not 0 < c_min < c_max:
+        raise ValueError('depth range must satisfy 0 < c_min < c_max')
+
+    if not tol > 0:
+        raise ValueError('tol must be > 0')
+
+    if n_initial < 2:
+        raise ValueError('n_initial must be >= 2')
+
+    if max_evaluations < (2*n_initial) - 1:
+        raise ValueError('max_evaluations must be >= 2*n_initial - 1 = {0}'.format((2*n_initial) - 1))
+
+    if moment not in (1, 2):
+        raise ValueError('moment must be 1 for Mx or 2 for My')
+
+    cols = [0, moment]
+
+    c = np.geomspace(c_min, c_max, n_initial)
+    res = np.asarray(pm_function(c), dtype=float)
+
+    all_c = [c]
+    all_res = [res]
+    evaluations = n_initial
+
+    # open intervals and the deviation measured on their parent
+    lo_c = c[:-1]
+    hi_c = c[1:]
+    lo_r = res[:-1,cols]
+    hi_r = res[1:,cols]
+    parent_dev = np.full(lo_c.shape, np.inf)
+
+    error = 0.0
+
+    while lo_c.shape[0] > 0:
+        budget = max_evaluations - evaluations
+
+        if budget <= 0:
+            error = max(error, parent_dev.max())
+            break
+
+        if lo_c.shape[0] > budget:
+            # split the worst intervals with what is left and
+            # report the deviation of the others
+            order = np.argsort(-parent_dev, kind='stable')
+            error = max(error, parent_dev[order[budget:]].max())
+            keep = np.sort(order[:budget])
+
+            lo_c = lo_c[keep]
+            hi_c = hi_c[keep]
+            lo_r = lo_r[keep]
+            hi_r = hi_r[keep]
+
+        mid_c = np.sqrt(lo_c*hi_c)
+        mid_res = np.asarray(pm_function(mid_c), dtype=float)
+        mid_r = mid_res[:,cols]
+
+        all_c.append(mid_c)
+        all_res.append(mid_res)
+        evaluations += mid_c.shape[0]
+
+        # extent of the diagram sampled so far
+        sampled = np.concatenate(all_res)[:,cols]
+        scale = sampled.max(axis=0) - sampled.min(axis=0)
+        scale[scale == 0] = 1.0
+
+        dev = _chord_deviation(lo_r, mid_r, hi_r, scale)
+        refine = dev > tol
+
+        error = max(error, dev[~refine].max(initial=0.0))
+
+        lo_c, hi_c = np.concatenate((lo_c[refine], mid_c[refine])), np.concatenate((mid_c[refine], hi_c[refine]))
+        lo_r, hi_r = np.concatenate((lo_r[refine], mid_r[refine])), np.concatenate((mid_r[refine], hi_r[refine]))
+        parent_dev = np.concatenate((dev[refine], dev[refine]))
+
+    c = np.concatenate(all_c)
+    res = np.concatenate(all_res)
+
+    order = np.argsort(c, kind='stable')
+
+    return c[order], res[order], error
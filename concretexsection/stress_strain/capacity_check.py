@@ -0,0 +1,309 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import math
+import numpy as np
+
+# Demand/capacity checks of (P, Mx, My) load combinations against a
+# P-Mx-My interaction surface, ie. from interaction_surface.
+#
+# The surface is resampled once onto axial load levels, evenly spaced,
+# at quantiles of the sampled loads, which gather where the rows bend
+# near the ends, and at the end loads of every row. Each row is
+# interpolated at the levels over its own P range and, beyond it, runs on
+# to the tension or compression end point of the surface, the sampled
+# point of least or greatest P, so every level has a closed slice polygon.
+# With unsymmetric reinforcement the end points, and the slices near them,
+# are away from the P axis, so each slice is kept as the angles of its
+# points about its own center, the mean of its points. Offsetting the
+# angles by 8*level makes every slice one sorted array and all demands
+# find their slice edge with a single searchsorted.
+#
+# A demand is inside the slice at its axial load when its moment distance
+# from the center is within the slice radius in its direction. For the
+# radial ratio the point on the surface along the ray from the origin
+# through the demand is found once, by bisection on that test, for a grid
+# of ray directions, with P and M each scaled by the surface extent, and
+# demands interpolate the grid.
+
+def _cross(ax, ay, bx, by):
+    return (ax*by) - (ay*bx)
+
+
+class CapacitySurface(object):
+    '''
+    An interaction surface resampled for vectorized demand/capacity
+    ratios of millions of load combinations.
+
+    Compression is (+), the surface must enclose the origin, ie. include
+    both tension and compression, and each row of the surface should be
+    a meridian with P changing monotonically with the neutral axis depth.
+    '''
+
+    __slots__ = ('levels', 'centers', 'tolerance', '_keys', '_x', '_y',
+                 '_n_points', '_betas', '_phis', '_rho', '_P_scale', '_M_scale')
+
+    def __init__(self, P, Mx, My, n_levels=100, n_directions=360, n_elevations=181):
+        '''
+        Inputs:
+
+        P, Mx, My = (A,D) surface arrays, one row per neutral axis angle,
+                    see interaction_surface
+        n_levels = axial load levels evenly spaced from the tension to the
+                    compression end of the surface, and as many at
+                    quantiles of the surface loads, in addition to the end
+                    loads of every row
+        n_directions = moment directions over 2*pi for the radial ratio
+        n_elevations = ray elevations from pure tension to pure compression
+                        for the radial ratio
+
+        demand moments within tolerance, 1e-9 times the largest moment of
+        the surface, of a slice center are taken as pure axial loads
+        '''
+        P = np.asarray(P, dtype=float)
+        Mx = np.asarray(Mx, dtype=float)
+        My = np.asarray(My, dtype=float)
+
+        if not (P.min() < 0 < P.max()):
+            raise ValueError('the surface must include tension and compression to enclose the origin')
+
+        lo = P.min()
+        hi = P.max()
+
+        M_max = float(np.hypot(Mx, My).max())
+
+        self.levels = np.unique(np.concatenate((np.linspace(lo, hi, n_levels),
+                                               np.quantile(P, np.linspace(0, 1, n_levels)),
+                                               P.min(axis=1), P.max(axis=1))))
+        self.tolerance = 1e-9*M_max
+
+        # end points of the surface
+        i_lo = np.unravel_index(np.argmin(P), P.shape)
+        i_hi = np.unravel_index(np.argmax(P), P.shape)
+
+        # moment points of every row at every level
+        A = P.shape[0]
+        L = self.levels.shape[0]
+
+        mx = np.empty((L, A))
+        my = np.empty((L, A))
+
+        for a in range(A):
+            order = np.argsort(P[a], kind='stable')
+            Pa = np.concatenate(([lo], P[a][order], [hi]))
+            Mxa = np.concatenate(([Mx[i_lo]], Mx[a][order], [Mx[i_hi]]))
+            Mya = np.concatenate(([My[i_lo]], My[a][order], [My[i_hi]]))
+
+            mx[:,a] = np.interp(self.levels, Pa, Mxa)
+            my[:,a] = np.interp(self.levels, Pa, Mya)
+
+        centers = np.column_stack((mx.mean(axis=1), my.mean(axis=1)))
+        centers.flags.writeable = False
+        self.centers = centers
+
+        # slice points sorted by angle about their center
+        x = mx - centers[:,0:1]
+        y = my - centers[:,1:2]
+
+        beta = np.arctan2(y, x) % (2*math.pi)
+        order = np.argsort(beta, axis=1, kind='stable')
+
+        self._n_points = A
+        self._keys = (np.take_along_axis(beta, order, axis=1) + 8*np.arange(L)[:,None]).reshape(-1)
+        self._x = np.take_along_axis(x, order, axis=1).reshape(-1)
+        self._y = np.take_along_axis(y, order, axis=1).reshape(-1)
+
+        # distance to the surface along a grid of rays from the origin
+        self._P_scale = max(-lo, hi)
+        self._M_scale = M_max if M_max > 0 else 1.0
+        self._betas = np.arange(n_directions)*((2*math.pi)/n_directions)
+        self._phis = np.linspace(-0.5*math.pi, 0.5*math.pi, n_elevations)
+
+        beta, phi = np.meshgrid(self._betas, self._phis, indexing='ij')
+
+        self._rho = self._ray_limit(np.sin(phi)*self._P_scale,
+                                    np.cos(phi)*np.cos(beta)*self._M_scale,
+                                    np.cos(phi)*np.sin(beta)*self._M_scale)
+
+    @classmethod
+    def from_store(cls, store, key, n_levels=100, n_directions=360, n_elevations=181):
+        '''
+        capacity surface of the P, Mx, and My fields stored under key
+        in a storage.result_store.ResultStore
+        '''
+        result = store.get(key)
+
+        if result is None:
+            raise KeyError(key)
+
+        return cls(result['P'], result['Mx'], result['My'], n_levels, n_directions, n_elevations)
+
+    def _radius(self, level, dx, dy):
+        '''
+        radius of the slice polygons at level along the directions dx, dy
+        from their centers
+        '''
+        A = self._n_points
+
+        k = np.searchsorted(self._keys, (np.arctan2(dy, dx) % (2*math.pi)) + 8*level, side='right')
+
+        # edge from point j-1 to point j around the polygon
+        j = (k - level*A) % A
+        i0 = level*A + (j - 1) % A
+        i1 = level*A + j
+
+        x0 = self._x[i0]
+        y0 = self._y[i0]
+        ex = self._x[i1] - x0
+        ey = self._y[i1] - y0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = _cross(x0, y0, ex, ey)/_cross(dx, dy, ex, ey)*np.hypot(dx, dy)
+
+        return np.where(np.isfinite(r) & (r > 0), r, np.hypot(x0, y0))
+
+    def _slice(self, P, Mx, My):
+        '''
+        moment distance of each demand from the slice center at its
+        axial load, the slice radius in that direction, and whether
+        the axial load is within the surface
+        '''
+        levels = self.levels
+        i = np.clip(np.searchsorted(levels, P, side='right'), 1, levels.shape[0]-1)
+        t = np.clip((P - levels[i-1])/(levels[i] - levels[i-1]), 0, 1)
+
+        c = self.centers
+        dx = Mx - (c[i-1,0] + t*(c[i,0] - c[i-1,0]))
+        dy = My - (c[i-1,1] + t*(c[i,1] - c[i-1,1]))
+
+        r0 = self._radius(i-1, dx, dy)
+        r1 = self._radius(i, dx, dy)
+
+        inside = (P >= levels[0]) & (P <= levels[-1])
+
+        return np.hypot(dx, dy), r0 + t*(r1 - r0), inside
+
+    def _moment_ratio(self, P, Mx, My):
+        distance, radius, inside = self._slice(P, Mx, My)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(radius > 0, distance/radius, np.where(distance <= self.tolerance, 0.0, np.inf))
+
+        return np.where(inside, ratio, np.inf), distance
+
+    def _ray_limit(self, P, Mx, My):
+        '''
+        scale t of each ray (P, Mx, My) from the origin so t*(P, Mx, My)
+        is on the surface
+        '''
+        lo = np.zeros(P.shape)
+        hi = np.ones(P.shape)
+
+        for _ in range(64):
+            grow = self._moment_ratio(hi*P, hi*Mx, hi*My)[0] <= 1
+            if not grow.any():
+                break
+            lo = np.where(grow, hi, lo)
+            hi = np.where(grow, 2*hi, hi)
+
+        for _ in range(52):
+            mid = 0.5*(lo + hi)
+            inside = self._moment_ratio(mid*P, mid*Mx, mid*My)[0] <= 1
+            lo = np.where(inside, mid, lo)
+            hi = np.where(inside, hi, mid)
+
+        return 0.5*(lo + hi)
+
+    def moment_capacity(self, P, Mx, My):
+        '''
+        moment capacity radius at the axial load P about the slice center,
+        in the direction of the demand moment from the center,
+        0 outside the axial load range of the surface
+        '''
+        P = np.asarray(P, dtype=float)
+
+        _, radius, inside = self._slice(P, np.asarray(Mx, dtype=float), np.asarray(My, dtype=float))
+
+        return np.where(inside, radius, 0.0)
+
+    def dcr(self, P, Mx, My, method='radial'):
+        '''
+        demand/capacity ratios of the load combinations P, Mx, My,
+        arrays of any matching shape
+
+        method = 'radial', the ratio along the ray from the origin through
+                    the demand point, P and M scale together
+                 'moment', the ratio of the demand moment to the moment
+                    capacity at the same axial load, both measured from
+                    the slice center, inf if the axial load is outside
+                    the surface. A demand within tolerance of the center
+                    is a pure axial load and its ratio is P over the
+                    axial capacity.
+
+        a ratio <= 1 is inside the surface
+        '''
+        P = np.asarray(P, dtype=float)
+        Mx = np.asarray(Mx, dtype=float)
+        My = np.asarray(My, dtype=float)
+
+        if method == 'moment':
+            ratio, distance = self._moment_ratio(P, Mx, My)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                axial = np.where(P > 0, P/self.levels[-1], np.where(P < 0, P/self.levels[0], 0.0))
+
+            return np.where(distance <= self.tolerance, axial, ratio)
+
+        elif method != 'radial':
+            raise ValueError("method must be 'radial' or 'moment'")
+
+        u = P/self._P_scale
+        m = np.hypot(Mx, My)/self._M_scale
+
+        # ray direction and elevation from the moment plane on the grid
+        n = self._betas.shape[0]
+        s = (np.arctan2(My, Mx) % (2*math.pi))*(n/(2*math.pi))
+        j0 = np.floor(s).astype(np.intp) % n
+        j1 = (j0 + 1) % n
+        w = s - np.floor(s)
+
+        e = (np.arctan2(u, m) + 0.5*math.pi)*((self._phis.shape[0]-1)/math.pi)
+        k = np.clip(np.floor(e).astype(np.intp), 0, self._phis.shape[0]-2)
+        v = e - k
+
+        rho = self._rho
+        r0 = rho[j0,k] + v*(rho[j0,k+1] - rho[j0,k])
+        r1 = rho[j1,k] + v*(rho[j1,k+1] - rho[j1,k])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.hypot(u, m)/(r0 + w*(r1 - r0))
+
+    def inside(self, P, Mx, My, method='radial'):
+        '''
+        True for the load combinations inside the surface
+        '''
+        return self.dcr(P, Mx, My, method) <= 1
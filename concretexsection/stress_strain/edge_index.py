@@ -0,0 +1,343 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import numpy as np
+from .p_m_by_segment import (_segment_endpoints, _project_segments, _clip_segments,
+                             _constant_segment_integrals, _rotate_resultants)
+
+class EdgeIndex(object):
+    '''
+    Edges of a section sorted by their lowest y coordinate, with suffix
+    sums of the constant stress line integrals, and an interval tree of
+    the edge y ranges, so the P, Mx, and My of the part of the section
+    above any cut is found in O(log n + k) for the k edges crossing it.
+
+    Every edge with ylo >= y is entirely above a cut at y and is taken
+    from the suffix sums. The edges crossing the cut, ylo < y < yhi, are
+    found with a centered interval tree: each node keeps the edges that
+    span its center sorted by ylo and by yhi, edges entirely below the
+    center go to the left child and entirely above to the right. A cut
+    below a center reports the node edges with ylo < y and moves left,
+    above it reports the node edges with yhi > y and moves right, so
+    only crossing edges are ever visited regardless of the edge lengths.
+
+    The tree is stored as flat arrays and the node lists are searched
+    with integer keys node*(R+1) + rank, R the number of distinct y
+    values, so a batch of cuts descends the tree one level at a time
+    with a single searchsorted per level.
+
+    Horizontal edges contribute nothing to the line integrals and are
+    dropped.
+    '''
+
+    __slots__ = ('x1', 'y1', 'x2', 'y2', 'ylo', 'yhi',
+                 'y_min', 'y_max', 'angle', '_suffix',
+                 '_values', '_center', '_left', '_right', '_start',
+                 '_lo_keys', '_lo_edges', '_hi_keys', '_hi_edges')
+
+    def __init__(self, segments, xo=0, yo=0, angle=None):
+        '''
+        Inputs:
+
+        segments = the closed edge segments of the section,
+                    nested lists or an (N,2,2) array
+        xo, yo, angle = optional projection of the edges onto axes rotated
+                        by angle, radians, about (xo,yo), as
+                        PolygonSection.transformed_vertices_radians would,
+                        cut elevations are then in the rotated axes and the
+                        moments are returned in the section axes about (xo,yo)
+        '''
+        x1, y1, x2, y2 = _segment_endpoints(segments)
+
+        if angle is not None:
+            x1, y1, x2, y2 = _project_segments(x1, y1, x2, y2, xo, yo, angle)
+
+        self.angle = angle
+        self.y_min = float(min(y1.min(), y2.min()))
+        self.y_max = float(max(y1.max(), y2.max()))
+
+        keep = y1 != y2
+
+        ylo = np.minimum(y1[keep], y2[keep])
+        order = np.argsort(ylo, kind='stable')
+
+        self.x1 = x1[keep][order]
+        self.y1 = y1[keep][order]
+        self.x2 = x2[keep][order]
+        self.y2 = y2[keep][order]
+        self.ylo = ylo[order]
+        self.yhi = np.maximum(self.y1, self.y2)
+
+        per_edge = np.stack(_constant_segment_integrals(self.x1, self.y1, self.x2, self.y2, 1.0), axis=1)
+
+        # _suffix[i] = sum of the integrals of edges i to the end
+        suffix = np.zeros((per_edge.shape[0]+1,3))
+        suffix[:-1] = np.cumsum(per_edge[::-1], axis=0)[::-1]
+
+        self._suffix = suffix
+
+        self._build_tree()
+
+    def _build_tree(self):
+        '''
+        centered interval tree of the edge y ranges as flat arrays
+        '''
+        ylo = self.ylo
+        yhi = self.yhi
+
+        self._values = np.unique(np.concatenate((ylo, yhi)))
+        R = self._values.shape[0]
+
+        lo_rank = np.searchsorted(self._values, ylo)
+        hi_rank = np.searchsorted(self._values, yhi)
+
+        center = []
+        left = []
+        right = []
+        lo_keys = []
+        lo_edges = []
+        hi_keys = []
+        hi_edges = []
+
+        # nodes are numbered in the order they are made, children after
+        # their parent, and each node's lists follow the previous node's
+        pending = [(np.arange(ylo.shape[0]), -1, 0)]
+
+        while pending:
+            edges, parent, side = pending.pop()
+
+            node = len(center)
+
+            if parent >= 0:
+                (left if side < 0 else right)[parent] = node
+
+            # median end point, at most half the edges fall to either side
+            c = float(np.median(np.concatenate((ylo[edges], yhi[edges]))))
+
+            below = yhi[edges] < c
+            above = ylo[edges] > c
+            spans = edges[~(below | above)]
+
+            center.append(c)
+            left.append(-1)
+            right.append(-1)
+
+            by_lo = spans[np.argsort(lo_rank[spans], kind='stable')]
+            by_hi = spans[np.argsort(R - hi_rank[spans], kind='stable')]
+
+            lo_keys.append(node*(R+1) + lo_rank[by_lo])
+            lo_edges.append(by_lo)
+            hi_keys.append(node*(R+1) + (R - hi_rank[by_hi]))
+            hi_edges.append(by_hi)
+
+            if below.any():
+                pending.append((edges[below], node, -1))
+            if above.any():
+                pending.append((edges[above], node, 1))
+
+        counts = [e.shape[0] for e in lo_edges]
+
+        self._center = np.array(center)
+        self._left = np.array(left, dtype=np.intp)
+        self._right = np.array(right, dtype=np.intp)
+        self._start = np.concatenate(([0], np.cumsum(counts))).astype(np.intp)
+
+        empty = np.zeros(0, dtype=np.intp)
+
+        self._lo_keys = np.concatenate(lo_keys) if lo_keys else empty
+        self._lo_edges = np.concatenate(lo_edges) if lo_edges else empty
+        self._hi_keys = np.concatenate(hi_keys) if hi_keys else empty
+        self._hi_edges = np.concatenate(hi_edges) if hi_edges else empty
+
+    def _crossing(self, Y):
+        '''
+        cut and edge index arrays pairing each cut in the (M,) array Y
+        with every edge crossing it, ylo < y < yhi
+        '''
+        M = Y.shape[0]
+        empty = np.zeros(0, dtype=np.intp)
+
+        if self._center.shape[0] == 0 or M == 0:
+            return empty, empty
+
+        R = self._values.shape[0]
+        rank_lo = np.searchsorted(self._values, Y, side='left')
+        rank_hi = np.searchsorted(self._values, Y, side='right')
+
+        cuts = np.arange(M)
+        node = np.zeros(M, dtype=np.intp)
+
+        out_cut = []
+        out_first = []
+        out_count = []
+        out_list = []
+
+        while cuts.shape[0] > 0:
+            c = self._center[node]
+            y = Y[cuts]
+            start = self._start[node]
+            base = node*(R+1)
+
+            low = y <= c
+
+            # node edges with ylo < y, they all reach the center
+            n_lo = np.searchsorted(self._lo_keys, base + rank_lo[cuts], side='left') - start
+            # node edges with yhi > y, they all start below the center
+            n_hi = np.searchsorted(self._hi_keys, base + (R - rank_hi[cuts]), side='right') - start
+
+            out_cut.append(cuts)
+            out_first.append(start)
+            out_count.append(np.where(low, n_lo, n_hi))
+            out_list.append(low)
+
+            child = np.where(y < c, self._left[node], np.where(y > c, self._right[node], -1))
+            more = child >= 0
+
+            cuts = cuts[more]
+            node = child[more]
+
+        cut = np.concatenate(out_cut)
+        first = np.concatenate(out_first)
+        count = np.concatenate(out_count)
+        low = np.concatenate(out_list)
+
+        total = int(count.sum())
+
+        if total == 0:
+            return empty, empty
+
+        owner = np.repeat(np.arange(cut.shape[0]), count)
+        offset = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+        position = first[owner] + offset
+
+        edge = np.where(low[owner], self._lo_edges[position], self._hi_edges[position])
+        cut = cut[owner]
+
+        # a cut exactly at a center reports the node edges with ylo < y,
+        # drop any of those ending at the cut
+        crossing = self.yhi[edge] > Y[cut]
+
+        return cut[crossing], edge[crossing]
+
+    def crossing(self, y_cut):
+        '''
+        indices, in the sorted edge order of x1, y1, x2, y2, of the edges
+        crossing a single cut at y_cut, ylo < y_cut < yhi. These are the
+        only edges any of the cut queries clip.
+        '''
+        return np.sort(self._crossing(np.array([float(y_cut)]))[1])
+
+    def _above(self, Y):
+        end = np.searchsorted(self.ylo, Y, side='left')
+
+        results = self._suffix[end].copy()
+
+        cut, edge = self._crossing(Y)
+
+        if edge.shape[0] > 0:
+            A, D, B, E = _clip_segments(self.x1[edge], self.y1[edge], self.x2[edge], self.y2[edge],
+                                        Y[cut], np.inf)
+
+            for i, r in enumerate(_constant_segment_integrals(A, D, B, E, 1.0)):
+                results[:,i] += np.bincount(cut, weights=r, minlength=Y.shape[0])
+
+        return results
+
+    def above(self, y_cut):
+        '''
+        area, first moment about the x axis, and first moment about the
+        y axis of the part of the section above y_cut, ie. P, Mx, My of a
+        unit stress, for a float or (M,) array of cuts
+
+        returns a (3,) or (M,3) array
+        '''
+        Y = np.asarray(y_cut, dtype=float)
+        results = self._above(Y.reshape(-1))
+
+        if self.angle is not None:
+            _rotate_resultants(results, self.angle)
+
+        return results.reshape(Y.shape+(3,))
+
+    def band(self, stress, y_low, y_high):
+        '''
+        P, Mx, and My of a constant stress over y_low <= y <= y_high,
+        ie. the Whitney block stress=0.85*f'c from y_max - beta1*c to y_max
+
+        returns a (3,) or (M,3) array
+        '''
+        low = np.asarray(y_low, dtype=float)
+        high = np.asarray(y_high, dtype=float)
+        shape = np.broadcast(low, high).shape
+
+        low = np.broadcast_to(low, shape).reshape(-1)
+        high = np.broadcast_to(high, shape).reshape(-1)
+
+        results = stress*(self._above(low) - self._above(high))
+
+        if self.angle is not None:
+            _rotate_resultants(results, self.angle)
+
+        return results.reshape(shape+(3,))
+
+    def width(self, y_cut):
+        '''
+        width of the section at y_cut, float or (M,) array of cuts,
+        the sum of x*sign(dy) over the edges crossing the cut
+        '''
+        Y = np.asarray(y_cut, dtype=float)
+        shape = Y.shape
+        Y = Y.reshape(-1)
+
+        cut, edge = self._crossing(Y)
+
+        x1 = self.x1[edge]
+        y1 = self.y1[edge]
+        dy = self.y2[edge] - y1
+
+        x_cut = x1 + ((Y[cut] - y1)/dy)*(self.x2[edge] - x1)
+
+        width = np.bincount(cut, weights=x_cut*np.sign(dy), minlength=Y.shape[0])
+
+        return width.reshape(shape)
+
+    def band_segments(self, y_low, y_high):
+        '''
+        the edges clipped to y_low <= y <= y_high as an (K,2,2) array, only
+        the K edges that reach the band are clipped, ready for the
+        p_m_by_segment array functions, ie. the parabolic region of the
+        EC2 block, in the index axes
+        '''
+        start = np.searchsorted(self.ylo, y_low, side='left')
+        end = np.searchsorted(self.ylo, y_high, side='left')
+
+        # edges crossing y_low plus the edges starting inside the band
+        edge = np.concatenate((self._crossing(np.array([float(y_low)]))[1], np.arange(start, end)))
+
+        clipped = _clip_segments(self.x1[edge], self.y1[edge], self.x2[edge], self.y2[edge], y_low, y_high)
+
+        return np.stack(clipped, axis=-1).reshape(-1,2,2)
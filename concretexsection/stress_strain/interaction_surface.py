@@ -0,0 +1,181 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from .p_m_by_segment import ec2_stress_block_batch, _project_points
+from ..geometry.RebarLayout import RebarLayout
+
+# geometry and material data of the surface being generated, set once
+# per worker process by _init_worker so each task only ships its angles
+_worker_state = {}
+
+def _init_worker(state):
+    _worker_state.clear()
+    _worker_state.update(state)
+
+def _surface_at_angle(angle):
+    '''
+    P, Mx, My, and c for every depth ratio at a single angle using
+    the state of the current worker
+    '''
+    s = _worker_state
+
+    xo = s['xo']
+    yo = s['yo']
+
+    # project the single segment array inside the kernel, only the
+    # elevations are needed here for the depths
+    segments = s['segments']
+
+    y_tr = _project_points(segments[:,0,0], segments[:,0,1], xo, yo, angle)[1]
+
+    y_max = y_tr.max()
+    c = s['depth_ratios']*(y_max - y_tr.min())
+
+    # concrete, moments about xo, yo in the section axes
+    res = ec2_stress_block_batch(segments, s['fcd'], s['n'], s['eu'], s['ec2'], c,
+                                 angle=angle, xo=xo, yo=yo)
+
+    # reinforcing by strain compatibility, moments in the section axes
+    bars = s['rebar'].forces(s['eu'], c, y_max, xo, yo, angle)
+
+    P = res[:,0] + bars[:,0]
+    Mx = res[:,1] + bars[:,1]
+    My = res[:,2] + bars[:,2]
+
+    return np.stack((P, Mx, My, c))
+
+def _surface_chunk(angles):
+    return [_surface_at_angle(a) for a in angles]
+
+def interaction_surface(section, bar_x, bar_y, bar_As, fy, Es, fcd, n, eu, ec2,
+                        angles=None, depth_ratios=None, xo=None, yo=None,
+                        max_workers=None, chunksize=None):
+    """
+    Biaxial P-Mx-My interaction surface of a polygon section with
+    reinforcing bars using the EN 1992.1.1.2004 parabolic + constant
+    stress block.
+
+    The section edges are kept as a single segment array, for each angle
+    ec2_stress_block_batch projects them onto the rotated axes and
+    integrates every neutral axis depth in a single call, rotating Mx, My
+    back to the section axes, and the bar forces are found by strain
+    compatibility. Compression is (+), the concrete displaced by the bars
+    is not deducted.
+
+    Angles are independent so they can be spread over a process pool,
+    the section and bar data are sent once to each worker by the pool
+    initializer and each task only carries its angles.
+
+    Parameters
+    ----------
+    section: ConcreteSectionPolygon or CompositeSection
+                the concrete section
+    bar_x, bar_y: (B,) array like
+                coordinates of the reinforcing bars, bar_x may instead be
+                a RebarLayout in which case bar_y, bar_As, fy, and Es
+                are not used and may be None
+    bar_As: (B,) array like
+            area of each bar
+    fy: float
+        bar yield stress
+    Es: float
+        bar modulus
+    fcd: float
+            design peak stress see EN 1992.1.1.2004
+    n: float
+        parabolic formula exponent see EN 1992.1.1.2004 table 3.1
+    eu: float
+        ultimate strain see EN 1992.1.1.2004 table 3.1
+    ec2: float
+        strain limit for parabolic region of stress-strain see EN 1992.1.1.2004 table 3.1
+    angles: (A,) array like
+            rotation angles in radians, default 72 angles at 5 degrees
+    depth_ratios: (D,) array like
+            neutral axis depths as a ratio of the rotated section height,
+            default 100 ratios from 0.01 to 3.0
+    xo, yo: float
+            point the section is rotated about and the moments are
+            taken about, default the section centroid
+    max_workers: int
+            number of worker processes, None or 1 runs in this process
+    chunksize: int
+            angles per task, default an even split over the workers
+
+    Returns:
+    ---------
+    P, Mx, My: (A,D) numpy arrays
+            axial load and moments about the x and y axes
+    c: (A,D) numpy array
+        neutral axis depths
+    """
+    if angles is None:
+        angles = np.radians(np.arange(0, 360, 5))
+
+    if depth_ratios is None:
+        depth_ratios = np.linspace(0.01, 3.0, 100)
+
+    angles = np.asarray(angles, dtype=float).reshape(-1)
+
+    if isinstance(bar_x, RebarLayout):
+        rebar = bar_x
+    else:
+        rebar = RebarLayout(bar_x, bar_y, bar_As, fy, Es)
+
+    state = {'segments': np.asarray(section.segments, dtype=float),
+             'rebar': rebar,
+             'fcd': fcd,
+             'n': n,
+             'eu': eu,
+             'ec2': ec2,
+             'depth_ratios': np.asarray(depth_ratios, dtype=float).reshape(-1),
+             'xo': section.cx if xo is None else xo,
+             'yo': section.cy if yo is None else yo}
+
+    if max_workers is None or max_workers == 1:
+        _init_worker(state)
+        try:
+            results = _surface_chunk(angles)
+        finally:
+            _worker_state.clear()
+
+    else:
+        if chunksize is None:
+            chunksize = max(1, int(math.ceil(angles.shape[0]/max_workers)))
+
+        chunks = [angles[i:i+chunksize] for i in range(0, angles.shape[0], chunksize)]
+
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker,
+                                 initargs=(state,)) as pool:
+            results = [r for chunk in pool.map(_surface_chunk, chunks) for r in chunk]
+
+    surface = np.stack(results, axis=1)
+
+    return surface[0], surface[1], surface[2], surface[3]
@@ -0,0 +1,313 @@
+'''
+BSD 3-Clause License
+
+Copyright (c) 2019, open-struct-engineer developers and Donald N. Bockoven III
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import math
+from functools import lru_cache
+import numpy as np
+from .stress_strain_array import _pow, stress_strain_ec2_array, stress_strain_steel_array
+
+# Material curve objects for the relationships in stress_strain.py
+#
+# the constants that only depend on the material are computed once when
+# the curve is created, stress(strain) then matches the stress_strain.py
+# function for a single strain and stress_array(strains) matches the
+# stress_strain_array.py function for any array of strains, both use
+# the precomputed constants.
+
+class EC2ParabolicCurve(object):
+
+    __slots__ = ('fcd', 'ec2', 'eu', 'n')
+
+    def __init__(self, fcd, ec2, eu, n):
+        '''
+        EN 1992.1.1.2004 parabolic stress block as defined by equations 3.17 and 3.18
+        see stress_strain.stress_strain_ec2
+        '''
+        self.fcd = fcd
+        self.ec2 = ec2
+        self.eu = eu
+        self.n = n
+
+    def stress(self, strain):
+        e = strain
+
+        if e<0:
+            return 0
+        elif e<=self.ec2:
+            return self.fcd*(1-math.pow((1-(e/self.ec2)),self.n))
+        elif e<=self.eu:
+            return self.fcd
+        else:
+            return 0
+
+    def stress_array(self, strains):
+        return stress_strain_ec2_array(self.fcd, self.ec2, self.eu, self.n, strains)
+
+class PCAParabolicCurve(object):
+
+    __slots__ = ('fc', 'eu', 'Ec', 'eo', 'peak')
+
+    def __init__(self, fprimec, ultimate_strain, concrete_modulus):
+        '''
+        PCA Stress-Strain Relationship
+        see stress_strain.stress_strain_pca
+        '''
+        self.fc = fprimec
+        self.eu = ultimate_strain
+        self.Ec = concrete_modulus
+
+        self.eo = (2*0.85*self.fc)/(self.Ec)
+        self.peak = 0.85*self.fc
+
+    def stress(self, strain):
+        e = strain
+
+        if e <= 0:
+            return 0
+        elif e<=self.eo:
+            return self.peak*((2*(e/self.eo))-((e/self.eo)*(e/self.eo)))
+        elif e<=self.eu:
+            return self.peak
+        else:
+            return 0
+
+    def stress_array(self, strains):
+        e = np.asarray(strains, dtype=float)
+
+        stress = np.zeros(e.shape)
+
+        parabolic = (0<e) & (e<=self.eo)
+        constant = (self.eo<e) & (e<=self.eu)
+
+        r = e[parabolic]/self.eo
+
+        stress[parabolic] = self.peak*((2*r)-(r*r))
+        stress[constant] = self.peak
+
+        return stress
+
+class DesayiKrishnanCurve(object):
+
+    __slots__ = ('fc', 'eu', 'k', 'eo', 'E')
+
+    def __init__(self, fprimec, ultimate_strain, k):
+        '''
+        Desayi and Krishnan parabolic stress-strain relationship
+        see stress_strain.stress_strain_desayi_krishnan
+        '''
+        self.fc = fprimec
+        self.eu = ultimate_strain
+        self.k = k
+
+        fo = fprimec
+
+        # eo has two possible solutions, use the smaller
+        eo1 = (ultimate_strain - math.sqrt(-1*(math.pow(k,2) - 1)*math.pow(ultimate_strain,2))) / k
+        eo2 = (math.sqrt(-1*(math.pow(k,2) - 1)*math.pow(ultimate_strain,2))+ultimate_strain) / k
+
+        self.eo = min(eo1,eo2)
+        self.E = 2*fo / self.eo
+
+    def stress(self, strain):
+        if strain <=0:
+            return 0
+        elif strain > self.eu:
+            return 0
+        else:
+            f = (self.E*strain) / (1+math.pow(strain/self.eo,2))
+
+            return f*0.85
+
+    def stress_array(self, strains):
+        e = np.asarray(strains, dtype=float)
+
+        stress = np.zeros(e.shape)
+
+        active = (0<e) & (e<=self.eu)
+
+        ea = e[active]
+
+        stress[active] = ((self.E*ea) / (1+_pow(ea/self.eo,2)))*0.85
+
+        return stress
+
+class CollinsCurve(object):
+
+    __slots__ = ('fc', 'eu', 'k', 'n', 'Ec', 'ecprime', 'nk')
+
+    def __init__(self, fprimec, ultimate_strain):
+        '''
+        Collins, Mitchell and MacGregor parabolic stress-strain relationship, PSI units
+        see stress_strain.stress_strain_collins_et_all
+        '''
+        self.fc = fprimec
+        self.eu = ultimate_strain
+
+        self.k = 0.67 + (fprimec / 9000.0)
+        self.n = 0.8 + (fprimec / 2500.0)
+        self.Ec = (40000*math.sqrt(fprimec)) + 1000000
+
+        self.ecprime = (fprimec / self.Ec)*(self.n/(self.n-1))
+        self.nk = self.n*self.k
+
+    def stress(self, strain):
+        if strain <=0:
+            return 0
+        elif strain > self.eu:
+            return 0
+        else:
+            n = self.n
+            e = strain/self.ecprime
+
+            if e <= 1:
+                f = ((e) * (n / (n-1+math.pow(e,n)))) * self.fc
+            else:
+                f = ((e) * (n / (n-1+math.pow(e,self.nk)))) * self.fc
+
+            return f*0.85
+
+    def stress_array(self, strains):
+        strain = np.asarray(strains, dtype=float)
+        n = self.n
+
+        stress = np.zeros(strain.shape)
+
+        active = (0<strain) & (strain<=self.eu)
+
+        e = strain[active]/self.ecprime
+
+        pre = e <= 1
+        post = ~pre
+
+        power = np.empty(e.shape)
+        power[pre] = _pow(e[pre], n)
+        power[post] = _pow(e[post], self.nk)
+
+        stress[active] = (((e) * (n / (n-1+power))) * self.fc)*0.85
+
+        return stress
+
+class WhitneyCurve(object):
+
+    __slots__ = ('fc', 'eu', 'beta1', 'e_start', 'peak')
+
+    def __init__(self, fprimec, ultimate_strain):
+        '''
+        Whitney Stress block used in ACI 318
+        see stress_strain.stress_strain_whitney, beta1 is kept
+        as an attribute instead of being returned with the stress
+        '''
+        self.fc = fprimec
+        self.eu = ultimate_strain
+
+        if fprimec <= 4000:
+            self.beta1 = 0.85
+        elif fprimec <= 8000:
+            self.beta1 = 0.85 - ((0.05*(fprimec-4000))/1000)
+        else:
+            self.beta1 = 0.65
+
+        self.e_start = ultimate_strain - (ultimate_strain*self.beta1)
+        self.peak = 0.85*fprimec
+
+    def stress(self, strain):
+        if strain <= self.e_start:
+            return 0
+        elif strain <= self.eu:
+            return self.peak
+        else:
+            return 0
+
+    def stress_array(self, strains):
+        e = np.asarray(strains, dtype=float)
+
+        stress = np.zeros(e.shape)
+
+        stress[(self.e_start < e) & (e <= self.eu)] = self.peak
+
+        return stress
+
+class SteelCurve(object):
+
+    __slots__ = ('fy', 'ey', 'Es')
+
+    def __init__(self, fy, yield_strain, Es):
+        '''
+        Linear stress strain up to +/- fy
+        see stress_strain.stress_strain_steel, when Es is 0
+        the slope is taken as fy/yield strain
+        '''
+        self.fy = fy
+        self.ey = yield_strain
+        self.Es = Es
+
+    def stress(self, strain):
+        if self.Es == 0:
+            if abs(strain) >= self.ey:
+                return (strain/abs(strain)) * self.fy
+            else:
+                return (strain*self.fy)/self.ey
+        else:
+            if abs(strain)*self.Es >= self.ey*self.Es:
+                return (strain/abs(strain)) * self.fy
+            else:
+                return (strain*self.Es)
+
+    def stress_array(self, strains):
+        return stress_strain_steel_array(self.fy, self.ey, self.Es, strains)
+
+_CURVES = {'ec2': EC2ParabolicCurve,
+           'pca': PCAParabolicCurve,
+           'desayi_krishnan': DesayiKrishnanCurve,
+           'collins': CollinsCurve,
+           'whitney': WhitneyCurve,
+           'steel': SteelCurve}
+
+@lru_cache(maxsize=256)
+def material_curve(name, *params):
+    '''
+    return the material curve object for the named relationship,
+    'ec2', 'pca', 'desayi_krishnan', 'collins', 'whitney', or 'steel',
+    with the same parameters as the matching stress_strain function
+    less the strain, ie. material_curve('ec2', fcd, ec2, eu, n)
+
+    curves are cached on their parameters, the 256 most recently
+    used are kept, so repeated calls in fiber and rebar loops
+    share a single set of precomputed constants.
+    '''
+    try:
+        cls = _CURVES[name]
+    except KeyError:
+        raise ValueError('unknown material curve {0}, use one of {1}'.format(name, sorted(_CURVES)))
+
+    return cls(*params)
@@ -0,0 +1,343 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import numpy as np
+from .p_m_by_segment import (_segment_endpoints, _clip_segments,
+                             _constant_segment_integrals, _ec2_segment_integrals)
+from .stress_strain import stress_strain_whitney
+
+# Closed-form axial load and dP/dc for the stress blocks and reinforcing.
+#
+# The strain at elevation y for a neutral axis depth c is
+#   e(y) = eu*(y - y,na)/c, with y,na = y,max - c
+# so de/dc = (eu - e)/c and, since the stress is continuous and 0 at the
+# neutral axis, the moving band limits add nothing and
+#   dP/dc = integral of (dstress/de)*(de/dc) dA
+#
+# For the EC2 parabola, stress = F*(1-u^N) with u = 1 - e/ec2 this gives
+#   dP/dc = (F*N/(ec2*c)) * [(eu-ec2)*integral(u^(N-1))dA + ec2*integral(u^N)dA]
+# over the parabolic band, with integral(u^m)dA = area - integral(1-u^m)dA
+# from the existing parabolic line integrals with F = 1.
+
+def _band_area(A, B, D, E):
+    return _constant_segment_integrals(A, D, B, E, 1.0)[0].sum(axis=-1)
+
+def ec2_axial_load(segments, fcd, n, eu, ec2, c):
+    """
+    Axial load of the EN 1992.1.1.2004 parabolic + constant stress block
+    and its derivative with respect to the neutral axis depth.
+
+    Parameters
+    ----------
+    segments: (N,2,2) array like
+                the closed edge segments of the section, oriented so
+                strain only varies in y and the extreme compression
+                fiber is at the peak y coordinate.
+
+    fcd: float
+            design peak stress see EN 1992.1.1.2004
+    n: float
+        parabolic formula exponent see EN 1992.1.1.2004 table 3.1
+    eu: float
+        ultimate strain see EN 1992.1.1.2004 table 3.1
+    ec2: float
+        strain limit for parabolic region of stress-strain see EN 1992.1.1.2004 table 3.1
+    c: float or (M,) array like
+        depth of the neutral axis as measured from the peak y coordinate of the cross section
+
+    Returns:
+    ---------
+    P: float or (M,) numpy array
+        Axial force of the stress block
+    dPdc: float or (M,) numpy array
+        derivative of P with respect to c
+    """
+    x1, y1, x2, y2 = _segment_endpoints(segments)
+
+    C = np.asarray(c, dtype=float)
+    shape = C.shape
+    C = C.reshape(-1,1)
+
+    K = eu/ec2
+
+    y_max = max(y1.max(), y2.max())
+    yna = y_max - C
+    yec2 = yna + (C*(ec2/eu))
+
+    # Parabolic region, Y,na to Y,ec2
+    A, D, B, E = _clip_segments(x1, y1, x2, y2, yna, yec2)
+
+    area_parabolic = _band_area(A, B, D, E)
+    one_minus_uN = _ec2_segment_integrals(A, B, D, E, 1.0, K, n, C, yna)[0].sum(axis=-1)
+
+    if n == 1:
+        uN1 = area_parabolic
+    else:
+        uN1 = area_parabolic - _ec2_segment_integrals(A, B, D, E, 1.0, K, n-1, C, yna)[0].sum(axis=-1)
+
+    uN = area_parabolic - one_minus_uN
+
+    # Constant region, Y,ec2 to Y,max
+    A, D, B, E = _clip_segments(x1, y1, x2, y2, yec2, y_max)
+
+    area_constant = _band_area(A, B, D, E)
+
+    C = C[:,0]
+
+    P = fcd*(one_minus_uN + area_constant)
+    dPdc = ((fcd*n)/(ec2*C))*(((eu-ec2)*uN1) + (ec2*uN))
+
+    return P.reshape(shape), dPdc.reshape(shape)
+
+def pca_axial_load(segments, fc, eu, Ec, c):
+    """
+    Axial load of the PCA parabolic + constant stress block and its
+    derivative with respect to the neutral axis depth.
+
+    The PCA curve is the EC2 parabola with n = 2, a peak stress
+    of 0.85*f'c and eo = 2*0.85*f'c/Ec in place of ec2.
+
+    Parameters
+    ----------
+    segments: (N,2,2) array like
+                the closed edge segments of the section, oriented so
+                strain only varies in y and the extreme compression
+                fiber is at the peak y coordinate.
+
+    fc: float
+        f'c concrete compressive strength
+    eu: float
+        ultimate strain
+    Ec: float
+        concrete modulus
+    c: float or (M,) array like
+        depth of the neutral axis as measured from the peak y coordinate of the cross section
+
+    Returns:
+    ---------
+    P: float or (M,) numpy array
+        Axial force of the stress block
+    dPdc: float or (M,) numpy array
+        derivative of P with respect to c
+    """
+    eo = (2*0.85*fc)/Ec
+
+    return ec2_axial_load(segments, 0.85*fc, 2, eu, eo, c)
+
+def whitney_axial_load(segments, fc, eu, c):
+    """
+    Axial load of the ACI 318 Whitney stress block and its derivative
+    with respect to the neutral axis depth.
+
+    The block is 0.85*f'c over the depth beta1*c, moving the cut by dc
+    adds a strip of beta1*dc times the section width at the cut.
+    For a positively oriented polygon the width at the cut is the sum
+    of x*sign(dy) at every edge crossing the cut.
+
+    Parameters
+    ----------
+    segments: (N,2,2) array like
+                the closed edge segments of the section, oriented so
+                strain only varies in y and the extreme compression
+                fiber is at the peak y coordinate.
+
+    fc: float
+        f'c concrete compressive strength, psi
+    eu: float
+        ultimate strain
+    c: float or (M,) array like
+        depth of the neutral axis as measured from the peak y coordinate of the cross section
+
+    Returns:
+    ---------
+    P: float or (M,) numpy array
+        Axial force of the stress block
+    dPdc: float or (M,) numpy array
+        derivative of P with respect to c
+    """
+    x1, y1, x2, y2 = _segment_endpoints(segments)
+
+    C = np.asarray(c, dtype=float)
+    shape = C.shape
+    C = C.reshape(-1,1)
+
+    beta1 = stress_strain_whitney(fc, eu, 0)[1]
+
+    y_max = max(y1.max(), y2.max())
+    y_cut = y_max - (beta1*C)
+
+    A, D, B, E = _clip_segments(x1, y1, x2, y2, y_cut, y_max)
+
+    P = 0.85*fc*_band_area(A, B, D, E)
+
+    # width of the section at the cut
+    dy = y2 - y1
+    crossing = (np.minimum(y1, y2) < y_cut) & (y_cut < np.maximum(y1, y2))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cut = x1 + ((y_cut - y1)/dy)*(x2 - x1)
+
+        width = np.where(crossing, x_cut*np.sign(dy), 0.0).sum(axis=-1)
+
+    dPdc = 0.85*fc*beta1*width
+
+    return P.reshape(shape), dPdc.reshape(shape)
+
+def rebar_axial_load(bar_y, bar_As, fy, Es, eu, c, y_max):
+    """
+    Axial load of a set of elastic-perfectly plastic reinforcing bars
+    and its derivative with respect to the neutral axis depth.
+
+    Compression is (+), the concrete displaced by the bars is not deducted.
+
+    Parameters
+    ----------
+    bar_y: (B,) array like
+            y coordinate of each bar
+    bar_As: (B,) array like
+            area of each bar
+    fy: float
+        yield stress
+    Es: float
+        steel modulus
+    eu: float
+        strain at the extreme compression fiber
+    c: float or (M,) array like
+        depth of the neutral axis as measured from y_max
+    y_max: float
+            peak y coordinate of the cross section
+
+    Returns:
+    ---------
+    P: float or (M,) numpy array
+        Axial force of the bars
+    dPdc: float or (M,) numpy array
+        derivative of P with respect to c
+    """
+    C = np.asarray(c, dtype=float)
+    shape = C.shape
+    C = C.reshape(-1,1)
+
+    As = np.asarray(bar_As, dtype=float)
+    d = y_max - np.asarray(bar_y, dtype=float)
+
+    strain = ((C-d)/C)*eu
+    stress = np.clip(strain*Es, -fy, fy)
+
+    # only the bars still in the elastic range change with c
+    elastic = np.abs(strain*Es) < fy
+
+    P = (As*stress).sum(axis=-1)
+    dPdc = np.where(elastic, (As*Es*eu*d)/(C*C), 0.0).sum(axis=-1)
+
+    return P.reshape(shape), dPdc.reshape(shape)
+
+def neutral_axis_depth(axial_load, P_target, c_min, c_max, c0=None, tol=1e-9, max_iter=50):
+    """
+    Find the neutral axis depth that balances a target axial load.
+
+    A safeguarded Newton iteration: Newton steps use the analytic
+    derivative from axial_load and fall back to bisection whenever the
+    step leaves the current bracket or the derivative is not positive.
+    P is non-decreasing with c so the bracket is tightened from the sign
+    of each residual and the ends are only evaluated if the solution
+    runs into them.
+
+    Parameters
+    ----------
+    axial_load: function
+                c -> (P, dPdc), ie. a sum of ec2_axial_load,
+                whitney_axial_load, and rebar_axial_load terms
+    P_target: float
+                axial load to balance, compression (+)
+    c_min: float
+            lower bound of the neutral axis depth, > 0
+    c_max: float
+            upper bound of the neutral axis depth
+    c0: float
+        starting depth, ie. the solution of the previous point on a load
+        path, defaults to the middle of the bracket
+    tol: float
+        convergence tolerance on c
+    max_iter: int
+            iteration cap
+
+    Returns:
+    ---------
+    c: float
+        neutral axis depth
+    """
+    if not 0 < c_min < c_max:
+        raise ValueError('neutral axis bracket must satisfy 0 < c_min < c_max')
+
+    lo = c_min
+    hi = c_max
+
+    if c0 is None or not c_min < c0 < c_max:
+        c = 0.5*(lo+hi)
+    else:
+        c = c0
+
+    for i in range(max_iter):
+        P, dPdc = axial_load(c)
+        f = float(P) - P_target
+        dPdc = float(dPdc)
+
+        if f == 0:
+            return c
+        elif f < 0:
+            lo = c
+        else:
+            hi = c
+
+        if dPdc > 0:
+            c_new = c - (f/dPdc)
+        else:
+            c_new = lo - 1.0
+
+        if not lo < c_new < hi:
+            c_new = 0.5*(lo+hi)
+
+        if abs(c_new - c) <= tol:
+            break
+
+        c = c_new
+
+    else:
+        raise RuntimeError('neutral axis depth did not converge in {0} iterations'.format(max_iter))
+
+    # the solution ran into an end of the bracket that was never
+    # evaluated, check the target is actually inside the bracket
+    if hi == c_max and c_max - c_new <= tol:
+        if float(axial_load(c_max)[0]) < P_target:
+            raise ValueError('P_target is above the axial load at c_max')
+
+    elif lo == c_min and c_new - c_min <= tol:
+        if float(axial_load(c_min)[0]) > P_target:
+            raise ValueError('P_target is below the axial load at c_min')
+
+    return c_new
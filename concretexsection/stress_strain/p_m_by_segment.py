@@ -1,7 +1,665 @@
+from __future__ import division
 import math
+import numpy as np
+
+
+def _segment_endpoints(segments):
+    '''
+    return the x1, y1, x2, y2 arrays of a set of segments given either as
+    the nested list form [[[x1,y1],[x2,y2]],...] or as an (N,2,2) array
+    '''
+    s = np.asarray(segments, dtype=float).reshape(-1,2,2)
+
+    return s[:,0,0], s[:,0,1], s[:,1,0], s[:,1,1]
+
+def _project_points(x, y, xo, yo, angle):
+    '''
+    x and y in axes rotated by angle, radians, about (xo,yo). This is the
+    one rotation used by the sections, bar layouts, and stress block
+    kernels, angle may be an array that broadcasts against x and y
+    '''
+    cos = np.cos(angle)
+    sin = np.sin(angle)
+
+    dx = x - xo
+    dy = y - yo
+
+    return (dx*cos) + (dy*sin), (dy*cos) - (dx*sin)
+
+def _project_segments(x1, y1, x2, y2, xo, yo, angle):
+    '''
+    segment end points in axes rotated by angle, radians, about (xo,yo)
+    '''
+    X1, Y1 = _project_points(x1, y1, xo, yo, angle)
+    X2, Y2 = _project_points(x2, y2, xo, yo, angle)
+
+    return X1, Y1, X2, Y2
+
+def _rotate_resultants(results, angle):
+    '''
+    rotate the Mx, My columns of an (...,3) results array computed in
+    axes rotated by angle back to the section axes, in place
+    '''
+    cos = math.cos(angle)
+    sin = math.sin(angle)
+
+    Mx = results[...,1].copy()
+    My = results[...,2].copy()
+
+    results[...,1] = (My*sin) + (Mx*cos)
+    results[...,2] = (My*cos) - (Mx*sin)
+
+    return results
+
+def _clip_segments(x1, y1, x2, y2, y_low, y_high):
+    '''
+    clip each segment to the band y_low <= y <= y_high keeping the
+    segment direction. Segments, or parts of segments, outside the band
+    collapse to zero length and so contribute 0 to any of the line integrals.
+
+    y_low and y_high may be arrays that broadcast against the segment
+    arrays, ie. shape (M,1) against (N,) segments to clip the same
+    segments to M bands at once.
+    '''
+    dx = x2 - x1
+    dy = y2 - y1
+    flat = (dy == 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_low = (y_low - y1)/dy
+        t_high = (y_high - y1)/dy
+
+    # horizontal segments have no dy and are dropped
+    t_start = np.where(flat, 0.0, np.clip(np.minimum(t_low, t_high), 0, 1))
+    t_end = np.where(flat, 0.0, np.clip(np.maximum(t_low, t_high), 0, 1))
+
+    # snap the y coordinates to the band so round off can't
+    # push a clipped end point past the band boundary
+    cx1 = x1 + t_start*dx
+    cy1 = np.minimum(np.maximum(y1 + t_start*dy, y_low), y_high)
+    cx2 = x1 + t_end*dx
+    cy2 = np.minimum(np.maximum(y1 + t_end*dy, y_low), y_high)
+
+    return cx1, cy1, cx2, cy2
+
+def _constant_segment_integrals(x1, y1, x2, y2, f):
+    '''
+    P, Mx, and My line integrals of a constant stress, f, along each segment
+    x1, y1, x2, y2 may be any broadcastable arrays
+    '''
+    axial = -1*0.5*f*(x1+x2)*(y1-y2)
+
+    momentx = (1/6.0)*f*(y2-y1)*((x1*((2*y1)+y2))+(x2*(y1+(2*y2))))
+
+    momenty = (1/6.0)*f*((x1*x1)+(x1*x2)+(x2*x2))*(y2-y1)
+
+    return axial, momentx, momenty
+
+def _linear_segment_integrals(x1, y1, x2, y2, q1, q1_y, q2, q2_y):
+    '''
+    P, Mx, and My line integrals of a linearly varying stress along each segment
+    x1, y1, x2, y2 may be any broadcastable arrays
+    '''
+    # set start and end stress based on y coordinate of segment end point
+    qs = np.where(y2 == q2_y, q1, q2)
+    qe = np.where(y2 == q2_y, q2, q1)
+
+    axial = (1/6.0)*(y2-y1)*((qs*((2*x1)+x2))+(qe*(x1+(2*x2))))
+
+    momentx = ((1/12.0)*(y2-y1)
+                * (
+                    qs*x1*((3*y1)+y2)
+                    + qs*x2*(y1+y2)
+                    + qe*x1*(y1+y2)
+                    + qe*x2*(y1+(3*y2))
+                    )
+                )
+
+    momenty = ((-1/24.0)*(y1-y2)
+                * (
+                    x1*x1*((3*qs)+qe)
+                    + 2*x1*x2*(qs+qe)
+                    + x2*x2*(qs+(3*qe))
+                    )
+                )
+
+    return axial, momentx, momenty
+
+def _ec2_segment_integrals(A, B, D, E, F, K, N, C, Y):
+    '''
+    P, Mx, and My line integrals of the EC2 parabolic stress along each segment
+    see ec2_parabolic_stress_block for the derivation and variable naming.
+
+    A = X1, B = X2, D = Y1, E = Y2 may be any broadcastable arrays, as may
+    C and Y. Segments with D == E have no dy and contribute 0.
+
+    Integer exponents, n = 2 for fck <= 50 MPa, are dispatched to the
+    polynomial closed form in _ec2_integer_segment_integrals.
+
+    For a non-integer n the Wolfram-Alpha antiderivatives are used with
+    the t=0 and t=1 evaluations substituted symbolically, the constants
+    that only depend on n, K, C, and Y hoisted out to once per call, and
+    the C*u and u^n terms computed once per segment end and shared by P,
+    Mx, and My:
+
+    C*u(t=0) = C + K*(Y - D)     u(t=0)^n = (C*u(t=0)/C)^n
+    C*u(t=1) = C + K*(Y - E)     u(t=1)^n = (C*u(t=1)/C)^n
+    '''
+    if float(N).is_integer() and N >= 1:
+        return _ec2_integer_segment_integrals(A, B, D, E, F, K, int(N), C, Y)
+
+    # call level constants
+    N1 = 1 + N
+    N2 = 2 + N
+    N3 = 3 + N
+    N1N2 = N1*N2
+    N1N2N3 = N1N2*N3
+    K2 = K*K
+    K3 = K2*K
+    CKY = C + K*Y
+    C2 = 2*C
+
+    flat = (D == E)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        DE = D - E
+        DEK = DE*K
+        DEK2 = DEK*DEK
+        DEK3 = DEK2*DEK
+
+        # C*u and u^n at each end of the segment, floored at 0 so round
+        # off at the Y,ec2 end of a segment can't produce a nan for a non-integer n
+        cu0 = CKY - K*D
+        cu1 = CKY - K*E
+        p0 = np.power(np.maximum(cu0/C, 0.0), N)
+        p1 = np.power(np.maximum(cu1/C, 0.0), N)
+
+        # --- Axial - P ---
+        W0 = A*(CKY + K*((D*N1) - (E*N2))) - B*cu0
+        W1 = A*cu1 - B*(CKY + K*((E*N1) - (D*N2)))
+
+        axial = (-1*DE*F
+                    * (
+                        ((A + B)*0.5)
+                        - ((cu1*p1*W1) - (cu0*p0*W0))/(DE*DE*K2*N1N2)
+                        )
+                    )
+
+        # --- Moment about the Y-Axis - My ---
+        # (A*(-1 + t) - B*t) is -A at t=0 and -B at t=1
+        Q = B*cu0 - A*cu1
+        Q2 = Q*Q
+        Q3 = Q2*Q
+
+        def _my(X, p):
+            X2 = X*X
+            X3 = X2*X
+            return (X3
+                    - (3*p
+                        * (
+                            DEK3*N1N2*X3
+                            - DEK2*N*N1*X2*Q
+                            - 2*DEK*N*X*Q2
+                            - 2*Q3
+                            )
+                        )/(DEK3*N1N2N3)
+                    )
+
+        momenty = np.where(A == B,
+                            (A*A*DE*F*(-1 + ((cu1*p1) - (cu0*p0))/(DEK*N1)))/2.0,
+                            (-1*DE*F*(_my(-B, p1) - _my(-A, p0)))/(6.0*(A - B))
+                            )
+
+        # --- Moment about the X-Axis - Mx ---
+        S = C2 + K*((D*N1) + (2*Y))
+
+        Z1 = K*((-3.0*A*D*N2) + (A*E*N3) + (B*D*(3 + 2*N))) + ((A - B)*N*CKY)
+
+        Z2 = (B*cu0*S
+                - A
+                * (
+                    2*C*C
+                    + C*K*((2*D*N1) - (E*N3) + (4*Y))
+                    + K2*((D*D*N1N2) - (D*N1*((E*N3) - (2*Y))) + (Y*((2*Y) - (E*N3))))
+                    )
+                )
+
+        Z3 = (B*N*cu0*S
+                + A
+                * (
+                    3*D*D*K2*N1N2
+                    + N*((E*K*N3) - (2*CKY))*CKY
+                    - 2*D*K*N1*((E*K*N3) + (N*CKY))
+                    )
+                )
+
+        M0 = -1*cu0*Z2
+        M1 = ((A - B)*DEK3*N1N2) + (DEK2*N1*Z1) + M0 + (DEK*Z3)
+
+        momentx = (-1*DE*F
+                    * (
+                        (A*D) + (((B*D) + (A*(E - (2.0*D))))*0.5) + (((A - B)*DE)/3.0)
+                        - ((p1*M1) - (p0*M0))/(DE*DE*K3*N1N2N3)
+                        )
+                    )
+
+        axial = np.where(flat, 0.0, axial)
+        momentx = np.where(flat, 0.0, momentx)
+        momenty = np.where(flat, 0.0, momenty)
+
+    return axial, momentx, momenty
+
+def _ec2_integer_segment_integrals(A, B, D, E, F, K, N, C, Y):
+    '''
+    P, Mx, and My line integrals of the EC2 parabolic stress along each
+    segment for an integer exponent n (1, 2, 3, ...)
+
+    with u = 1-(ec/ec2) = 1-(K*(y-Y)/C), u is linear along the segment:
+    u(t) = u0*(1-t) + u1*t, x(t) = A*(1-t) + B*t, and y(t) = D*(1-t) + E*t
+
+    expanding u^n in the Bernstein basis (1-t)^i t^j and using
+    integral (1-t)^i t^j dt, 0 to 1 = i! j! / (i+j+1)! gives the
+    polynomial closed forms:
+
+    integral x u^n dt = sum k=0..n u0^(n-k) u1^k [A(n-k+1) + B(k+1)] / ((n+1)(n+2))
+
+    integral x^2 u^n dt = sum k=0..n u0^(n-k) u1^k [A^2(n-k+2)(n-k+1)
+                            + 2AB(n-k+1)(k+1) + B^2(k+2)(k+1)] / ((n+1)(n+2)(n+3))
+
+    integral x y u^n dt = sum k=0..n u0^(n-k) u1^k [AD(n-k+2)(n-k+1)
+                            + (AE+BD)(n-k+1)(k+1) + BE(k+2)(k+1)] / ((n+1)(n+2)(n+3))
+
+    and stress = F(1-u^n) so, with the constant stress terms:
+
+    P = F(E-D)[(A+B)/2 - integral x u^n dt]
+    My = (1/2)F(E-D)[(A^2+AB+B^2)/3 - integral x^2 u^n dt]
+    Mx = F(E-D)[(2AD+AE+BD+2BE)/6 - integral x y u^n dt]
+
+    there are no divisions by (D-E) or K so short segments keep their
+    precision and horizontal segments contribute 0 without special casing.
+    '''
+    # u at the start and end of the segment, floored at 0 for round off at Y,ec2
+    u0 = np.maximum(1 - (K*(D - Y))/C, 0.0)
+    u1 = np.maximum(1 - (K*(E - Y))/C, 0.0)
+
+    u0_pow = [np.ones_like(u0)]
+    u1_pow = [np.ones_like(u1)]
+    for i in range(N):
+        u0_pow.append(u0_pow[-1]*u0)
+        u1_pow.append(u1_pow[-1]*u1)
+
+    AB = A*B
+    AD = A*D
+    AE_BD = (A*E) + (B*D)
+    BE = B*E
+
+    x_un = 0
+    xx_un = 0
+    xy_un = 0
+
+    for k in range(N+1):
+        w = u0_pow[N-k]*u1_pow[k]
+        a = N-k+1
+        b = k+1
+
+        x_un = x_un + w*((A*a) + (B*b))
+        xx_un = xx_un + w*((A*A*a*(a+1)) + (2*AB*a*b) + (B*B*b*(b+1)))
+        xy_un = xy_un + w*((AD*a*(a+1)) + (AE_BD*a*b) + (BE*b*(b+1)))
+
+    n1n2 = (N+1)*(N+2)
+    n1n2n3 = n1n2*(N+3)
+
+    axial = F*(E-D)*(((A+B)*0.5) - (x_un/n1n2))
+
+    momenty = 0.5*F*(E-D)*((((A*A)+AB+(B*B))/3.0) - (xx_un/n1n2n3))
+
+    momentx = F*(E-D)*((((2*AD)+AE_BD+(2*BE))/6.0) - (xy_un/n1n2n3))
+
+    return axial, momentx, momenty
+
+def _pca_segment_integrals(A, B, D, E, F, K, Y):
+    '''
+    P, Mx, and My line integrals of the PCA parabolic stress along each segment
+    A = X1, B = X2, D = Y1, E = Y2 may be any broadcastable arrays, as may
+    K and Y.
+    '''
+    axial = ((17.0*(D - E)*F*K
+                *(B
+                    * (D*D*K + 3*E*E*K + 2*D*(-2 + E*K - 2*K*Y) - 8*E*(1 + K*Y) + 6*Y*(2 + K*Y))
+                    + A*(3*D*D*K + E*E*K
+                        + 2*D*(-4 + E*K - 4*K*Y) - 4*E*(1 + K*Y) + 6*Y*(2 + K*Y)
+                        )
+                    )
+                )/240.0)
+
+    momenty = ((17*(D - E)*F*K
+                * (
+                    B*B*(D*D*K + 6*E*E*K + D*(-5 + 3*E*K - 5*K*Y) - 15*E*(1 + K*Y) + 10*Y*(2 + K*Y))
+                    + A*B*(3*D*D*K + 3*E*E*K + 2*D*(-5 + 2*E*K - 5*K*Y) - 10*E*(1 + K*Y) + 10*Y*(2 + K*Y))
+                    + A*A*(6*D*D*K + E*E*K + 3*D*(-5 + E*K - 5*K*Y) - 5*E*(1 + K*Y) + 10*Y*(2 + K*Y))
+                    )
+                )/1200.0)
+
+    momentx = ((17*(D - E)*F*K
+                * (B
+                * (3*D*D*D*K + 2*D*D*(-5 + 3*E*K - 5*K*Y)
+                    + D*(9*E*E*K - 20*E*(1 + K*Y) + 10*Y*(2 + K*Y))
+                    + 2*E*(6*E*E*K - 15*E*(1 + K*Y) + 10*Y*(2 + K*Y))
+                    )
+                    + A*(12*D*D*D*K + D*D*(9*E*K - 30*(1 + K*Y))
+                        + E*(3*E*E*K - 10*E*(1 + K*Y) + 10*Y*(2 + K*Y))
+                        + D*(6*E*E*K - 20*E*(1 + K*Y) + 20*Y*(2 + K*Y))
+                        )
+                    )
+                )/1200.0)
+
+    return axial, momentx, momenty
+
+def _totals(axial, momentx, momenty, details=True):
+    '''
+    sum the P, Mx, and My totals of the per segment results
+
+    if details the per segment results are written into a single
+    preallocated (N,3) array, otherwise only the totals are kept and
+    None is returned in place of the details
+    '''
+    if details:
+        out = np.empty((np.shape(axial)[0],3))
+        out[:,0] = axial
+        out[:,1] = momentx
+        out[:,2] = momenty
+
+        P, Mx, My = [float(i) for i in out.sum(axis=0)]
+
+        return P, Mx, My, out
+
+    else:
+        return float(np.sum(axial)), float(np.sum(momentx)), float(np.sum(momenty)), None
+
+def constant_stress_block_array(segments, stress, details=True):
+    """
+    Array version of constant_stress_block, all segments are
+    integrated in a single vectorized pass.
+
+    Parameters
+    ----------
+    segments: (N,2,2) array like
+                each segment should be of the form [[x1,y1],[x2,y2]]
+
+    stress: float
+            constant stress value for region
+
+    details: bool
+            if False only the totals are computed and no per
+            segment results are kept
+
+    Returns:
+    ---------
+    P: float
+        Sum of Axial force from all segments
+    Mx: float
+        Sum of Moments about the x-axis from all segments
+    My: float
+        Sum of Moments about the y-axis from all segments
+    details: (N,3) numpy array or None
+            P,Mx,My values per segment, None if details=False
+    """
+    x1, y1, x2, y2 = _segment_endpoints(segments)
+
+    return _totals(*_constant_segment_integrals(x1, y1, x2, y2, stress), details=details)
+
+def linear_stress_block_array(segments, q1, q1_y, q2, q2_y, details=True):
+    """
+    Array version of linear_stress_block, all segments are
+    integrated in a single vectorized pass.
+
+    Parameters
+    ----------
+    segments: (N,2,2) array like
+                each segment should be of the form [[x1,y1],[x2,y2]]
+                y1 or y2 should exactly match q1_y or q2_y.
+
+    q1, q1_y, q2, q2_y: float
+            see linear_stress_block
+
+    details: bool
+            if False only the totals are computed and no per
+            segment results are kept
+
+    Returns:
+    ---------
+    P: float
+        Sum of Axial force from all segments
+    Mx: float
+        Sum of Moments about the x-axis from all segments
+    My: float
+        Sum of Moments about the y-axis from all segments
+    details: (N,3) numpy array or None
+            P,Mx,My values per segment, None if details=False
+    """
+    x1, y1, x2, y2 = _segment_endpoints(segments)
+
+    return _totals(*_linear_segment_integrals(x1, y1, x2, y2, q1, q1_y, q2, q2_y), details=details)
+
+def ec2_parabolic_stress_block_array(segments, fcd, n, eu, ec2, c, yna, details=True):
+    """
+    Array version of ec2_parabolic_stress_block, all segments are
+    integrated in a single vectorized pass.
+
+    Parameters
+    ----------
+    segments: (N,2,2) array like
+                each segment should be of the form [[x1,y1],[x2,y2]]
+                segments should lie between Y,na and Y,ec2, horizontal
+                segments contribute 0.
+
+    fcd, n, eu, ec2, c, yna: float
+            see ec2_parabolic_stress_block
+
+    details: bool
+            if False only the totals are computed and no per
+            segment results are kept
 
+    Returns:
+    ---------
+    P: float
+        Sum of Axial force from all segments
+    Mx: float
+        Sum of Moments about the x-axis from all segments
+    My: float
+        Sum of Moments about the y-axis from all segments
+    details: (N,3) numpy array or None
+            P,Mx,My values per segment, None if details=False
+    """
+    A, D, B, E = _segment_endpoints(segments)
+
+    return _totals(*_ec2_segment_integrals(A, B, D, E, fcd, eu/ec2, n, c, yna), details=details)
 
-def constant_stress_block(segments, stress):
+def pca_parabolic_stress_block_array(segments, fc, eu, Ec, c, yna, details=True):
+    """
+    Array version of pca_parabolic_stress_block, all segments are
+    integrated in a single vectorized pass.
+
+    Parameters
+    ----------
+    segments: (N,2,2) array like
+                each segment should be of the form [[x1,y1],[x2,y2]]
+
+    fc, eu, Ec, c, yna: float
+            see pca_parabolic_stress_block
+
+    details: bool
+            if False only the totals are computed and no per
+            segment results are kept
+
+    Returns:
+    ---------
+    P: float
+        Sum of Axial force from all segments
+    Mx: float
+        Sum of Moments about the x-axis from all segments
+    My: float
+        Sum of Moments about the y-axis from all segments
+    details: (N,3) numpy array or None
+            P,Mx,My values per segment, None if details=False
+    """
+    A, D, B, E = _segment_endpoints(segments)
+
+    eo = (2*0.85*fc)/Ec
+    K = eu/(c*eo)
+
+    return _totals(*_pca_segment_integrals(A, B, D, E, fc, K, yna), details=details)
+
+def ec2_stress_block_batch(segments, fcd, n, eu, ec2, c, angle=None, xo=0, yo=0):
+    """
+    P, Mx, and My of the full EN 1992.1.1.2004 parabolic + constant
+    stress block for many neutral axis depths in a single call.
+
+    The section edges are clipped to the parabolic and constant stress
+    regions for every depth at once and integrated with the same line
+    integrals as ec2_parabolic_stress_block and constant_stress_block.
+
+    Parameters
+    ----------
+    segments: (N,2,2) array like
+                the closed edge segments of the section,
+                ie. ConcreteSectionPolygon.define_segments(), oriented
+                so strain only varies in y and the extreme compression
+                fiber is at the peak y coordinate.
+
+    fcd: float
+            design peak stress see EN 1992.1.1.2004
+    n: float
+        parabolic formula exponent see EN 1992.1.1.2004 table 3.1
+    eu: float
+        ultimate strain see EN 1992.1.1.2004 table 3.1
+    ec2: float
+        strain limit for parabolic region of stress-strain see EN 1992.1.1.2004 table 3.1
+    c: float or (M,) array like
+        depths of the neutral axis as measured from the peak y coordinate of the cross section,
+        depths c <= 0 give zero rows
+    angle: float
+            optional, radians. The segments are projected onto axes
+            rotated by angle about (xo,yo), as transformed_vertices_radians
+            would, so the section need not be rotated beforehand. c is then
+            measured from the peak rotated y coordinate and Mx, My are
+            rotated back to the section axes, taken about (xo,yo).
+    xo, yo: float
+            point the projection rotates about, default 0,0
+
+    Returns:
+    ---------
+    results: (M,3) numpy array
+            P, Mx, My for each neutral axis depth
+    """
+    x1, y1, x2, y2 = _segment_endpoints(segments)
+
+    if angle is not None:
+        x1, y1, x2, y2 = _project_segments(x1, y1, x2, y2, xo, yo, angle)
+
+    C = np.asarray(c, dtype=float).reshape(-1,1)
+
+    results = np.zeros((C.shape[0],3))
+
+    # depths c <= 0 have no compression block and keep their zero rows
+    live = C[:,0] > 0
+    C = C[live]
+
+    y_max = max(y1.max(), y2.max())
+    yna = y_max - C
+    yec2 = yna + (C*(ec2/eu))
+
+    # Parabolic region, Y,na to Y,ec2
+    A, D, B, E = _clip_segments(x1, y1, x2, y2, yna, yec2)
+
+    for i, r in enumerate(_ec2_segment_integrals(A, B, D, E, fcd, eu/ec2, n, C, yna)):
+        results[live,i] += r.sum(axis=1)
+
+    # Constant region, Y,ec2 to Y,max
+    A, D, B, E = _clip_segments(x1, y1, x2, y2, yec2, y_max)
+
+    for i, r in enumerate(_constant_segment_integrals(A, D, B, E, fcd)):
+        results[live,i] += r.sum(axis=1)
+
+    if angle is not None:
+        _rotate_resultants(results, angle)
+
+    return results
+
+def pca_stress_block_batch(segments, fc, eu, Ec, c, angle=None, xo=0, yo=0):
+    """
+    P, Mx, and My of the full PCA parabolic + constant stress block
+    for many neutral axis depths in a single call.
+
+    Parameters
+    ----------
+    segments: (N,2,2) array like
+                the closed edge segments of the section, oriented so
+                strain only varies in y and the extreme compression
+                fiber is at the peak y coordinate.
+
+    fc: float
+        f'c concrete compressive strength
+    eu: float
+        ultimate strain
+    Ec: float
+        concrete modulus
+    c: float or (M,) array like
+        depths of the neutral axis as measured from the peak y coordinate of the cross section,
+        depths c <= 0 give zero rows
+    angle: float
+            optional, radians. The segments are projected onto axes
+            rotated by angle about (xo,yo), as transformed_vertices_radians
+            would, so the section need not be rotated beforehand. c is then
+            measured from the peak rotated y coordinate and Mx, My are
+            rotated back to the section axes, taken about (xo,yo).
+    xo, yo: float
+            point the projection rotates about, default 0,0
+
+    Returns:
+    ---------
+    results: (M,3) numpy array
+            P, Mx, My for each neutral axis depth
+    """
+    x1, y1, x2, y2 = _segment_endpoints(segments)
+
+    if angle is not None:
+        x1, y1, x2, y2 = _project_segments(x1, y1, x2, y2, xo, yo, angle)
+
+    C = np.asarray(c, dtype=float).reshape(-1,1)
+
+    results = np.zeros((C.shape[0],3))
+
+    # depths c <= 0 have no compression block and keep their zero rows
+    live = C[:,0] > 0
+    C = C[live]
+
+    eo = (2*0.85*fc)/Ec
+    K = eu/(C*eo)
+
+    y_max = max(y1.max(), y2.max())
+    yna = y_max - C
+    yeo = yna + (C*(eo/eu))
+
+    # Parabolic region, Y,na to Y,eo
+    A, D, B, E = _clip_segments(x1, y1, x2, y2, yna, yeo)
+
+    for i, r in enumerate(_pca_segment_integrals(A, B, D, E, fc, K, yna)):
+        results[live,i] += r.sum(axis=1)
+
+    # Constant region, Y,eo to Y,max
+    A, D, B, E = _clip_segments(x1, y1, x2, y2, yeo, y_max)
+
+    for i, r in enumerate(_constant_segment_integrals(A, D, B, E, 0.85*fc)):
+        results[live,i] += r.sum(axis=1)
+
+    if angle is not None:
+        _rotate_resultants(results, angle)
+
+    return results
+
+def constant_stress_block(segments, stress, details=True):
     """
     A function to calculate P,Mx, and My by line
     integral along given line segments for a constant
@@ -18,6 +676,10 @@ def constant_stress_block(segments, stress):
     stress: float
             constant stress value for region
 
+    details: bool
+            if False the per segment results are not kept
+            and details is returned as None
+
     Returns:
     ---------
     P: float
@@ -30,41 +692,18 @@ def constant_stress_block(segments, stress):
         x centroid coordinate of P action
     y: float
         y centroid coordinate of P action
-    details: list of floats
-            list of P,Mx,My values per segment
+    details: (N,3) numpy array or None
+            P,Mx,My values per segment, None if details=False
     """
 
-    f = stress
-    P = 0
-    Mx = 0
-    My = 0
-    x = 0
-    y = 0
-    details = []
-
-    for s in segments:
-        x1 = s[0][0]
-        y1 = s[0][1]
-        x2 = s[1][0]
-        y2 = s[1][1]
-
-        axial = -1*0.5*f*(x1+x2)*(y1-y2)
-        P += axial
-
-        momentx = (1/6.0)*f*(y2-y1)*((x1*((2*y1)+y2))+(x2*(y1+(2*y2))))
-        Mx += momentx
-
-        momenty = (1/6.0)*f*((x1*x1)+(x1*x2)+(x2*x2))*(y2-y1)
-        My += momenty
-
-        details.append([axial,momentx,momenty])
+    P, Mx, My, details = constant_stress_block_array(segments, stress, details)
 
     x = My/P
     y = Mx/P
 
     return P,Mx,My,[x,y],details
 
-def linear_stress_block(segments, q1, q1_y, q2, q2_y):
+def linear_stress_block(segments, q1, q1_y, q2, q2_y, details=True):
     """
     A function to calculate P,Mx, and My by line
     integral along given line segments for a linearly
@@ -90,6 +729,10 @@ def linear_stress_block(segments, q1, q1_y, q2, q2_y):
         y-coordinate/elevation where q2 applies,
         used to swap q1 and q2 when needed.
 
+    details: bool
+            if False the per segment results are not kept
+            and details is returned as None
+
     Returns:
     ---------
     P: float
@@ -102,61 +745,18 @@ def linear_stress_block(segments, q1, q1_y, q2, q2_y):
         x centroid coordinate of P action
     y: float
         y centroid coordinate of P action
-    details: list of floats
-            list of P,Mx,My values per segment
+    details: (N,3) numpy array or None
+            P,Mx,My values per segment, None if details=False
     """
 
-    P = 0
-    Mx = 0
-    My = 0
-    x = 0
-    y = 0
-    details = []
-
-    for s in segments:
-        x1 = s[0][0]
-        y1 = s[0][1]
-        x2 = s[1][0]
-        y2 = s[1][1]
-
-        # set start and end stress based on y coordinate of segment end point
-        if y2 == q2_y:
-            qs = q1
-            qe = q2
-        else:
-            qs = q2
-            qe = q1
-
-        axial = (1/6.0)*(y2-y1)*((qs*((2*x1)+x2))+(qe*(x1+(2*x2))))
-        P += axial
-
-        momentx = ((1/12.0)*(y2-y1)
-                    * (
-                        qs*x1*((3*y1)+y2)
-                        + qs*x2*(y1+y2)
-                        + qe*x1*(y1+y2)
-                        + qe*x2*(y1+(3*y2))
-                        )
-                    )
-        Mx += momentx
-
-        momenty = ((-1/24.0)*(y1-y2)
-                    * (
-                        x1*x1*((3*qs)+qe)
-                        + 2*x1*x2*(qs+qe)
-                        + x2*x2*(qs+(3*qe))
-                        )
-                    )
-        My += momenty
-
-        details.append([axial,momentx,momenty])
+    P, Mx, My, details = linear_stress_block_array(segments, q1, q1_y, q2, q2_y, details)
 
     x = My/P
     y = Mx/P
 
     return P,Mx,My,[x,y],details
 
-def ec2_parabolic_stress_block(segments, fcd, n, eu, ec2, c, yna):
+def ec2_parabolic_stress_block(segments, fcd, n, eu, ec2, c, yna, details=True):
     """
     A function to calculate P,Mx, and My by line
     integral along given line segments for the parabolic region
@@ -184,6 +784,10 @@ def ec2_parabolic_stress_block(segments, fcd, n, eu, ec2, c, yna):
     yna: float
         y coordinate/elevation of the neutral axis
 
+    details: bool
+            if False the per segment results are not kept
+            and details is returned as None
+
     Returns:
     ---------
     P: float
@@ -196,8 +800,8 @@ def ec2_parabolic_stress_block(segments, fcd, n, eu, ec2, c, yna):
         x centroid coordinate of P action
     y: float
         y centroid coordinate of P action
-    details: list of floats
-            list of P,Mx,My values per segment
+    details: (N,3) numpy array or None
+            P,Mx,My values per segment, None if details=False
 
     Notes:
     -------
@@ -308,226 +912,16 @@ def ec2_parabolic_stress_block(segments, fcd, n, eu, ec2, c, yna):
     Integrate[(D + t (E - D)) (A + t (B - A)) (F (1 - (1 - (K (D + t (E - D)) - K Y)/C)^N)) (E - D), t]
     """
 
-    P = 0
-    Mx = 0
-    My = 0
-    x = 0
-    y = 0
-    details = []
-
-
-    F = fcd     # Fcd
-    K = eu/ec2  # eu/ec2
-    N = n       # n from table 3.1
-    C = c       # NA Depth = Y,max - Y,na
-    Y = yna     # Y,na = actual Y-coordinate of neutral Axis
-
-
-    for s in segments:
-        A = s[0][0] # X1
-        B = s[1][0] # X2
-        D = s[0][1] # Y1 = Y,na or Y,ec2
-        E = s[1][1] # Y2 = Y coordinate that corresponds to ec2 or Y,na
-
-
-        axial = []
-        for t in range(0,2):
-
-            Pintegral = ((-1*D + E)*
-                    F*(
-                        A*t + (((-1*A + B)*t*t)*0.5)
-                        - (
-                            (C + K*(D*(-1 + t) - E*t + Y))
-                            *(math.pow((1 + (K*(D*(-1 + t) - E*t + Y))/C),N))
-                            *(
-                                A*(C + K*(-1*(D*(1 + N)*(-1 + t)) + E*(-2 + N*(-1 + t) + t) + Y))
-                                - B*(C + K*(E*(1 + N)*t - D*(1 + t + N*t) + Y))
-                            )
-                        )
-                        /((D - E)*(D-E)*K*K*(1 + N)*(2 + N))
-                    )
-                    )
-
-            axial.append(Pintegral)
-
-        P += (axial[1]-axial[0])
-
-        momenty = []
-
-        for t in range(0,2):
-
-            if A==B:
-                My_integral = (
-                                (
-                                    A*A*(D - E)*F
-                                    * (
-                                        -1*t
-                                        + (
-                                            (C + K*(D*(-1 + t) - E*t + Y))
-                                            * math.pow((1 + (K*(D*(-1 + t) - E*t + Y))/C),N)
-                                            )
-                                            /((D - E)*K*(1 + N))
-                                        )
-                                    )/2.0)
-            else:
-                My_integral = (
-                                -1*(
-                                    (D - E)*F
-                                    * (
-                                        math.pow((A*(-1 + t) - B*t),3)
-                                        - (
-                                            3*math.pow((1 + (K*(D*(-1 + t) - E*t + Y))/C),N)
-                                            * (
-                                                math.pow((D - E),3)
-                                                * K*K*K*(1 + N)*(2 + N)
-                                                * math.pow((A*(-1 + t) - B*t),3)
-                                                - math.pow((D - E),2)
-                                                * K*K*N*(1 + N)
-                                                * math.pow((A*(-1 + t) - B*t),2)
-                                                * (B*(C + K*(-D + Y)) - A*(C + K*(-E + Y)))
-                                                - 2*(D - E)*K*N*(A*(-1 + t) - B*t)
-                                                * math.pow((B*(C + K*(-D + Y)) - A*(C + K*(-E + Y))),2)
-                                                - 2
-                                                * math.pow((B*(C + K*(-D + Y)) - A*(C + K*(-E + Y))),3)
-                                                )
-                                            )
-                                            / (
-                                                math.pow((D - E),3)*K*K*K*(1 + N)*(2 + N)*(3 + N)
-                                                )
-                                        )
-                                    )
-                                    / (6.0*(A - B))
-                                )
-
-            momenty.append(My_integral)
-
-        My  += (momenty[1]-momenty[0])
-
-        momentx = []
-
-        for t in range(0,2):
-
-            Mx_integral = (
-                            (-1.0*D + E)
-                            * F
-                            * (
-                                A*D*t
-                                + (((B*D + A*(-2.0*D + E))*t*t)*0.5)
-                                + (((A - B)*(D - E)*t*t*t)/3.0)
-                                - (
-                                    math.pow((1 + (K*(D*(-1 + t) - E*t + Y))/C),N)
-                                    * (
-                                        (A - B)
-                                        * math.pow((D - E),3)
-                                        * math.pow(K,3)*(1 + N)*(2 + N)*t*t*t
-                                        + math.pow((D - E),2)*K*K*(1 + N)*t*t
-                                        * (
-                                            -3.0*A*D*K*(2 + N)
-                                            + A*E*K*(3 + N)
-                                            + B*D*K*(3 + 2*N)
-                                            + A*N*(C + K*Y)
-                                            - B*N*(C + K*Y)
-                                            )
-                                        - (C + K*(-D + Y))
-                                        * (
-                                            B*(C + K*(-D + Y))
-                                            * (2*C + K*(D + D*N + 2*Y))
-                                            - A
-                                            * (
-                                                2*C*C
-                                                + C*K*(2*D*(1 + N) - E*(3 + N) + 4*Y)
-                                                + K*K*(
-                                                        D*D*(2 + 3*N + N*N)
-                                                        - D*(1 + N)*(E*(3 + N) - 2*Y)
-                                                        + Y*(-(E*(3 + N)) + 2*Y)
-                                                        )
-                                                )
-                                            )
-                                        + (D - E)*K*t
-                                        * (
-                                            B*N*(C + K*(-D + Y))*(2*C + K*(D + D*N + 2*Y))
-                                            + A
-                                            * (
-                                                3*D*D*K*K*(2 + 3*N + N*N)
-                                                + N*(-2*C + E*K*(3 + N) - 2*K*Y)
-                                                * (C + K*Y)
-                                                - 2*D*K*(1 + N)*(E*K*(3 + N) + N*(C + K*Y))
-                                                )
-                                            )
-                                        )
-                                    )
-                                    / (math.pow((D - E),2)*K*K*K*(1 + N)*(2 + N)*(3 + N))
-                                )
-                            )
-
-            momentx.append(Mx_integral)
-
-        Mx += (momentx[1]-momentx[0])
-
-        details.append([(axial[1]-axial[0]),(momentx[1]-momentx[0]),(momenty[1]-momenty[0])])
+    P, Mx, My, details = ec2_parabolic_stress_block_array(segments, fcd, n, eu, ec2, c, yna, details)
 
     x = My/P
     y = Mx/P
 
     return P,Mx,My,[x,y],details
 
-def pca_parabolic_stress_block(segments, fc, eu, Ec, c, yna):
-
-    P = 0
-    Mx = 0
-    My = 0
-    x = 0
-    y = 0
-    details = []
-
-    eo = (2*0.85*fc)/Ec
-    K = eu/(c*eo)
-    F = fc
-    Y = yna
-
-    for s in segments:
-        A = s[0][0] # X1
-        B = s[1][0] # X2
-        D = s[0][1] # Y1 = Y,na
-        E = s[1][1] # Y2 = Y coordinate that corresponds to ec2
-
-        axial = ((17.0*(D - E)*F*K
-                    *(B
-                        * (D*D*K + 3*E*E*K + 2*D*(-2 + E*K - 2*K*Y) - 8*E*(1 + K*Y) + 6*Y*(2 + K*Y))
-                        + A*(3*D*D*K + E*E*K
-                            + 2*D*(-4 + E*K - 4*K*Y) - 4*E*(1 + K*Y) + 6*Y*(2 + K*Y)
-                            )
-                        )
-                    )/240.0)
-
-        P+=axial
-
-        momenty = ((17*(D - E)*F*K
-                    * (
-                        B*B*(D*D*K + 6*E*E*K + D*(-5 + 3*E*K - 5*K*Y) - 15*E*(1 + K*Y) + 10*Y*(2 + K*Y))
-                        + A*B*(3*D*D*K + 3*E*E*K + 2*D*(-5 + 2*E*K - 5*K*Y) - 10*E*(1 + K*Y) + 10*Y*(2 + K*Y))
-                        + A*A*(6*D*D*K + E*E*K + 3*D*(-5 + E*K - 5*K*Y) - 5*E*(1 + K*Y) + 10*Y*(2 + K*Y))
-                        )
-                    )/1200.0)
-
-        My += momenty
-
-        momentx = ((17*(D - E)*F*K
-                    * (B
-                    * (3*D*D*D*K + 2*D*D*(-5 + 3*E*K - 5*K*Y)
-                        + D*(9*E*E*K - 20*E*(1 + K*Y) + 10*Y*(2 + K*Y))
-                        + 2*E*(6*E*E*K - 15*E*(1 + K*Y) + 10*Y*(2 + K*Y))
-                        )
-                        + A*(12*D*D*D*K + D*D*(9*E*K - 30*(1 + K*Y))
-                            + E*(3*E*E*K - 10*E*(1 + K*Y) + 10*Y*(2 + K*Y))
-                            + D*(6*E*E*K - 20*E*(1 + K*Y) + 20*Y*(2 + K*Y))
-                            )
-                        )
-                    )/1200.0)
-
-        Mx += momentx
+def pca_parabolic_stress_block(segments, fc, eu, Ec, c, yna, details=True):
 
-        details.append([axial,momentx,momenty])
+    P, Mx, My, details = pca_parabolic_stress_block_array(segments, fc, eu, Ec, c, yna, details)
 
     x = My/P
     y = Mx/P
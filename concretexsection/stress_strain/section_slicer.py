@@ -0,0 +1,100 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import numpy as np
+from .p_m_by_segment import _segment_endpoints, _clip_segments
+
+def stress_band_bounds(y_max, c, eu, strains):
+    '''
+    given the peak y coordinate of the section, the depth of the
+    neutral axis, the strain at the extreme compression fiber, and
+    the strains that divide the stress block into regions
+    ie. [ec2] for the EN 1992.1.1.2004 parabolic + constant block
+
+    return the sorted y bounds of the stress bands:
+    [y,na, y at each strain, y,max]
+
+    c may be a float or an (M,) array like of neutral axis depths,
+    in which case an (M, len(strains)+2) array of bounds is returned
+    '''
+    C = np.asarray(c, dtype=float)
+    e = np.sort(np.asarray(strains, dtype=float).reshape(-1))
+
+    yna = y_max - C[...,None]
+
+    bounds = np.empty(C.shape+(e.shape[0]+2,))
+    bounds[...,0] = yna[...,0]
+    bounds[...,1:-1] = yna + (C[...,None]*(e/eu))
+    bounds[...,-1] = y_max
+
+    return bounds
+
+def slice_segments(segments, y_bounds):
+    '''
+    split the edges of a section into the stress bands defined
+    by y_bounds in a single vectorized pass.
+
+    Inputs:
+    segments = the closed edge segments of the section,
+                ie. ConcreteSectionPolygon.define_segments(), as
+                nested lists or an (N,2,2) array
+    y_bounds = sorted (K,) array like of band elevations,
+                ie. [y,na, y,ec2, y,max] from stress_band_bounds,
+                or an (M,K) array to slice for M sets of bounds at once
+
+    Returns:
+    an (K-1,N,2,2) array, or (M,K-1,N,2,2) for 2D y_bounds, of the
+    segments clipped to each band. Every band holds all N edges so
+    the result stays rectangular, edges or parts of edges outside a
+    band and horizontal edges collapse to zero length segments which
+    contribute nothing to the stress block functions in p_m_by_segment.
+    Each band can be passed directly as the segments of those functions.
+    '''
+    x1, y1, x2, y2 = _segment_endpoints(segments)
+
+    bounds = np.asarray(y_bounds, dtype=float)
+    single = (bounds.ndim == 1)
+    bounds = bounds.reshape(-1, bounds.shape[-1])
+
+    if bounds.shape[1] < 2:
+        raise ValueError('y_bounds needs at least two values to define a band')
+
+    if np.any(np.diff(bounds, axis=1) < 0):
+        raise ValueError('y_bounds must be sorted in ascending order')
+
+    # (M,K-1,1) band limits broadcast against the (N,) edges
+    y_low = bounds[:,:-1,None]
+    y_high = bounds[:,1:,None]
+
+    clipped = _clip_segments(x1, y1, x2, y2, y_low, y_high)
+
+    bands = np.stack(clipped, axis=-1).reshape(clipped[0].shape+(2,2))
+
+    if single:
+        return bands[0]
+    else:
+        return bands
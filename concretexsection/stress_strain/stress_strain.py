@@ -32,7 +32,6 @@ OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from __future__ import division
 import math
-import matplotlib.pyplot as plt
 
 def stress_strain_ec2(fcd, ec2, eu, n, strain):
     '''
@@ -0,0 +1,216 @@
+'''
+BSD 3-Clause License
+
+Copyright (c) 2019, open-struct-engineer developers and Donald N. Bockoven III
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import math
+import numpy as np
+
+# Array versions of the stress_strain.py functions
+#
+# strains, and depths for strain_at_depth, may be floats or arrays of any
+# shape, the result is an array of the same shape. Each expression is
+# written in the same order as the scalar function so the results are
+# identical, powers go through math.pow as numpy's power and x*x
+# may differ from it in the last bit. That costs one Python call per
+# power, only the masked strains that need one are raised, the steel and
+# strain_at_depth functions have no powers and stay fully vectorized.
+
+_math_pow = np.frompyfunc(math.pow, 2, 1)
+
+def _pow(base, n):
+    '''
+    elementwise math.pow(base, n)
+    '''
+    return _math_pow(base, n).astype(float)
+
+def stress_strain_ec2_array(fcd, ec2, eu, n, strain):
+    '''
+    EN 1992.1.1.2004 parabolic stress block as defined by equations 3.17 and 3.18
+    see stress_strain.stress_strain_ec2
+    '''
+    e = np.asarray(strain, dtype=float)
+
+    stress = np.zeros(e.shape)
+
+    parabolic = (0<=e) & (e<=ec2)
+    constant = (ec2<e) & (e<=eu)
+
+    stress[parabolic] = fcd*(1-_pow((1-(e[parabolic]/ec2)),n))
+    stress[constant] = fcd
+
+    return stress
+
+def stress_strain_pca_array(fprimec, ultimate_strain, concrete_modulus, strain):
+    '''
+    PCA Stress-Strain Relationship
+    see stress_strain.stress_strain_pca
+    '''
+    e = np.asarray(strain, dtype=float)
+    Ec = concrete_modulus
+    eu = ultimate_strain
+    fc = fprimec
+
+    eo = (2*0.85*fc)/(Ec)
+
+    stress = np.zeros(e.shape)
+
+    parabolic = (0<e) & (e<=eo)
+    constant = (eo<e) & (e<=eu)
+
+    r = e[parabolic]/eo
+
+    stress[parabolic] = 0.85*fc*((2*r)-(r*r))
+    stress[constant] = 0.85*fc
+
+    return stress
+
+def stress_strain_desayi_krishnan_array(fprimec, ultimate_strain, k, strain):
+    '''
+    Desayi and Krishnan parabolic stress-strain relationship
+    see stress_strain.stress_strain_desayi_krishnan
+    '''
+    e = np.asarray(strain, dtype=float)
+
+    fo = fprimec
+
+    eo1 = (ultimate_strain - math.sqrt(-1*(math.pow(k,2) - 1)*math.pow(ultimate_strain,2))) / k
+    eo2 = (math.sqrt(-1*(math.pow(k,2) - 1)*math.pow(ultimate_strain,2))+ultimate_strain) / k
+
+    eo = min(eo1,eo2)
+
+    E = 2*fo / eo
+
+    stress = np.zeros(e.shape)
+
+    active = (0<e) & (e<=ultimate_strain)
+
+    ea = e[active]
+
+    stress[active] = ((E*ea) / (1+_pow(ea/eo,2)))*0.85
+
+    return stress
+
+def stress_strain_collins_et_all_array(fprimec, ultimate_strain, strain):
+    '''
+    Collins, Mitchell and MacGregor parabolic stress-strain relationship, PSI units
+    see stress_strain.stress_strain_collins_et_all
+    '''
+    strain = np.asarray(strain, dtype=float)
+
+    k = 0.67 + (fprimec / 9000.0) # for PSI units
+    n = 0.8 + (fprimec / 2500.0) # for PSI units
+    Ec = (40000*math.sqrt(fprimec)) + 1000000 # for PSI units
+
+    ecprime = (fprimec / Ec)*(n/(n-1))
+
+    stress = np.zeros(strain.shape)
+
+    active = (0<strain) & (strain<=ultimate_strain)
+
+    e = strain[active]/ecprime
+
+    pre = e <= 1
+    post = ~pre
+
+    power = np.empty(e.shape)
+    power[pre] = _pow(e[pre], n)
+    power[post] = _pow(e[post], n*k)
+
+    stress[active] = (((e) * (n / (n-1+power))) * fprimec)*0.85
+
+    return stress
+
+def stress_strain_whitney_array(fprimec, ultimate_strain, strain):
+    '''
+    Whitney Stress block used in ACI 318
+    see stress_strain.stress_strain_whitney
+
+    returns [stress array, beta1]
+    '''
+    e = np.asarray(strain, dtype=float)
+
+    if fprimec <= 4000:
+        beta1 = 0.85
+    elif fprimec <= 8000:
+        beta1 = 0.85 - ((0.05*(fprimec-4000))/1000)
+    else:
+        beta1 = 0.65
+
+    stress = np.zeros(e.shape)
+
+    stress[((ultimate_strain - (ultimate_strain*beta1)) < e) & (e <= ultimate_strain)] = 0.85*fprimec
+
+    return [stress, beta1]
+
+def stress_strain_steel_array(fy, yield_strain, Es, strain):
+    '''
+    Linear stress strain up to +/- fy
+    see stress_strain.stress_strain_steel
+    '''
+    e = np.asarray(strain, dtype=float)
+
+    if Es == 0:
+        yielded = np.abs(e) >= yield_strain
+    else:
+        yielded = np.abs(e)*Es >= yield_strain*Es
+
+    elastic = ~yielded
+
+    stress = np.empty(e.shape)
+
+    ey = e[yielded]
+    stress[yielded] = (ey/np.abs(ey)) * fy
+
+    if Es == 0:
+        stress[elastic] = (e[elastic]*fy)/yield_strain
+    else:
+        stress[elastic] = (e[elastic]*Es)
+
+    return stress
+
+def strain_at_depth_array(eu, neutral_axis_depth, depth_of_interest):
+    '''
+    Given Neutral Axis Depths and the maximum compressive strain
+    at the extreme compression fiber
+
+    return the associated strains at the depths of interest,
+    neutral_axis_depth and depth_of_interest broadcast against
+    each other, ie. (M,1) depths against (B,) bars gives (M,B) strains
+
+    see stress_strain.strain_at_depth
+    '''
+    c = np.asarray(neutral_axis_depth, dtype=float)
+    d = np.asarray(depth_of_interest, dtype=float)
+
+    c = np.where(c == 0, 0.000001, c)
+
+    return ((c-d)/c)*eu
@@ -0,0 +1,333 @@
+'''
+BSD 3-Clause License
+Copyright (c) 2020, open-struct-engineer developers
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+from __future__ import division
+import numpy as np
+from .p_m_by_segment import _segment_endpoints, _clip_segments, _ec2_segment_integrals
+
+# Sweep-line integration of a stress block as the neutral axis depth grows
+#
+# With eta = y,max - y, the depth below the extreme compression fiber,
+# the EC2 parabola is stress = F*(1-u^N) with u = 1 - K*(y-Y)/C = a + b*eta,
+# a = 1-K and b = K/C. For an integer N, u^N expands into the depth
+# moments S_j = integral(eta^j)dA and T_j = integral(x*eta^j)dA, with
+# integral(y*eta^j)dA = y,max*S_j - S_(j+1), which do not depend on the
+# neutral axis. The moments of the part of the section above a cut are
+# kept as running totals of the edges entirely above it plus the few
+# edges crossing it, and as the cut moves down only the edges it passes
+# are added. The band between two cuts is the difference of the totals.
+#
+# The edge moments are Green's theorem line integrals, integral(x*eta^j)dy
+# and integral(0.5*x^2*eta^j)dy, evaluated with Gauss-Legendre points that
+# are exact for the polynomial integrands.
+
+def _edge_moments(x1, y1, x2, y2, y_max, order, nodes, weights):
+    '''
+    S_0..S_(order+1) and T_0..T_order of each edge as (E,order+2)
+    and (E,order+1) arrays
+    '''
+    dx = x2 - x1
+    dy = y2 - y1
+
+    x = x1[:,None] + nodes*dx[:,None]
+    eta = y_max - (y1[:,None] + nodes*dy[:,None])
+
+    powers = np.empty(x.shape+(order+2,))
+    powers[...,0] = 1.0
+    for j in range(1, order+2):
+        powers[...,j] = powers[...,j-1]*eta
+
+    wdy = weights*dy[:,None]
+
+    S = np.einsum('em,emj->ej', x*wdy, powers)
+    T = np.einsum('em,emj->ej', 0.5*x*x*wdy, powers[...,:order+1])
+
+    return S, T
+
+class _CutSweep(object):
+    '''
+    running moment totals of the part of the section above a cut
+    that only moves down
+    '''
+
+    def __init__(self, edges):
+        self.edges = edges
+        self.reset()
+
+    def reset(self):
+        self.cut = np.inf
+        self.n_above = 0
+        self.n_started = 0
+        self.active = set()
+
+    def move(self, y_cut):
+        if y_cut > self.cut:
+            raise ValueError('the sweep only moves down, use reset to start over')
+
+        e = self.edges
+
+        # edges reaching above the cut start crossing it
+        n_started = int(np.searchsorted(e.neg_hi, -y_cut, side='left'))
+        self.active.update(e.by_hi[self.n_started:n_started].tolist())
+
+        # edges now entirely above the cut move to the running totals
+        n_above = int(np.searchsorted(e.neg_lo, -y_cut, side='right'))
+        self.active.difference_update(e.by_lo[self.n_above:n_above].tolist())
+
+        self.n_started = n_started
+        self.n_above = n_above
+        self.cut = y_cut
+
+    def totals(self):
+        '''
+        S and T moments above the cut
+        '''
+        e = self.edges
+
+        S = e.cum_S[self.n_above].copy()
+        T = e.cum_T[self.n_above].copy()
+
+        if self.active:
+            idx = np.fromiter(self.active, dtype=np.intp, count=len(self.active))
+
+            A, D, B, E = _clip_segments(e.x1[idx], e.y1[idx], e.x2[idx], e.y2[idx], self.cut, np.inf)
+
+            s, t = _edge_moments(A, D, B, E, e.y_max, e.order, e.nodes, e.weights)
+
+            S += s.sum(axis=0)
+            T += t.sum(axis=0)
+
+        return S, T
+
+class _SortedEdges(object):
+    '''
+    edges with their moments and the descending y orders shared by the cuts
+    '''
+
+    def __init__(self, segments, order):
+        x1, y1, x2, y2 = _segment_endpoints(segments)
+
+        self.y_max = float(max(y1.max(), y2.max()))
+
+        # horizontal edges add nothing to the line integrals
+        keep = y1 != y2
+
+        self.x1 = x1[keep]
+        self.y1 = y1[keep]
+        self.x2 = x2[keep]
+        self.y2 = y2[keep]
+
+        ylo = np.minimum(self.y1, self.y2)
+        yhi = np.maximum(self.y1, self.y2)
+
+        self.order = order
+
+        nodes, weights = np.polynomial.legendre.leggauss(order//2 + 2)
+        self.nodes = 0.5*(nodes + 1)
+        self.weights = 0.5*weights
+
+        S, T = _edge_moments(self.x1, self.y1, self.x2, self.y2, self.y_max, order, self.nodes, self.weights)
+
+        self.by_lo = np.argsort(-ylo, kind='stable')
+        self.by_hi = np.argsort(-yhi, kind='stable')
+        self.neg_lo = -ylo[self.by_lo]
+        self.neg_hi = -yhi[self.by_hi]
+
+        # cum_S[k] = moments of the k edges with the highest ylo
+        self.cum_S = np.zeros((S.shape[0]+1, S.shape[1]))
+        self.cum_T = np.zeros((T.shape[0]+1, T.shape[1]))
+        np.cumsum(S[self.by_lo], axis=0, out=self.cum_S[1:])
+        np.cumsum(T[self.by_lo], axis=0, out=self.cum_T[1:])
+
+class StressBlockSweep(object):
+    '''
+    EN 1992.1.1.2004 parabolic + constant stress block integrated for
+    a sequence of increasing neutral axis depths, ie. a P-M curve
+    from tension to compression.
+
+    The constant region is the part of the section above the ec2 cut and
+    is always taken from running totals. For an integer n the parabolic
+    region is the difference of the totals above the neutral axis and
+    above the ec2 cut, so each step only works on the edges the two cuts
+    cross. For a non-integer n the edges inside the parabolic band,
+    found from the same sorted orders, are integrated each step with
+    the p_m_by_segment parabolic line integrals.
+    '''
+
+    def __init__(self, segments, fcd, n, eu, ec2):
+        '''
+        Inputs:
+
+        segments = the closed edge segments of the section, oriented so
+                    strain only varies in y and the extreme compression
+                    fiber is at the peak y coordinate
+        fcd, n, eu, ec2 = see p_m_by_segment.ec2_stress_block_batch
+        '''
+        self.fcd = fcd
+        self.n = n
+        self.eu = eu
+        self.ec2 = ec2
+
+        self.integer = float(n).is_integer() and n >= 1
+
+        if self.integer:
+            N = int(n)
+            self._binomial = np.array([_comb(N, j) for j in range(N+1)], dtype=float)
+            order = N
+        else:
+            order = 0
+
+        self._edges = _SortedEdges(segments, order)
+        self.y_max = self._edges.y_max
+
+        self._na = _CutSweep(self._edges)
+        self._top = _CutSweep(self._edges)
+
+        self.c = -np.inf
+
+    def reset(self):
+        '''
+        start the sweep over from the extreme compression fiber
+        '''
+        self._na.reset()
+        self._top.reset()
+        self.c = -np.inf
+
+    def step(self, c):
+        '''
+        P, Mx, and My for the neutral axis depth c, which must not be
+        less than the depth of the previous step. No part of the section
+        is in compression for c <= 0 and the resultants are 0.
+
+        returns a (3,) array
+        '''
+        C = float(c)
+
+        if C < self.c:
+            raise ValueError('neutral axis depth must not decrease during a sweep, use reset to start over')
+
+        if C <= 0:
+            return np.zeros(3)
+
+        F = self.fcd
+        K = self.eu/self.ec2
+        y_max = self.y_max
+
+        Y = y_max - C
+        yec2 = Y + (C*(self.ec2/self.eu))
+
+        self._na.move(Y)
+        self._top.move(yec2)
+        self.c = C
+
+        S_top, T_top = self._top.totals()
+
+        # Constant region, Y,ec2 to Y,max
+        P = F*S_top[0]
+        Mx = F*((y_max*S_top[0]) - S_top[1])
+        My = F*T_top[0]
+
+        # Parabolic region, Y,na to Y,ec2
+        if self.integer:
+            S_na, T_na = self._na.totals()
+
+            S = S_na - S_top
+            T = T_na - T_top
+
+            N = int(self.n)
+            a = 1 - K
+            b = K/C
+
+            coef = self._binomial*np.power(a, np.arange(N, -1, -1))*np.power(b, np.arange(N+1))
+
+            uN = coef.dot(S[:N+1])
+            eta_uN = coef.dot(S[1:N+2])
+            x_uN = coef.dot(T[:N+1])
+
+            P += F*(S[0] - uN)
+            Mx += F*(((y_max*S[0]) - S[1]) - ((y_max*uN) - eta_uN))
+            My += F*(T[0] - x_uN)
+
+        else:
+            e = self._edges
+
+            band = list(self._na.active)
+            band.extend(e.by_lo[self._top.n_above:self._na.n_above].tolist())
+
+            if band:
+                idx = np.array(band, dtype=np.intp)
+
+                A, D, B, E = _clip_segments(e.x1[idx], e.y1[idx], e.x2[idx], e.y2[idx], Y, yec2)
+
+                axial, momentx, momenty = _ec2_segment_integrals(A, B, D, E, F, K, self.n, C, Y)
+
+                P += axial.sum()
+                Mx += momentx.sum()
+                My += momenty.sum()
+
+        return np.array([P, Mx, My])
+
+    def sweep(self, c):
+        '''
+        P, Mx, and My for an increasing (M,) array of neutral axis depths,
+        continuing from the last step
+
+        returns an (M,3) array like p_m_by_segment.ec2_stress_block_batch
+        '''
+        C = np.asarray(c, dtype=float).reshape(-1)
+
+        results = np.empty((C.shape[0],3))
+
+        for i, ci in enumerate(C):
+            results[i] = self.step(ci)
+
+        return results
+
+def _comb(n, k):
+    '''
+    binomial coefficient n choose k
+    '''
+    r = 1
+    for i in range(1, k+1):
+        r = (r*(n-k+i))//i
+    return r
+
+def ec2_stress_block_sweep(segments, fcd, n, eu, ec2, c):
+    '''
+    ec2_stress_block_batch for an increasing array of neutral axis
+    depths using a StressBlockSweep, returns an (M,3) array
+    '''
+    return StressBlockSweep(segments, fcd, n, eu, ec2).sweep(c)
+
+def pca_stress_block_sweep(segments, fc, eu, Ec, c):
+    '''
+    pca_stress_block_batch for an increasing array of neutral axis
+    depths, the PCA curve is the EC2 parabola with n = 2, a peak stress
+    of 0.85*f'c and eo = 2*0.85*f'c/Ec in place of ec2
+    '''
+    eo = (2*0.85*fc)/Ec
+
+    return StressBlockSweep(segments, 0.85*fc, 2, eu, eo).sweep(c)
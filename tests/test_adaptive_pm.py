@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from concretexsection.geometry.ConcreteSectionPolygon import ConcreteSectionPolygon
+from concretexsection.geometry.RebarLayout import RebarLayout
+from concretexsection.stress_strain.adaptive_pm import adaptive_pm_diagram
+from concretexsection.stress_strain.p_m_by_segment import ec2_stress_block_batch
+
+SECTION = ConcreteSectionPolygon([0, 16, 16, 0], [0, 0, 30, 30], None)
+REBAR = RebarLayout([2.5, 13.5, 2.5, 13.5, 8], [2.5, 2.5, 27.5, 27.5, 2.5], [1.0, 1.0, 0.44, 0.44, 1.0],
+                    60000, 29e6)
+
+C_MIN = 0.05
+C_MAX = 90.0
+
+
+def _pm(c):
+    concrete = ec2_stress_block_batch(SECTION.segments, 4250, 2, 0.0035, 0.002, c)
+
+    return concrete + REBAR.forces(0.0035, c, 30.0)
+
+
+def _distance_to_polyline(points, vertices):
+    # distance of every point to the nearest segment of the polyline
+    a = vertices[:-1][None,:,:]
+    b = vertices[1:][None,:,:]
+    p = points[:,None,:]
+
+    ab = b - a
+    t = np.clip(((p - a)*ab).sum(axis=-1)/np.maximum((ab*ab).sum(axis=-1), 1e-300), 0, 1)
+    nearest = a + t[...,None]*ab
+
+    return np.sqrt(((p - nearest)**2).sum(axis=-1)).min(axis=1)
+
+
+@pytest.mark.parametrize('tol', [1e-2, 1e-3])
+def test_error_bound_against_dense_diagram(tol):
+    c, res, error = adaptive_pm_diagram(_pm, C_MIN, C_MAX, tol=tol)
+
+    assert np.all(np.diff(c) > 0)
+    assert np.array_equal(res, _pm(c))
+    assert error <= tol
+
+    dense_c = np.geomspace(C_MIN, C_MAX, 20001)
+    dense = _pm(dense_c)[:,:2]
+
+    scale = dense.max(axis=0) - dense.min(axis=0)
+
+    # the dense diagram between each pair of adaptive samples stays near
+    # the chord joining them, error is only measured at the mid depths so
+    # bars yielding inside an accepted interval can roughly double it
+    gap = _distance_to_polyline(dense/scale, res[:,:2]/scale)
+
+    assert gap.max() <= 2*tol
+
+    # closer than a uniform geometric sample with as many depths
+    uniform = np.geomspace(C_MIN, C_MAX, c.shape[0])
+    assert _distance_to_polyline(dense/scale, _pm(uniform)[:,:2]/scale).max() > gap.max()
+
+
+def test_evaluation_cap_is_respected():
+    calls = []
+
+    def pm(c):
+        calls.append(c.shape[0])
+        return _pm(c)
+
+    c, res, error = adaptive_pm_diagram(pm, C_MIN, C_MAX, tol=1e-6, n_initial=9, max_evaluations=40)
+
+    assert sum(calls) == 40
+    assert c.shape[0] == 40
+    assert 1e-6 < error < np.inf
+
+
+@pytest.mark.parametrize('kwargs', [dict(max_evaluations=9), dict(max_evaluations=16),
+                                    dict(n_initial=1), dict(tol=0.0), dict(moment=0),
+                                    dict(c_min=0.0), dict(c_min=100.0)])
+def test_invalid_arguments_raise(kwargs):
+    args = dict(c_min=C_MIN, c_max=C_MAX)
+    args.update(kwargs)
+
+    with pytest.raises(ValueError):
+        adaptive_pm_diagram(_pm, **args)
+
+    # the smallest cap allowed runs the first refinement pass and no more
+    c, res, error = adaptive_pm_diagram(_pm, C_MIN, C_MAX, max_evaluations=17)
+    assert c.shape[0] == 17
+    assert np.isfinite(error)
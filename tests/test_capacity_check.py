@@ -0,0 +1,181 @@
+import numpy as np
+import pytest
+
+from concretexsection.geometry.ConcreteSectionPolygon import ConcreteSectionPolygon
+from concretexsection.storage.result_store import ResultStore
+from concretexsection.stress_strain import stress_strain as ss
+from concretexsection.stress_strain.capacity_check import CapacitySurface
+from concretexsection.stress_strain.interaction_surface import interaction_surface
+
+BAR_X = np.array([2, 18, 2, 18, 10, 10], dtype=float)
+BAR_Y = np.array([2, 2, 28, 28, 2, 28], dtype=float)
+
+
+def _surface(bar_As):
+    section = ConcreteSectionPolygon([0, 20, 20, 0], [0, 0, 30, 30], None)
+    angles = np.linspace(0, 2*np.pi, 36, endpoint=False)
+
+    return interaction_surface(section, BAR_X, BAR_Y, np.asarray(bar_As, dtype=float),
+                               60000, 29e6, 4250, 2, 0.0035, 0.002, angles=angles)[:3]
+
+
+SYMMETRIC = [0.79]*6
+UNSYMMETRIC = [0.79, 0.79, 0.31, 0.31, 0.79, 0.2]
+
+
+@pytest.mark.parametrize('bar_As', [SYMMETRIC, UNSYMMETRIC])
+def test_surface_points_have_unit_ratios(bar_As):
+    P, Mx, My = _surface(bar_As)
+    surface = CapacitySurface(P, Mx, My)
+
+    radial = surface.dcr(P, Mx, My, 'radial')
+    moment = surface.dcr(P, Mx, My, 'moment')
+
+    assert np.allclose(radial, 1, atol=0.01)
+
+    # the default depth ratios are linspace(0.01, 3, 100), from column 77,
+    # c > 2.33h, the whole section is at fcd with every bar yielded so
+    # those points are the pure axial apex. The row end points at column
+    # 0 are slice vertices.
+    assert np.allclose(moment[:,:1], 1, atol=1e-9)
+    assert np.allclose(moment[:,77:], 1, atol=1e-9)
+
+    # the body of the surface
+    assert np.all((0.998 <= moment[:,2:73]) & (moment[:,2:73] <= 1.01))
+    assert np.allclose(moment[:,2:73], radial[:,2:73], atol=0.01)
+
+    # the first depth past the tension apex and the last few before the
+    # compression apex, where the slices shrink to a point, the linear
+    # interpolation of the slices between levels only errs conservative
+    for d, worst in ((moment[:,1], 1.035), (moment[:,73:77], 1.15)):
+        assert np.all((0.998 <= d) & (d <= worst))
+
+
+def test_pure_axial_demands():
+    P, Mx, My = _surface(SYMMETRIC)
+    surface = CapacitySurface(P, Mx, My)
+
+    P_max = P.max()
+    demand = np.array([0, P_max, 0.5*P_max, 1.01*P_max])
+    zero = np.zeros(4)
+
+    expected = [0, 1, 0.5, 1.01]
+
+    # round off moments at the compression end are pure axial loads
+    for M in (zero, np.full(4, 1e-9)):
+        assert np.allclose(surface.dcr(demand, M, zero, 'moment'), expected, atol=1e-6)
+        assert np.allclose(surface.dcr(demand, M, zero, 'radial'), expected, atol=1e-3)
+
+
+def test_inside():
+    P, Mx, My = _surface(UNSYMMETRIC)
+    surface = CapacitySurface(P, Mx, My)
+
+    for method in ('radial', 'moment'):
+        assert surface.inside(0.5*P[:,2:50], 0.5*Mx[:,2:50], 0.5*My[:,2:50], method).all()
+        assert not surface.inside(1.1*P[:,2:50], 1.1*Mx[:,2:50], 1.1*My[:,2:50], method).any()
+
+
+# dense ground truth, a symmetric 20 x 30 section in uniaxial bending
+# about either axis checked against a fiber integration of the scalar
+# stress-strain functions
+B = 20.0
+H = 30.0
+GT_X = np.array([3, 17, 3, 17, 10, 10], dtype=float)
+GT_Y = np.array([3, 3, 27, 27, 3, 27], dtype=float)
+GT_AS = np.full(6, 0.79)
+FY = 60000.0
+ES = 29e6
+FCD = 4250.0
+EU = 0.0035
+EC2 = 0.002
+
+_T, _W = np.polynomial.legendre.leggauss(32)
+
+
+def _uniaxial(c, width, depth, bar_d):
+    '''
+    P and M about mid depth of a width x depth rectangle with the
+    extreme compression fiber at depth 0
+    '''
+    cuts = sorted(set([0.0, depth] + [v for v in (c, c*(1 - EC2/EU)) if 0 < v < depth]))
+
+    P = M = 0.0
+
+    for a, b in zip(cuts[:-1], cuts[1:]):
+        d = a + (b - a)*(_T + 1)*0.5
+        w = (b - a)*0.5*_W*width
+        s = np.array([ss.stress_strain_ec2(FCD, EC2, EU, 2, ss.strain_at_depth(EU, c, v)) for v in d])
+
+        P += np.dot(w, s)
+        M += np.dot(w, s*(0.5*depth - d))
+
+    for d, As in zip(bar_d, GT_AS):
+        f = As*ss.stress_strain_steel(FY, FY/ES, ES, ss.strain_at_depth(EU, c, d))
+
+        P += f
+        M += f*(0.5*depth - d)
+
+    return P, M
+
+
+def _uniaxial_capacity(P_target, width, depth, bar_d):
+    lo, hi = 1e-6, 1e4
+
+    for _ in range(80):
+        mid = 0.5*(lo + hi)
+
+        if _uniaxial(mid, width, depth, bar_d)[0] < P_target:
+            lo = mid
+        else:
+            hi = mid
+
+    return _uniaxial(0.5*(lo + hi), width, depth, bar_d)[1]
+
+
+def test_dense_ground_truth_near_the_ends():
+    section = ConcreteSectionPolygon([0, B, B, 0], [0, 0, H, H], None)
+    angles = np.radians(np.arange(0, 360, 5.0))
+
+    P, Mx, My = interaction_surface(section, GT_X, GT_Y, GT_AS, FY, ES, FCD, 2, EU, EC2, angles=angles,
+                                    depth_ratios=np.geomspace(0.002, 3.0, 200))[:3]
+    surface = CapacitySurface(P, Mx, My)
+
+    squash = (FCD*B*H) + (GT_AS.sum()*FY)
+    tension = -GT_AS.sum()*FY
+
+    assert P.max() == pytest.approx(squash, rel=1e-12)
+
+    # pure axial loads at the compression apex
+    for method in ('radial', 'moment'):
+        assert surface.dcr(squash, 0, 0, method) == pytest.approx(1, abs=1e-6)
+
+    targets = [0.95*tension, 0.5*tension, 0.1*squash, 0.4*squash, 0.7*squash,
+               0.9*squash, 0.97*squash, 0.99*squash, 0.998*squash]
+
+    for P_target in targets:
+        Mx_cap = _uniaxial_capacity(P_target, B, H, H - GT_Y)
+        My_cap = _uniaxial_capacity(P_target, H, B, B - GT_X)
+
+        for demand in ((Mx_cap, 0), (0, My_cap), (-Mx_cap, 0), (0, -My_cap)):
+            for method in ('radial', 'moment'):
+                assert surface.dcr(P_target, demand[0], demand[1], method) == pytest.approx(1, abs=0.005)
+
+
+def test_from_store(tmp_path):
+    P, Mx, My = _surface(UNSYMMETRIC)
+    surface = CapacitySurface(P, Mx, My)
+
+    with ResultStore(str(tmp_path), shape=P.shape, fields=('P', 'Mx', 'My')) as store:
+        store.put('section', P=P, Mx=Mx, My=My)
+
+    demand = (0.8*P[:,::7], 0.9*Mx[:,::7], 0.7*My[:,::7])
+
+    with ResultStore(str(tmp_path), mode='r') as store:
+        stored = CapacitySurface.from_store(store, 'section')
+
+        for method in ('radial', 'moment'):
+            assert np.array_equal(stored.dcr(*demand, method=method), surface.dcr(*demand, method=method))
+
+        with pytest.raises(KeyError):
+            CapacitySurface.from_store(store, 'missing')
@@ -0,0 +1,97 @@
+import math
+
+import numpy as np
+import pytest
+
+from concretexsection.geometry.CompositeSection import CompositeSection
+from concretexsection.geometry.ConcreteSectionPolygon import ConcreteSectionPolygon
+from concretexsection.geometry.VoidSectionPolygon import VoidSectionPolygon
+from concretexsection.stress_strain.p_m_by_segment import (constant_stress_block, ec2_stress_block_batch,
+                                                           pca_stress_block_batch)
+
+DEPTHS = np.array([1.0, 4.5, 9.0, 16.0, 27.0, 38.0, 60.0])
+
+HOLES = [([4, 12, 12, 4], [5, 5, 15, 15]),
+         ([18, 26, 22], [20, 20, 34])]
+
+
+def _solid():
+    return ConcreteSectionPolygon([0, 30, 30, 0], [0, 0, 40, 40], None)
+
+
+def _composite():
+    return CompositeSection(_solid(), [VoidSectionPolygon(list(x), list(y), None) for x, y in HOLES])
+
+
+def _subtracted(kernel, *args):
+    # the solid less each void integrated as its own positive polygon
+    solid = _solid()
+    y_max = max(solid.y)
+
+    total = kernel(solid.segments, *args)
+
+    for x, y in HOLES:
+        hole = ConcreteSectionPolygon(list(x), list(y), None)
+
+        # a zero length edge at the solid's peak so the depths, and
+        # strains, of the hole are measured from the same fiber
+        peak = np.array([[[x[0], y_max], [x[0], y_max]]], dtype=float)
+
+        total -= kernel(np.concatenate((hole.segments, peak)), *args)
+
+    return total
+
+
+def test_net_properties():
+    section = _composite()
+    solid = _solid()
+    holes = [ConcreteSectionPolygon(list(x), list(y), None) for x, y in HOLES]
+
+    area = solid.area - sum(h.area for h in holes)
+
+    assert section.area == pytest.approx(area, rel=1e-12)
+    assert section.cx == pytest.approx((solid.area*solid.cx - sum(h.area*h.cx for h in holes))/area, rel=1e-12)
+    assert section.cy == pytest.approx((solid.area*solid.cy - sum(h.area*h.cy for h in holes))/area, rel=1e-12)
+
+    for attribute in ('Ix', 'Iy', 'Ixy'):
+        expected = getattr(solid, attribute) - sum(getattr(h, attribute) for h in holes)
+        assert getattr(section, attribute) == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize('n', [2, 1.75])
+def test_ec2_single_pass_matches_per_void_subtraction(n):
+    merged = _composite().integrate(ec2_stress_block_batch, 4250, n, 0.0035, 0.002, DEPTHS)
+    expected = _subtracted(ec2_stress_block_batch, 4250, n, 0.0035, 0.002, DEPTHS)
+
+    assert np.allclose(merged, expected, rtol=1e-10, atol=1e-9*np.abs(expected).max())
+
+
+def test_pca_single_pass_matches_per_void_subtraction():
+    Ec = 57000*math.sqrt(5000)
+
+    merged = _composite().integrate(pca_stress_block_batch, 5000, 0.003, Ec, DEPTHS)
+    expected = _subtracted(pca_stress_block_batch, 5000, 0.003, Ec, DEPTHS)
+
+    assert np.allclose(merged, expected, rtol=1e-10, atol=1e-9*np.abs(expected).max())
+
+
+def test_positive_voids_are_reversed_and_merge_rebuilds():
+    # voids given as positively oriented polygons are reversed by merge
+    positive = CompositeSection(_solid(), [ConcreteSectionPolygon(list(x), list(y), None) for x, y in HOLES])
+    section = _composite()
+
+    assert np.array_equal(positive.segments, section.segments)
+    assert positive.area == section.area
+
+    P, Mx, My = section.integrate(constant_stress_block, 1.0, details=False)[:3]
+    assert P == pytest.approx(section.area, rel=1e-12)
+    assert Mx == pytest.approx(section.area*section.cy, rel=1e-12)
+    assert My == pytest.approx(section.area*section.cx, rel=1e-12)
+
+    area = section.area
+    section.voids[0].translate_vertices(2, 3, commit=1)
+
+    assert section.area == area
+    section.merge()
+    assert section.area == pytest.approx(area, rel=1e-12)
+    assert section.cx != pytest.approx(_composite().cx, rel=1e-12)
@@ -0,0 +1,61 @@
+import numpy as np
+
+from concretexsection.stress_strain.edge_index import EdgeIndex
+from concretexsection.stress_strain.p_m_by_segment import (_clip_segments, _constant_segment_integrals,
+                                                          _segment_endpoints)
+
+
+def _tall_section(n_arc=4000, height=3000.0, r=50.0):
+    '''
+    a semicircle of n_arc short edges on top of a rectangle with two
+    tall sides
+    '''
+    t = np.linspace(0, np.pi, n_arc+1)
+    x = np.concatenate(([-r, r, r], r*np.cos(t)[1:], [-r]))
+    y = np.concatenate(([0.0, 0.0, height], height + r*np.sin(t)[1:], [0.0]))
+
+    xy = np.column_stack((x, y))
+
+    return np.stack((xy[:-1], xy[1:]), axis=1), height, r
+
+
+def _crossing_brute(segments, y_cut):
+    ylo = np.minimum(segments[:, 0, 1], segments[:, 1, 1])
+    yhi = np.maximum(segments[:, 0, 1], segments[:, 1, 1])
+
+    return int(((ylo < y_cut) & (y_cut < yhi)).sum())
+
+
+def test_crossing_window_stays_small_with_a_tall_edge():
+    segments, height, r = _tall_section()
+    index = EdgeIndex(segments)
+
+    for y_cut in height + r*np.array([0.05, 0.3, 0.5, 0.7, 0.95, 0.999]):
+        scanned = index.crossing(y_cut)
+
+        assert scanned.shape[0] == _crossing_brute(segments, y_cut) == 2
+
+    # cuts through the rectangle only cross the two tall sides
+    assert index.crossing(0.5*height).shape[0] == 2
+
+
+def test_cut_queries_match_a_full_scan():
+    segments, height, r = _tall_section(n_arc=400)
+    index = EdgeIndex(segments)
+
+    cuts = np.concatenate((np.linspace(-10, height + r + 10, 57), [0.0, height, height + r]))
+
+    for y_cut, result in zip(cuts, index.above(cuts)):
+        ref = _above_brute(segments, y_cut)
+
+        assert np.allclose(result, ref, rtol=1e-10, atol=1e-6)
+
+    widths = index.width([0.5*height, height + 0.5*r])
+    assert np.allclose(widths, [2*r, 2*r*np.sqrt(0.75)], rtol=1e-4)
+
+
+def _above_brute(segments, y_cut):
+    x1, y1, x2, y2 = _segment_endpoints(segments)
+    A, D, B, E = _clip_segments(x1, y1, x2, y2, y_cut, np.inf)
+
+    return [r.sum() for r in _constant_segment_integrals(A, D, B, E, 1.0)]
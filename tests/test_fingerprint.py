@@ -0,0 +1,96 @@
+import pytest
+
+from concretexsection.geometry.CompositeSection import CompositeSection
+from concretexsection.geometry.ConcreteSectionCircle import ConcreteSectionCircle
+from concretexsection.geometry.ConcreteSectionPolygon import ConcreteSectionPolygon
+from concretexsection.geometry.RebarLayout import RebarLayout
+from concretexsection.geometry.SectionCatalog import SectionCatalog
+from concretexsection.geometry.SteelRebar import ASTM
+from concretexsection.geometry.SteelSectionPolygon import SteelSectionPolygon
+from concretexsection.geometry.VoidSectionPolygon import VoidSectionPolygon
+from concretexsection.material.concrete import aci_imperial
+from concretexsection.material.reinforcement import ASTM_A615
+from concretexsection.storage.fingerprint import section_fingerprint
+from concretexsection.stress_strain.material_curves import (CollinsCurve, DesayiKrishnanCurve,
+                                                             EC2ParabolicCurve, PCAParabolicCurve,
+                                                             SteelCurve, WhitneyCurve)
+
+
+def test_orientation_normalized_sections_match():
+    ccw = ConcreteSectionPolygon([0, 12, 12, 0], [0, 0, 24, 24], None)
+    cw = ConcreteSectionPolygon([0, 0, 12, 12], [0, 24, 24, 0], None)
+
+    assert ccw.warnings != cw.warnings
+    assert section_fingerprint(ccw) == section_fingerprint(cw)
+
+
+def test_warnings_are_not_hashed():
+    a = ConcreteSectionPolygon([0, 12, 12, 0], [0, 0, 24, 24], None)
+    b = ConcreteSectionPolygon([0, 12, 12, 0], [0, 0, 24, 24], None)
+    b.warnings = b.warnings + 'reworded diagnostic\n'
+
+    assert section_fingerprint(a) == section_fingerprint(b)
+
+
+def test_inputs_change_the_fingerprint():
+    a = ConcreteSectionPolygon([0, 12, 12, 0], [0, 0, 24, 24], None)
+    b = ConcreteSectionPolygon([0, 12, 12, 0], [0, 0, 24.5, 24.5], None)
+    c = ConcreteSectionPolygon([0, 12, 12, 0], [0, 0, 24, 24], None, units='Metric')
+    void = VoidSectionPolygon([2, 10, 10, 2], [2, 2, 22, 22], None)
+
+    keys = set([section_fingerprint(a), section_fingerprint(b), section_fingerprint(c),
+                section_fingerprint(a, voids=[void]), section_fingerprint(a, fcd=4250)])
+
+    assert len(keys) == 5
+
+
+def _rectangle(w=12, h=24):
+    return [0, w, w, 0], [0, 0, h, h]
+
+
+# (class, base arguments, changed value of each argument), lists are
+# built fresh for every object as the polygon sections close them in place
+CASES = [
+    (EC2ParabolicCurve, lambda: [4250, 0.002, 0.0035, 2], [3000, 0.0021, 0.003, 1.75]),
+    (PCAParabolicCurve, lambda: [5000, 0.003, 4e6], [4000, 0.0035, 3e6]),
+    (DesayiKrishnanCurve, lambda: [5000, 0.003, 0.9], [4000, 0.0035, 0.8]),
+    (CollinsCurve, lambda: [5000, 0.003], [4000, 0.0035]),
+    (WhitneyCurve, lambda: [5000, 0.003], [4000, 0.0035]),
+    (SteelCurve, lambda: [60000, 0.002, 0], [50000, 0.003, 29e6]),
+    (ConcreteSectionPolygon, lambda: list(_rectangle()) + [None, 'Imperial/US'],
+        [[0, 12, 12, 1], [0, 0, 25, 24], 'steel', 'Metric']),
+    (VoidSectionPolygon, lambda: [[2, 2, 10, 10], [2, 22, 22, 2], None, 'Imperial/US'],
+        [[2, 2, 9, 10], [2, 22, 22, 1], 'steel', 'Metric']),
+    (SteelSectionPolygon, lambda: list(_rectangle()) + [None, 'Imperial/US'],
+        [[0, 12, 12, 1], [0, 0, 25, 24], 'steel', 'Metric']),
+    (ConcreteSectionCircle, lambda: [12, None, 'Imperial/US'], [10, 'steel', 'Metric']),
+    (RebarLayout, lambda: [[2, 10], [2, 2], 0.79, 60000, 29e6],
+        [[2, 11], [2, 3], 0.6, 50000, 28e6]),
+    (ASTM, lambda: [10, ASTM_A615(), 'Imperial/US'], [9, ASTM_A615('Metric'), 'Metric']),
+    (ASTM_A615, lambda: ['Imperial/US'], ['Metric']),
+    # lightweight is not used by aci_imperial
+    (aci_imperial, lambda: [4, 145, False, 'Density'], [5, 150, None, 'Simple']),
+    (CompositeSection, lambda: [ConcreteSectionPolygon(*_rectangle()+(None,)),
+                                [VoidSectionPolygon([2, 2, 10, 10], [2, 22, 22, 2], None)]],
+        [ConcreteSectionPolygon(*_rectangle(13)+(None,)),
+         [VoidSectionPolygon([2, 2, 9, 9], [2, 22, 22, 2], None)]]),
+    (SectionCatalog, lambda: [[0, 12, 12, 0, 0, 2, 2, 10, 10, 2], [0, 0, 24, 24, 0, 2, 22, 22, 2, 2],
+                              [0, 5, 10], [0, 1, 2]],
+        [[0, 12, 12, 0, 0, 2, 2, 9, 10, 2], [0, 0, 25, 24, 0, 2, 22, 22, 2, 2], [0, 4, 10], [0, 2]]),
+]
+
+
+@pytest.mark.parametrize('cls, args, changed', CASES, ids=[c[0].__name__ for c in CASES])
+def test_every_constructor_argument_changes_the_fingerprint(cls, args, changed):
+    base = section_fingerprint(cls(*args()))
+
+    assert section_fingerprint(cls(*args())) == base
+
+    for i, value in enumerate(changed):
+        if value is None:
+            continue
+
+        a = args()
+        a[i] = value
+
+        assert section_fingerprint(cls(*a)) != base, 'argument {0}'.format(i)
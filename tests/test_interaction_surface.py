@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+import pytest
+
+from concretexsection.geometry.ConcreteSectionPolygon import ConcreteSectionPolygon
+from concretexsection.geometry.RebarLayout import RebarLayout
+from concretexsection.stress_strain import stress_strain as ss
+from concretexsection.stress_strain.interaction_surface import interaction_surface
+from concretexsection.stress_strain.p_m_by_segment import ec2_stress_block_batch
+
+BAR_X = np.array([2, 18, 2, 18, 10, 10], dtype=float)
+BAR_Y = np.array([2, 2, 28, 28, 2, 28], dtype=float)
+BAR_AS = np.array([0.79, 0.79, 0.31, 0.31, 0.79, 0.2])
+
+FY = 60000.0
+ES = 29e6
+FCD = 4250.0
+N = 1.75
+EU = 0.0035
+EC2 = 0.002
+
+ANGLES = np.radians([0, 35, 90, 160, 200, 270, 330])
+RATIOS = np.array([0.05, 0.2, 0.45, 0.8, 1.3, 2.5])
+
+
+def _section():
+    return ConcreteSectionPolygon([0, 20, 20, 0], [0, 0, 30, 30], None)
+
+
+def _surface(**kwargs):
+    return interaction_surface(_section(), BAR_X, BAR_Y, BAR_AS, FY, ES, FCD, N, EU, EC2,
+                               angles=ANGLES, depth_ratios=RATIOS, **kwargs)
+
+
+@pytest.mark.parametrize('max_workers, chunksize', [(2, None), (3, 1), (4, 5)])
+def test_process_pool_matches_serial(max_workers, chunksize):
+    serial = _surface()
+    pooled = _surface(max_workers=max_workers, chunksize=chunksize)
+
+    for s, p in zip(serial, pooled):
+        assert s.shape == (ANGLES.shape[0], RATIOS.shape[0])
+        assert np.array_equal(s, p)
+
+
+def test_surface_matches_rotated_section_and_per_bar_sums():
+    section = _section()
+    xo = section.cx
+    yo = section.cy
+
+    P, Mx, My, c = _surface()
+
+    for i, angle in enumerate(ANGLES):
+        # the section itself rotated, moments about (xo,yo) in the rotated axes
+        x_tr, y_tr = section.transformed_vertices_radians(xo, yo, angle)
+        segments = np.stack((np.stack((x_tr[:-1], y_tr[:-1]), axis=-1),
+                             np.stack((x_tr[1:], y_tr[1:]), axis=-1)), axis=1)
+
+        depths = RATIOS*(y_tr.max() - y_tr.min())
+        assert np.allclose(c[i], depths, rtol=1e-12)
+
+        concrete = ec2_stress_block_batch(segments, FCD, N, EU, EC2, depths)
+
+        cos = math.cos(angle)
+        sin = math.sin(angle)
+
+        for j, d in enumerate(depths):
+            p, mv, mu = concrete[j]
+
+            # back to the section axes
+            mx = (mu*sin) + (mv*cos)
+            my = (mu*cos) - (mv*sin)
+
+            for x, y, As in zip(BAR_X, BAR_Y, BAR_AS):
+                v = ((y - yo)*cos) - ((x - xo)*sin)
+                e = ss.strain_at_depth(EU, d, y_tr.max() - v)
+                f = As*ss.stress_strain_steel(FY, FY/ES, ES, e)
+
+                p += f
+                mx += f*(y - yo)
+                my += f*(x - xo)
+
+            scale = abs(P[i]).max()
+
+            assert P[i,j] == pytest.approx(p, rel=1e-9, abs=1e-12*scale)
+            assert Mx[i,j] == pytest.approx(mx, rel=1e-9, abs=1e-12*scale)
+            assert My[i,j] == pytest.approx(my, rel=1e-9, abs=1e-12*scale)
+
+
+def test_rebar_layout_input_matches_bar_arrays():
+    layout = RebarLayout(BAR_X, BAR_Y, BAR_AS, FY, ES)
+
+    arrays = _surface()
+    from_layout = interaction_surface(_section(), layout, None, None, None, None, FCD, N, EU, EC2,
+                                      angles=ANGLES, depth_ratios=RATIOS)
+
+    for a, b in zip(arrays, from_layout):
+        assert np.array_equal(a, b)
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+
+from concretexsection.stress_strain import stress_strain as ss
+from concretexsection.stress_strain import stress_strain_array as sa
+from concretexsection.stress_strain.material_curves import (CollinsCurve, DesayiKrishnanCurve,
+                                                             EC2ParabolicCurve, PCAParabolicCurve,
+                                                             SteelCurve, WhitneyCurve, material_curve)
+
+STRAINS = np.concatenate((np.linspace(-0.005, 0.006, 1001), [0, 0.002, 0.003, 0.0035],
+                          np.random.default_rng(15).uniform(-0.001, 0.004, 3000)))
+
+EC = 57000*math.sqrt(5000)
+
+# curve, scalar function, and array function with the same parameters
+CASES = [
+    (EC2ParabolicCurve(4250, 0.002, 0.0035, 2),
+     lambda e: ss.stress_strain_ec2(4250, 0.002, 0.0035, 2, e),
+     lambda e: sa.stress_strain_ec2_array(4250, 0.002, 0.0035, 2, e)),
+    (EC2ParabolicCurve(6800, 0.0022, 0.0031, 1.75),
+     lambda e: ss.stress_strain_ec2(6800, 0.0022, 0.0031, 1.75, e),
+     lambda e: sa.stress_strain_ec2_array(6800, 0.0022, 0.0031, 1.75, e)),
+    (PCAParabolicCurve(5000, 0.003, EC),
+     lambda e: ss.stress_strain_pca(5000, 0.003, EC, e),
+     lambda e: sa.stress_strain_pca_array(5000, 0.003, EC, e)),
+    (DesayiKrishnanCurve(5000, 0.003, 0.85),
+     lambda e: ss.stress_strain_desayi_krishnan(5000, 0.003, 0.85, e),
+     lambda e: sa.stress_strain_desayi_krishnan_array(5000, 0.003, 0.85, e)),
+    (CollinsCurve(9000, 0.003),
+     lambda e: ss.stress_strain_collins_et_all(9000, 0.003, e),
+     lambda e: sa.stress_strain_collins_et_all_array(9000, 0.003, e)),
+    (WhitneyCurve(6000, 0.003),
+     lambda e: ss.stress_strain_whitney(6000, 0.003, e)[0],
+     lambda e: sa.stress_strain_whitney_array(6000, 0.003, e)[0]),
+    (SteelCurve(60000, 60000/29e6, 29e6),
+     lambda e: ss.stress_strain_steel(60000, 60000/29e6, 29e6, e),
+     lambda e: sa.stress_strain_steel_array(60000, 60000/29e6, 29e6, e)),
+    (SteelCurve(60000, 0.002, 0),
+     lambda e: ss.stress_strain_steel(60000, 0.002, 0, e),
+     lambda e: sa.stress_strain_steel_array(60000, 0.002, 0, e)),
+]
+
+
+@pytest.mark.parametrize('curve, scalar, array', CASES,
+                         ids=['ec2', 'ec2 n=1.75', 'pca', 'desayi', 'collins', 'whitney', 'steel', 'steel Es=0'])
+def test_curves_match_the_stress_strain_functions(curve, scalar, array):
+    strains = STRAINS
+
+    if isinstance(curve, SteelCurve):
+        # the scalar steel function divides by |strain|
+        strains = strains[strains != 0]
+
+    expected = [scalar(float(e)) for e in strains]
+
+    assert [curve.stress(float(e)) for e in strains] == expected
+    assert np.array_equal(curve.stress_array(strains), expected)
+    assert np.array_equal(curve.stress_array(strains), array(strains))
+
+    grid = strains[:1000].reshape(20, 50)
+    assert np.array_equal(curve.stress_array(grid), array(grid))
+
+
+def test_precomputed_constants():
+    assert WhitneyCurve(6000, 0.003).beta1 == ss.stress_strain_whitney(6000, 0.003, 0)[1]
+
+    collins = CollinsCurve(9000, 0.003)
+    assert collins.nk == collins.n*collins.k
+
+    pca = PCAParabolicCurve(5000, 0.003, EC)
+    assert pca.stress(pca.eo) == pca.peak == 0.85*5000
+
+
+def test_material_curve_cache():
+    a = material_curve('desayi_krishnan', 5000, 0.003, 0.85)
+
+    assert isinstance(a, DesayiKrishnanCurve)
+    assert material_curve('desayi_krishnan', 5000, 0.003, 0.85) is a
+    assert material_curve('desayi_krishnan', 5000, 0.003, 0.9) is not a
+
+    with pytest.raises(ValueError):
+        material_curve('hognestad', 5000, 0.003)
@@ -0,0 +1,154 @@
+import math
+
+import numpy as np
+import pytest
+
+from concretexsection.stress_strain import stress_strain as ss
+from concretexsection.stress_strain.neutral_axis import (ec2_axial_load, neutral_axis_depth,
+                                                         pca_axial_load, rebar_axial_load,
+                                                         whitney_axial_load)
+from concretexsection.stress_strain.p_m_by_segment import ec2_stress_block_batch, pca_stress_block_batch
+
+# a T shape, the width at the cut jumps at the flange so the Whitney
+# derivative is checked on both sides of it
+SEGMENTS = np.array([[[0, 0], [12, 0]], [[12, 0], [12, 16]], [[12, 16], [84, 16]], [[84, 16], [84, 24]],
+                     [[84, 24], [-16, 24]], [[-16, 24], [-16, 16]], [[-16, 16], [0, 16]], [[0, 16], [0, 0]]],
+                    dtype=float)
+
+Y_MAX = 24.0
+
+FCD = 4250.0
+EU = 0.0035
+EC2 = 0.002
+
+FC = 5000.0
+EC = 57000*math.sqrt(5000)
+
+BAR_Y = np.array([2.0, 2.0, 2.0, 21.0, 21.0])
+BAR_AS = np.array([0.79, 0.79, 0.79, 0.44, 0.44])
+FY = 60000.0
+ES = 29e6
+
+DEPTHS = np.array([0.5, 3.0, 6.5, 11.0, 20.0, 27.0, 40.0])
+
+
+def _central_difference(f, c, h=1e-6):
+    return (f(c + h) - f(c - h))/(2*h)
+
+
+@pytest.mark.parametrize('n', [2, 1.75, 1.4])
+def test_ec2_axial_load_matches_stress_block(n):
+    P, dPdc = ec2_axial_load(SEGMENTS, FCD, n, EU, EC2, DEPTHS)
+
+    assert np.allclose(P, ec2_stress_block_batch(SEGMENTS, FCD, n, EU, EC2, DEPTHS)[:,0], rtol=1e-12)
+
+    fd = _central_difference(lambda c: ec2_axial_load(SEGMENTS, FCD, n, EU, EC2, c)[0], DEPTHS)
+    assert np.allclose(dPdc, fd, rtol=1e-6)
+
+
+def test_pca_axial_load_matches_stress_block():
+    P, dPdc = pca_axial_load(SEGMENTS, FC, 0.003, EC, DEPTHS)
+
+    assert np.allclose(P, pca_stress_block_batch(SEGMENTS, FC, 0.003, EC, DEPTHS)[:,0], rtol=1e-12)
+
+    fd = _central_difference(lambda c: pca_axial_load(SEGMENTS, FC, 0.003, EC, c)[0], DEPTHS)
+    assert np.allclose(dPdc, fd, rtol=1e-6)
+
+
+def test_whitney_axial_load():
+    beta1 = ss.stress_strain_whitney(FC, 0.003, 0)[1]
+
+    # depths with the cut in the flange and in the stem
+    c = np.array([4.0, 8.0, 20.0, 26.0])
+    a = beta1*c
+
+    area = np.where(a <= 8, 100*a, 800 + 12*(a - 8))
+    width = np.where(a < 8, 100, 12)
+
+    P, dPdc = whitney_axial_load(SEGMENTS, FC, 0.003, c)
+
+    assert np.allclose(P, 0.85*FC*area, rtol=1e-12)
+    assert np.allclose(dPdc, 0.85*FC*beta1*width, rtol=1e-12)
+
+
+def test_rebar_axial_load_matches_per_bar_sums():
+    P, dPdc = rebar_axial_load(BAR_Y, BAR_AS, FY, ES, EU, DEPTHS, Y_MAX)
+
+    for c, p in zip(DEPTHS, P):
+        expected = sum(As*ss.stress_strain_steel(FY, FY/ES, ES, ss.strain_at_depth(EU, c, Y_MAX - y))
+                       for y, As in zip(BAR_Y, BAR_AS))
+        assert p == pytest.approx(expected, rel=1e-12)
+
+    fd = _central_difference(lambda c: rebar_axial_load(BAR_Y, BAR_AS, FY, ES, EU, c, Y_MAX)[0], DEPTHS)
+    assert np.allclose(dPdc, fd, rtol=1e-6, atol=1e-6)
+
+
+def _axial_load(counter=None):
+    def axial_load(c):
+        if counter is not None:
+            counter.append(c)
+
+        P1, d1 = ec2_axial_load(SEGMENTS, FCD, 1.75, EU, EC2, c)
+        P2, d2 = rebar_axial_load(BAR_Y, BAR_AS, FY, ES, EU, c, Y_MAX)
+
+        return P1 + P2, d1 + d2
+
+    return axial_load
+
+
+def _brute_force_depth(P_target, c_min, c_max):
+    # plain bisection to the limit of double precision
+    axial_load = _axial_load()
+    lo, hi = c_min, c_max
+
+    for i in range(200):
+        mid = 0.5*(lo + hi)
+
+        if mid in (lo, hi):
+            break
+
+        if float(axial_load(mid)[0]) < P_target:
+            lo = mid
+        else:
+            hi = mid
+
+    return 0.5*(lo + hi)
+
+
+TARGETS = [-120000.0, 0.0, 250000.0, 1.5e6, 4e6]
+
+
+@pytest.mark.parametrize('P_target', TARGETS)
+def test_depth_matches_brute_force_root(P_target):
+    c = neutral_axis_depth(_axial_load(), P_target, 0.01, 200.0)
+
+    assert c == pytest.approx(_brute_force_depth(P_target, 0.01, 200.0), abs=1e-8)
+    assert float(_axial_load()(c)[0]) == pytest.approx(P_target, abs=1e-3)
+
+
+def test_warm_start_converges_to_the_same_root_in_fewer_evaluations():
+    previous = neutral_axis_depth(_axial_load(), 250000.0, 0.01, 200.0)
+
+    cold = []
+    warm = []
+
+    c_cold = neutral_axis_depth(_axial_load(cold), 260000.0, 0.01, 200.0)
+    c_warm = neutral_axis_depth(_axial_load(warm), 260000.0, 0.01, 200.0, c0=previous)
+
+    assert c_warm == pytest.approx(c_cold, abs=1e-8)
+    assert c_warm == pytest.approx(_brute_force_depth(260000.0, 0.01, 200.0), abs=1e-8)
+    assert len(warm) < len(cold)
+
+
+def test_targets_outside_the_bracket_raise():
+    P_max = float(_axial_load()(200.0)[0])
+    P_min = float(_axial_load()(0.01)[0])
+
+    with pytest.raises(ValueError):
+        neutral_axis_depth(_axial_load(), 1.01*P_max, 0.01, 200.0)
+
+    with pytest.raises(ValueError):
+        neutral_axis_depth(_axial_load(), P_min - 1000, 0.01, 200.0)
+
+    with pytest.raises(ValueError):
+        neutral_axis_depth(_axial_load(), 0.0, 0.0, 200.0)
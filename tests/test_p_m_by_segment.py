@@ -0,0 +1,410 @@
+import math
+
+import numpy as np
+import pytest
+
+from concretexsection.stress_strain.p_m_by_segment import (
+    _clip_segments, constant_stress_block, constant_stress_block_array, ec2_parabolic_stress_block,
+    ec2_parabolic_stress_block_array, ec2_stress_block_batch, linear_stress_block,
+    linear_stress_block_array, pca_parabolic_stress_block, pca_parabolic_stress_block_array,
+    pca_stress_block_batch)
+
+# a T shape with horizontal edges, edges that cross the neutral axis and
+# edges entirely above or below it for mid range depths
+SEGMENTS = np.array([[[0, 0], [12, 0]], [[12, 0], [12, 16]], [[12, 16], [84, 16]], [[84, 16], [84, 24]],
+                     [[84, 24], [-16, 24]], [[-16, 24], [-16, 16]], [[-16, 16], [0, 16]], [[0, 16], [0, 0]]],
+                    dtype=float)
+
+FCD = 4250.0
+EU = 0.0035
+EC2 = 0.002
+
+FC = 5000.0
+EC = 57000*math.sqrt(5000)
+
+_T, _W = np.polynomial.legendre.leggauss(64)
+
+
+def _numeric(segments, stress, cuts=()):
+    '''
+    P, Mx, My of a stress that only varies in y by Gauss-Legendre
+    quadrature of the Green's theorem line integrals, each segment is
+    split where it crosses the y cuts so the pieces are smooth
+    '''
+    out = np.zeros(3)
+
+    for (x1, y1), (x2, y2) in np.asarray(segments, dtype=float):
+        if y1 == y2:
+            continue
+
+        ts = sorted(set([0.0, 1.0] + [(yc - y1)/(y2 - y1) for yc in cuts if 0 < (yc - y1)/(y2 - y1) < 1]))
+
+        for a, b in zip(ts[:-1], ts[1:]):
+            t = a + (b - a)*(_T + 1)*0.5
+            w = (b - a)*0.5*_W*(y2 - y1)
+
+            x = x1 + t*(x2 - x1)
+            y = y1 + t*(y2 - y1)
+            s = stress(y)
+
+            out += [np.dot(w, x*s), np.dot(w, x*y*s), np.dot(w, 0.5*x*x*s)]
+
+    return out
+
+
+def _ec2_stress(n, c, yna):
+    def stress(y):
+        e = EU*(y - yna)/c
+        return np.where(e <= 0, 0.0, np.where(e <= EC2, FCD*(1 - np.power(np.maximum(1 - e/EC2, 0), n)), FCD))
+    return stress
+
+
+def _pca_stress(c, yna):
+    eo = (2*0.85*FC)/EC
+    def stress(y):
+        e = EU*(y - yna)/c
+        return np.where(e <= 0, 0.0, np.where(e <= eo, 0.85*FC*((2*e/eo) - (e/eo)**2), 0.85*FC))
+    return stress
+
+
+def _parabolic_band(segments, c, strain):
+    '''
+    the segments clipped to the parabolic band of a depth c and the
+    neutral axis elevation, horizontal pieces dropped
+    '''
+    s = np.asarray(segments, dtype=float)
+    y_max = s[:,:,1].max()
+    yna = y_max - c
+
+    x1, y1, x2, y2 = _clip_segments(s[:,0,0], s[:,0,1], s[:,1,0], s[:,1,1], yna, yna + c*(strain/EU))
+    keep = y1 != y2
+
+    band = np.stack((np.column_stack((x1[keep], y1[keep])), np.column_stack((x2[keep], y2[keep]))), axis=1)
+
+    return band, yna
+
+
+def _baseline_ec2(segments, fcd, n, eu, ec2, c, yna):
+    '''
+    the original per segment loop of ec2_parabolic_stress_block,
+    see backup_material/ec2_stress_block_benchmark.py
+    '''
+    P = 0
+    Mx = 0
+    My = 0
+    x = 0
+    y = 0
+    details = []
+
+
+    F = fcd     # Fcd
+    K = eu/ec2  # eu/ec2
+    N = n       # n from table 3.1
+    C = c       # NA Depth = Y,max - Y,na
+    Y = yna     # Y,na = actual Y-coordinate of neutral Axis
+
+
+    for s in segments:
+        A = s[0][0] # X1
+        B = s[1][0] # X2
+        D = s[0][1] # Y1 = Y,na or Y,ec2
+        E = s[1][1] # Y2 = Y coordinate that corresponds to ec2 or Y,na
+
+
+        axial = []
+        for t in range(0,2):
+
+            Pintegral = ((-1*D + E)*
+                    F*(
+                        A*t + (((-1*A + B)*t*t)*0.5)
+                        - (
+                            (C + K*(D*(-1 + t) - E*t + Y))
+                            *(math.pow((1 + (K*(D*(-1 + t) - E*t + Y))/C),N))
+                            *(
+                                A*(C + K*(-1*(D*(1 + N)*(-1 + t)) + E*(-2 + N*(-1 + t) + t) + Y))
+                                - B*(C + K*(E*(1 + N)*t - D*(1 + t + N*t) + Y))
+                            )
+                        )
+                        /((D - E)*(D-E)*K*K*(1 + N)*(2 + N))
+                    )
+                    )
+
+            axial.append(Pintegral)
+
+        P += (axial[1]-axial[0])
+
+        momenty = []
+
+        for t in range(0,2):
+
+            if A==B:
+                My_integral = (
+                                (
+                                    A*A*(D - E)*F
+                                    * (
+                                        -1*t
+                                        + (
+                                            (C + K*(D*(-1 + t) - E*t + Y))
+                                            * math.pow((1 + (K*(D*(-1 + t) - E*t + Y))/C),N)
+                                            )
+                                            /((D - E)*K*(1 + N))
+                                        )
+                                    )/2.0)
+            else:
+                My_integral = (
+                                -1*(
+                                    (D - E)*F
+                                    * (
+                                        math.pow((A*(-1 + t) - B*t),3)
+                                        - (
+                                            3*math.pow((1 + (K*(D*(-1 + t) - E*t + Y))/C),N)
+                                            * (
+                                                math.pow((D - E),3)
+                                                * K*K*K*(1 + N)*(2 + N)
+                                                * math.pow((A*(-1 + t) - B*t),3)
+                                                - math.pow((D - E),2)
+                                                * K*K*N*(1 + N)
+                                                * math.pow((A*(-1 + t) - B*t),2)
+                                                * (B*(C + K*(-D + Y)) - A*(C + K*(-E + Y)))
+                                                - 2*(D - E)*K*N*(A*(-1 + t) - B*t)
+                                                * math.pow((B*(C + K*(-D + Y)) - A*(C + K*(-E + Y))),2)
+                                                - 2
+                                                * math.pow((B*(C + K*(-D + Y)) - A*(C + K*(-E + Y))),3)
+                                                )
+                                            )
+                                            / (
+                                                math.pow((D - E),3)*K*K*K*(1 + N)*(2 + N)*(3 + N)
+                                                )
+                                        )
+                                    )
+                                    / (6.0*(A - B))
+                                )
+
+            momenty.append(My_integral)
+
+        My  += (momenty[1]-momenty[0])
+
+        momentx = []
+
+        for t in range(0,2):
+
+            Mx_integral = (
+                            (-1.0*D + E)
+                            * F
+                            * (
+                                A*D*t
+                                + (((B*D + A*(-2.0*D + E))*t*t)*0.5)
+                                + (((A - B)*(D - E)*t*t*t)/3.0)
+                                - (
+                                    math.pow((1 + (K*(D*(-1 + t) - E*t + Y))/C),N)
+                                    * (
+                                        (A - B)
+                                        * math.pow((D - E),3)
+                                        * math.pow(K,3)*(1 + N)*(2 + N)*t*t*t
+                                        + math.pow((D - E),2)*K*K*(1 + N)*t*t
+                                        * (
+                                            -3.0*A*D*K*(2 + N)
+                                            + A*E*K*(3 + N)
+                                            + B*D*K*(3 + 2*N)
+                                            + A*N*(C + K*Y)
+                                            - B*N*(C + K*Y)
+                                            )
+                                        - (C + K*(-D + Y))
+                                        * (
+                                            B*(C + K*(-D + Y))
+                                            * (2*C + K*(D + D*N + 2*Y))
+                                            - A
+                                            * (
+                                                2*C*C
+                                                + C*K*(2*D*(1 + N) - E*(3 + N) + 4*Y)
+                                                + K*K*(
+                                                        D*D*(2 + 3*N + N*N)
+                                                        - D*(1 + N)*(E*(3 + N) - 2*Y)
+                                                        + Y*(-(E*(3 + N)) + 2*Y)
+                                                        )
+                                                )
+                                            )
+                                        + (D - E)*K*t
+                                        * (
+                                            B*N*(C + K*(-D + Y))*(2*C + K*(D + D*N + 2*Y))
+                                            + A
+                                            * (
+                                                3*D*D*K*K*(2 + 3*N + N*N)
+                                                + N*(-2*C + E*K*(3 + N) - 2*K*Y)
+                                                * (C + K*Y)
+                                                - 2*D*K*(1 + N)*(E*K*(3 + N) + N*(C + K*Y))
+                                                )
+                                            )
+                                        )
+                                    )
+                                    / (math.pow((D - E),2)*K*K*K*(1 + N)*(2 + N)*(3 + N))
+                                )
+                            )
+
+            momentx.append(Mx_integral)
+
+        Mx += (momentx[1]-momentx[0])
+
+        details.append([(axial[1]-axial[0]),(momentx[1]-momentx[0]),(momenty[1]-momenty[0])])
+
+    return P,Mx,My,details
+
+
+def _close(a, b, scale, rtol):
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    return np.all(np.abs(a - b) <= rtol*scale)
+
+
+def _scale(ref):
+    # moments are compared relative to P times the section size
+    return np.array([abs(ref[0]), abs(ref[0])*100, abs(ref[0])*100])
+
+
+def test_constant_block_matches_numeric():
+    P, Mx, My, details = constant_stress_block_array(SEGMENTS, FCD)
+    ref = _numeric(SEGMENTS, lambda y: np.full_like(y, FCD))
+
+    assert np.allclose([P, Mx, My], ref, rtol=1e-12)
+    assert np.allclose(details.sum(axis=0), [P, Mx, My], rtol=1e-12)
+
+    # the horizontal edges contribute 0
+    assert np.all(details[SEGMENTS[:,0,1] == SEGMENTS[:,1,1]] == 0)
+
+
+def test_linear_block_matches_numeric():
+    segments = [[[10, 6.5], [10, 15]], [[10, 15], [-10, 15]], [[-10, 15], [-10, 6.5]]]
+
+    P, Mx, My, details = linear_stress_block_array(segments, 0, 6.5, 1000, 15)
+    ref = _numeric(segments, lambda y: 1000*(y - 6.5)/(15 - 6.5))
+
+    assert np.allclose([P, Mx, My], ref, rtol=1e-12, atol=1e-6)
+
+
+@pytest.mark.parametrize('n', [2, 3, 1.75, 1.4])
+@pytest.mark.parametrize('c', [2.0, 10.0, 19.0, 30.0])
+def test_ec2_parabolic_block_matches_baseline_and_numeric(n, c):
+    band, yna = _parabolic_band(SEGMENTS, c, EC2*(1 - 1e-12))
+
+    P, Mx, My, details = ec2_parabolic_stress_block_array(band, FCD, n, EU, EC2, c, yna)
+
+    base = _baseline_ec2(band.tolist(), FCD, n, EU, EC2, c, yna)
+    ref = _numeric(band, _ec2_stress(n, c, yna))
+
+    # integer n takes the Bernstein closed form, non-integer n the
+    # shared term form of the baseline antiderivatives
+    assert _close([P, Mx, My], base[:3], _scale(base), 1e-12)
+    assert np.allclose(details, base[3], rtol=1e-10, atol=1e-12*abs(base[0])*100)
+
+    assert _close([P, Mx, My], ref, _scale(ref), 1e-9)
+
+
+@pytest.mark.parametrize('n', [2, 1.75])
+def test_ec2_horizontal_edges_contribute_zero(n):
+    segments = [[[10, 5], [10, 6.5]], [[10, 6.5], [-10, 6.5]], [[-10, 6.5], [-10, 5]], [[-10, 5], [10, 5]]]
+
+    P, Mx, My, details = ec2_parabolic_stress_block_array(segments, FCD, n, EU, EC2, 10, 5)
+
+    assert np.all(np.isfinite(details))
+    assert np.all(details[[1, 3]] == 0)
+
+    base = _baseline_ec2(segments[::2], FCD, n, EU, EC2, 10, 5)
+    assert _close([P, Mx, My], base[:3], _scale(base), 1e-12)
+
+
+def test_pca_parabolic_block_matches_numeric():
+    c = 10.0
+    band, yna = _parabolic_band(SEGMENTS, c, (2*0.85*FC)/EC)
+
+    P, Mx, My, details = pca_parabolic_stress_block_array(band, FC, EU, EC, c, yna)
+    ref = _numeric(band, _pca_stress(c, yna))
+
+    assert _close([P, Mx, My], ref, _scale(ref), 1e-10)
+
+
+@pytest.mark.parametrize('n', [2, 1.75])
+def test_totals_only_mode(n):
+    band, yna = _parabolic_band(SEGMENTS, 10.0, EC2)
+
+    calls = [(constant_stress_block, constant_stress_block_array, (SEGMENTS, FCD)),
+             (ec2_parabolic_stress_block, ec2_parabolic_stress_block_array, (band, FCD, n, EU, EC2, 10.0, yna)),
+             (pca_parabolic_stress_block, pca_parabolic_stress_block_array, (band, FC, EU, EC, 10.0, yna)),
+             (linear_stress_block, linear_stress_block_array,
+                ([[[10, 6.5], [10, 15]], [[-10, 15], [-10, 6.5]]], 0, 6.5, 1000, 15))]
+
+    for scalar, array, args in calls:
+        full = array(*args)
+        totals = array(*args, details=False)
+
+        assert totals[3] is None
+        assert np.allclose(totals[:3], full[:3], rtol=1e-12)
+
+        P, Mx, My, centroid, details = scalar(*args)
+        assert details.shape == (len(args[0]), 3)
+        assert np.allclose([P, Mx, My], full[:3], rtol=1e-12)
+        assert np.allclose(centroid, [My/P, Mx/P])
+
+        assert scalar(*args, details=False)[4] is None
+
+
+@pytest.mark.parametrize('n', [2, 1.75])
+def test_ec2_batch_matches_numeric(n):
+    # depths with the neutral axis below, within, and above the flange
+    # and with the whole section in compression
+    c = np.array([0.5, 4.0, 8.0, 12.0, 20.0, 30.0, 60.0])
+
+    results = ec2_stress_block_batch(SEGMENTS, FCD, n, EU, EC2, c)
+
+    for row, ci in zip(results, c):
+        yna = 24 - ci
+        ref = _numeric(SEGMENTS, _ec2_stress(n, ci, yna), cuts=(yna, yna + ci*(EC2/EU)))
+
+        assert _close(row, ref, _scale(ref), 1e-9)
+
+
+def test_pca_batch_matches_numeric():
+    c = np.array([0.5, 4.0, 12.0, 30.0, 60.0])
+    eo = (2*0.85*FC)/EC
+
+    results = pca_stress_block_batch(SEGMENTS, FC, EU, EC, c)
+
+    for row, ci in zip(results, c):
+        yna = 24 - ci
+        ref = _numeric(SEGMENTS, _pca_stress(ci, yna), cuts=(yna, yna + ci*(eo/EU)))
+
+        assert _close(row, ref, _scale(ref), 1e-9)
+
+
+@pytest.mark.parametrize('batch, args', [(ec2_stress_block_batch, (FCD, 2, EU, EC2)),
+                                         (ec2_stress_block_batch, (FCD, 1.75, EU, EC2)),
+                                         (pca_stress_block_batch, (FC, EU, EC))])
+def test_batch_depths_at_or_below_zero(batch, args):
+    with np.errstate(all='raise'):
+        results = batch(SEGMENTS, *(args + ([0.0, -3.0, 10.0],)))
+
+    assert np.array_equal(results[:2], np.zeros((2, 3)))
+    assert np.array_equal(results[2], batch(SEGMENTS, *(args + (10.0,)))[0])
+
+
+def test_batch_angle_matches_rotated_segments():
+    angle = 0.7
+    xo, yo = 30.0, 12.0
+
+    cos = math.cos(angle)
+    sin = math.sin(angle)
+
+    dx = SEGMENTS[...,0] - xo
+    dy = SEGMENTS[...,1] - yo
+    rotated = np.stack(((dx*cos) + (dy*sin), (dy*cos) - (dx*sin)), axis=-1)
+
+    c = np.array([5.0, 15.0, 40.0])
+
+    ref = ec2_stress_block_batch(rotated, FCD, 2, EU, EC2, c)
+
+    # moments back in the section axes
+    Mx = (ref[:,2]*sin) + (ref[:,1]*cos)
+    My = (ref[:,2]*cos) - (ref[:,1]*sin)
+
+    got = ec2_stress_block_batch(SEGMENTS, FCD, 2, EU, EC2, c, angle=angle, xo=xo, yo=yo)
+
+    assert np.allclose(got, np.column_stack((ref[:,0], Mx, My)), rtol=1e-10)
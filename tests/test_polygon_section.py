@@ -0,0 +1,166 @@
+import math
+
+import numpy as np
+import pytest
+
+from concretexsection.geometry.CompositeSection import CompositeSection
+from concretexsection.geometry.ConcreteSectionPolygon import ConcreteSectionPolygon
+from concretexsection.geometry.SteelSectionPolygon import SteelSectionPolygon
+from concretexsection.geometry.VoidSectionPolygon import VoidSectionPolygon
+
+
+def _baseline_props(x, y):
+    # the list comprehension calc_props of the original ConcreteSectionPolygon
+    r = range(len(x[:-1]))
+    p = {}
+
+    p['area'] = sum([(x[i]*y[i+1])-(x[i+1]*y[i]) for i in r])/2.0
+    p['cx'] = sum([(x[i]+x[i+1])*((x[i]*y[i+1])-(x[i+1]*y[i])) for i in r])/(6*p['area'])
+    p['cy'] = sum([(y[i]+y[i+1])*((x[i]*y[i+1])-(x[i+1]*y[i])) for i in r])/(6*p['area'])
+    p['Ix'] = sum([((y[i]*y[i])+(y[i]*y[i+1])+(y[i+1]*y[i+1]))*((x[i]*y[i+1])-(x[i+1]*y[i])) for i in r])/(12.0)
+    p['Iy'] = sum([((x[i]*x[i])+(x[i]*x[i+1])+(x[i+1]*x[i+1]))*((x[i]*y[i+1])-(x[i+1]*y[i])) for i in r])/(12.0)
+    p['Ixy'] = sum([((x[i]*y[i+1])+(2*x[i]*y[i])+(2*x[i+1]*y[i+1])+(x[i+1]*y[i]))*(x[i]*y[i+1]-x[i+1]*y[i]) for i in r])/(24.0)
+    p['Jz'] = p['Ix'] + p['Iy']
+    p['sx_top'] = p['Ix'] / abs(max(y) - p['cy'])
+    p['sx_bottom'] = p['Ix'] / abs(min(y) - p['cy'])
+    p['sy_right'] = p['Iy'] / abs(max(x) - p['cx'])
+    p['sy_left'] = p['Iy'] / abs(min(x) - p['cx'])
+    p['rx'] = math.sqrt(p['Ix']/p['area'])
+    p['ry'] = math.sqrt(p['Iy']/p['area'])
+    p['rz'] = math.sqrt(p['Jz']/p['area'])
+
+    p['Ixx'] = p['Ix'] - (p['area']*p['cy']*p['cy'])
+    p['Iyy'] = p['Iy'] - (p['area']*p['cx']*p['cx'])
+    p['Ixxyy'] = p['Ixy'] - (p['area']*p['cx']*p['cy'])
+    p['Jzz'] = p['Ixx'] + p['Iyy']
+    p['sxx_top'] = p['Ixx'] / abs(max(y) - p['cy'])
+    p['sxx_bottom'] = p['Ixx'] / abs(min(y) - p['cy'])
+    p['syy_right'] = p['Iyy'] / abs(max(x) - p['cx'])
+    p['syy_left'] = p['Iyy'] / abs(min(x) - p['cx'])
+    p['rxx'] = math.sqrt(p['Ixx']/p['area'])
+    p['ryy'] = math.sqrt(p['Iyy']/p['area'])
+    p['rzz'] = math.sqrt(p['Jzz']/p['area'])
+
+    two_theta = math.atan((-1.0*2.0*p['Ixxyy'])/(1E-16+(p['Ixx'] - p['Iyy'])))
+    temp = (p['Ixx']+p['Iyy'])/2.0
+    temp2 = (p['Ixx']-p['Iyy'])/2.0
+    I1 = temp + math.sqrt((temp2*temp2)+(p['Ixxyy']*p['Ixxyy']))
+    I2 = temp - math.sqrt((temp2*temp2)+(p['Ixxyy']*p['Ixxyy']))
+
+    p['Iuu'] = temp + temp2*math.cos(two_theta) - p['Ixxyy']*math.sin(two_theta)
+    p['Ivv'] = temp - temp2*math.cos(two_theta) + p['Ixxyy']*math.sin(two_theta)
+    p['Iuuvv'] = temp2*math.sin(two_theta) + p['Ixxyy']*math.cos(two_theta)
+
+    if I1-0.000001 <= p['Iuu'] <= I1+0.000001:
+        p['theta1'] = math.degrees(two_theta/2.0)
+        p['theta2'] = p['theta1'] + 90.0
+    elif I2-0.000001 <= p['Iuu'] <= I2+0.000001:
+        p['theta2'] = math.degrees(two_theta/2.0)
+        p['theta1'] = p['theta2'] - 90.0
+
+    return p
+
+
+SHAPES = {
+    'rectangle': ([0, 12, 12, 0, 0], [0, 0, 24, 24, 0]),
+    'clockwise L': ([0, 0, 4, 4, 16, 16, 0], [0, 20, 20, 4, 4, 0, 0]),
+    'offset pentagon': ([3.5, 17.25, 21, 9.75, -2.5, 3.5], [-4, -1.5, 11.25, 19, 7.5, -4]),
+}
+
+
+@pytest.mark.parametrize('name', sorted(SHAPES))
+def test_properties_match_baseline(name):
+    x, y = SHAPES[name]
+    section = ConcreteSectionPolygon(list(x), list(y), None)
+
+    # the baseline with the vertices as the section stored them, ie.
+    # after reordering a clockwise input
+    expected = _baseline_props(list(section.x), list(section.y))
+
+    for attribute, value in expected.items():
+        assert getattr(section, attribute) == pytest.approx(value, rel=1e-12, abs=1e-9), attribute
+
+    assert [v for v in section.log if v not in ('---', '--')] == pytest.approx(
+        [expected[a] for l, a in section._LOG if a not in ('---', '--')], rel=1e-12, abs=1e-9)
+
+
+def test_void_properties_match_baseline():
+    x, y = SHAPES['offset pentagon']
+    void = VoidSectionPolygon(list(x), list(y), None)
+
+    expected = _baseline_props(list(void.x), list(void.y))
+
+    assert void.area < 0
+    for attribute in ('area', 'cx', 'cy', 'Ix', 'Iy', 'Ixy', 'Ixx', 'Iyy', 'Ixxyy'):
+        assert getattr(void, attribute) == pytest.approx(expected[attribute], rel=1e-12), attribute
+
+
+def test_composite_matches_baseline_void_sums():
+    solid = ConcreteSectionPolygon([0, 30, 30, 0], [0, 0, 40, 40], None)
+    voids = [VoidSectionPolygon([4, 12, 12, 4], [5, 5, 15, 15], None),
+             VoidSectionPolygon([18, 26, 22], [20, 20, 34], None)]
+
+    section = CompositeSection(solid, voids)
+
+    parts = [_baseline_props(list(s.x), list(s.y)) for s in [solid] + voids]
+
+    area = sum(p['area'] for p in parts)
+
+    assert section.area == pytest.approx(area, rel=1e-12)
+    assert section.cx == pytest.approx(sum(p['area']*p['cx'] for p in parts)/area, rel=1e-12)
+    assert section.cy == pytest.approx(sum(p['area']*p['cy'] for p in parts)/area, rel=1e-12)
+
+    for attribute in ('Ix', 'Iy', 'Ixy'):
+        assert getattr(section, attribute) == pytest.approx(sum(p[attribute] for p in parts), rel=1e-12)
+
+
+def test_vertex_methods_return_arrays():
+    section = SteelSectionPolygon([0, 12, 12, 0], [0, 0, 24, 24], None)
+
+    results = [section.x, section.y, section.vertices]
+    results.extend(section.transformed_vertices_degrees(1, 2, 30))
+    results.extend(section.transformed_vertices_radians(1, 2, 0.5))
+    results.extend(section.translate_vertices(3, -4))
+    results.extend(section.calc_s_at_vertices())
+
+    for r in results:
+        assert isinstance(r, np.ndarray)
+        assert r.dtype == np.float64
+
+    with pytest.raises(ValueError):
+        section.x[0] = 1.0
+
+
+def test_translate_and_s_at_vertices_match_baseline():
+    x, y = SHAPES['offset pentagon']
+    section = ConcreteSectionPolygon(list(x), list(y), None)
+
+    x_t, y_t = section.translate_vertices(2.5, -1.25)
+
+    assert np.array_equal(x_t, [v+2.5 for v in section.x])
+    assert np.array_equal(y_t, [v-1.25 for v in section.y])
+
+    sx, sy = section.calc_s_at_vertices()
+
+    expected_sx = [section.Ixx / abs((v if v != 0 else 0.00000000000001) - section.cy) for v in section.y]
+    expected_sy = [section.Iyy / abs((v if v != 0 else 0.00000000000001) - section.cx) for v in section.x]
+
+    assert np.array_equal(sx, expected_sx)
+    assert np.array_equal(sy, expected_sy)
+
+
+def test_replacing_vertices_clears_the_cache():
+    section = ConcreteSectionPolygon([0, 12, 12, 0], [0, 0, 24, 24], None)
+    assert section.area == 288
+
+    section.translate_vertices(5, 5, commit=1)
+    assert section.area == 288
+    assert section.cx == pytest.approx(11)
+
+    section.x = section.x*2
+    assert section.area == 576
+    assert section.cx == pytest.approx(22)
+
+    section.set_vertices([0, 1, 1, 0, 0], [0, 0, 1, 1, 0])
+    assert section.area == 1
+    assert section.Ixx == pytest.approx(1/12)
@@ -0,0 +1,115 @@
+import math
+
+import numpy as np
+import pytest
+
+from concretexsection.geometry.RebarLayout import RebarLayout
+from concretexsection.geometry.SteelRebar import ASTM
+from concretexsection.material.reinforcement import ASTM_A615
+from concretexsection.stress_strain import stress_strain as ss
+
+# bars with their own areas, yield stresses and moduli
+X = np.array([2.0, 18.0, 2.0, 18.0, 10.0, 6.5])
+Y = np.array([2.0, 2.0, 28.0, 28.0, 15.0, 24.0])
+AS = np.array([0.79, 1.0, 0.31, 0.44, 0.6, 0.2])
+FY = np.array([60000.0, 75000.0, 60000.0, 40000.0, 60000.0, 80000.0])
+ES = np.array([29e6, 29e6, 29e6, 29e6, 28e6, 29e6])
+
+EU = 0.003
+XO = 10.0
+YO = 15.0
+
+DEPTHS = np.array([0.5, 4.0, 9.0, 17.5, 26.0, 45.0])
+
+
+def _per_bar(angle, c):
+    # one bar at a time with the scalar functions
+    cos = math.cos(angle)
+    sin = math.sin(angle)
+
+    v = [((y - YO)*cos) - ((x - XO)*sin) for x, y in zip(X, Y)]
+    y_max = max(v) + 2.0
+
+    P = Mx = My = 0.0
+    strains = []
+    stresses = []
+
+    for x, y, vi, As, fy, Es in zip(X, Y, v, AS, FY, ES):
+        e = ss.strain_at_depth(EU, c, y_max - vi)
+        f = ss.stress_strain_steel(fy, fy/Es, Es, e)
+
+        strains.append(e)
+        stresses.append(f)
+
+        P += As*f
+        Mx += As*f*(y - YO)
+        My += As*f*(x - XO)
+
+    return y_max, strains, stresses, [P, Mx, My]
+
+
+@pytest.mark.parametrize('angle', [0.0, 0.6, math.pi/2, 4.0])
+def test_forces_match_per_bar_sums(angle):
+    layout = RebarLayout(X, Y, AS, FY, ES)
+    y_max = _per_bar(angle, 1.0)[0]
+
+    strains = layout.strains(EU, DEPTHS, y_max, XO, YO, angle)
+    stresses = layout.stresses(EU, DEPTHS, y_max, XO, YO, angle)
+    forces = layout.forces(EU, DEPTHS, y_max, XO, YO, angle)
+
+    assert forces.shape == (DEPTHS.shape[0], 3)
+
+    for i, c in enumerate(DEPTHS):
+        y_max, e, f, resultant = _per_bar(angle, c)
+
+        assert np.allclose(strains[i], e, rtol=1e-12, atol=1e-15)
+        assert np.allclose(stresses[i], f, rtol=1e-12, atol=1e-6)
+        assert np.allclose(forces[i], resultant, rtol=1e-12, atol=1e-6)
+
+
+def test_axial_load_matches_forces_and_slope():
+    layout = RebarLayout(X, Y, AS, FY, ES)
+    angle = 0.6
+    y_max = _per_bar(angle, 1.0)[0]
+
+    P, dPdc = layout.axial_load(EU, DEPTHS, y_max, XO, YO, angle)
+
+    assert np.allclose(P, layout.forces(EU, DEPTHS, y_max, XO, YO, angle)[:,0], rtol=1e-12)
+
+    h = 1e-6
+    fd = (layout.axial_load(EU, DEPTHS + h, y_max, XO, YO, angle)[0] -
+          layout.axial_load(EU, DEPTHS - h, y_max, XO, YO, angle)[0])/(2*h)
+
+    assert np.allclose(dPdc, fd, rtol=1e-6, atol=1e-6)
+
+
+def test_constructors():
+    bar = ASTM(8, ASTM_A615())
+
+    row = RebarLayout.row(2, 2, 18, 2, 5, bar)
+    assert np.allclose(row.x, [2, 6, 10, 14, 18])
+    assert np.allclose(row.y, 2)
+    assert row.area == pytest.approx(5*0.79)
+    assert np.all(row.fy == 60000) and np.all(row.Es == 29e6)
+
+    ring = RebarLayout.circle(10, 10, 7, 8, bar, start_angle=math.pi/8)
+    assert np.allclose(np.hypot(ring.x - 10, ring.y - 10), 7)
+    assert np.allclose(np.arctan2(ring.y - 10, ring.x - 10)[0], math.pi/8)
+
+    # 16 bars 5 apart along the 80 long outline, measured around the corners
+    perimeter = RebarLayout.perimeter([2, 18, 18, 2], [2, 2, 26, 26], 16, bar)
+    assert len(perimeter) == 16
+    assert np.allclose(perimeter.x[:6], [2, 7, 12, 17, 18, 18])
+    assert np.allclose(perimeter.y[:6], [2, 2, 2, 2, 6, 11])
+    assert np.all(np.isin(perimeter.x, [2, 18]) | np.isin(perimeter.y, [2, 26]))
+
+    mixed = RebarLayout.from_bars([bar, ASTM(5, ASTM_A615())], [2, 18], [2, 2])
+    assert np.array_equal(mixed.As, [0.79, 0.31])
+
+    combined = RebarLayout.combine([row, mixed])
+    assert len(combined) == 7
+    assert np.array_equal(combined.x, np.concatenate((row.x, mixed.x)))
+    assert combined.area == pytest.approx(row.area + mixed.area)
+
+    with pytest.raises(ValueError):
+        combined.x[0] = 0.0
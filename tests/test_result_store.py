@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from concretexsection.storage.result_store import ResultStore
+
+
+def _result(seed):
+    a = np.random.default_rng(seed).random((4, 6, 5))
+    return dict(P=a[0], Mx=a[1], My=a[2], c=a[3])
+
+
+def test_results_round_trip(tmp_path):
+    with ResultStore(str(tmp_path), shape=(6, 5), block_size=4) as store:
+        for k in range(10):
+            store.put('k%d' % k, **_result(k))
+
+    store = ResultStore(str(tmp_path), mode='r')
+
+    assert len(store) == 10
+    assert np.array_equal(store.get('k7')['Mx'], _result(7)['Mx'])
+    assert store.get('missing') is None
+
+    many = store.get_many(['k9', 'k2'], fields=('c',))
+    assert np.array_equal(many['c'][0], _result(9)['c'])
+
+    store.close()
+
+
+@pytest.mark.parametrize('mode', ['a', 'r'])
+def test_get_returns_read_only_views(tmp_path, mode):
+    store = ResultStore(str(tmp_path), shape=(6, 5))
+    store.put('k', **_result(0))
+    store.close()
+
+    store = ResultStore(str(tmp_path), mode=mode)
+    result = store.get('k')
+
+    with pytest.raises(ValueError):
+        result['P'][0, 0] = -1.0
+
+    store.close()
+
+    with ResultStore(str(tmp_path), mode='r') as store:
+        assert np.array_equal(store.get('k')['P'], _result(0)['P'])
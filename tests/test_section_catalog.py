@@ -0,0 +1,125 @@
+import math
+
+import numpy as np
+import pytest
+
+from concretexsection.geometry.CompositeSection import CompositeSection
+from concretexsection.geometry.ConcreteSectionPolygon import ConcreteSectionPolygon
+from concretexsection.geometry.SectionCatalog import SectionCatalog
+from concretexsection.geometry.VoidSectionPolygon import VoidSectionPolygon
+from concretexsection.stress_strain.p_m_by_segment import ec2_stress_block_batch, pca_stress_block_batch
+
+FCD = 4250.0
+EU = 0.0035
+EC2 = 0.002
+
+FC = 5000.0
+EC = 57000*math.sqrt(5000)
+
+DEPTHS = np.array([-2.0, 0.0, 0.7, 3.0, 8.5, 14.0, 22.0, 35.0, 70.0])
+
+
+def _sections():
+    # rings of different lengths, a clockwise input, and sections with voids
+    return [ConcreteSectionPolygon([0, 12, 12, 0], [0, 0, 24, 24], None),
+            ConcreteSectionPolygon([0, 0, 4, 4, 16, 16], [0, 20, 20, 4, 4, 0], None),
+            CompositeSection(ConcreteSectionPolygon([-10, 20, 20, -10], [5, 5, 45, 45], None),
+                             [VoidSectionPolygon([-6, 2, 2, -6], [10, 10, 20, 20], None),
+                              VoidSectionPolygon([8, 16, 12], [25, 25, 39], None)]),
+            ConcreteSectionPolygon([3.5, 17.25, 21, 9.75, -2.5], [-4, -1.5, 11.25, 19, 7.5], None),
+            CompositeSection(ConcreteSectionPolygon([0, 30, 30, 0], [0, 0, 30, 30], None),
+                             [ConcreteSectionPolygon([10, 20, 20, 10], [10, 10, 20, 20], None)])]
+
+
+def _max_abs(results):
+    return np.abs(results).max(axis=tuple(range(results.ndim - 1)))
+
+
+def test_properties_match_each_section():
+    sections = _sections()
+    props = SectionCatalog.from_sections(sections).properties()
+
+    assert props.shape == (len(sections), 6)
+
+    for p, section in zip(props, sections):
+        expected = [section.area, section.cx, section.cy, section.Ix, section.Iy, section.Ixy]
+        assert np.allclose(p, expected, rtol=1e-12, atol=1e-9)
+
+
+@pytest.mark.parametrize('angle', [None, 0.0, 0.9, 3.5])
+def test_stress_blocks_match_per_section_batches(angle):
+    sections = _sections()
+    catalog = SectionCatalog.from_sections(sections)
+
+    ec2 = catalog.ec2_stress_block(FCD, 1.75, EU, EC2, DEPTHS, angle=angle)
+    pca = catalog.pca_stress_block(FC, 0.003, EC, DEPTHS, angle=angle)
+
+    assert ec2.shape == pca.shape == (DEPTHS.shape[0], len(sections), 3)
+    assert np.all(np.isfinite(ec2)) and np.all(np.isfinite(pca))
+
+    for j, section in enumerate(sections):
+        expected = ec2_stress_block_batch(section.segments, FCD, 1.75, EU, EC2, DEPTHS, angle=angle)
+        assert np.allclose(ec2[:,j], expected, rtol=1e-10, atol=1e-12*_max_abs(expected))
+
+        expected = pca_stress_block_batch(section.segments, FC, 0.003, EC, DEPTHS, angle=angle)
+        assert np.allclose(pca[:,j], expected, rtol=1e-10, atol=1e-12*_max_abs(expected))
+
+    # depths c <= 0 have no compression block
+    assert np.array_equal(ec2[:2], np.zeros((2, len(sections), 3)))
+
+
+def test_per_section_depths_and_chunking():
+    sections = _sections()
+    catalog = SectionCatalog.from_sections(sections)
+
+    # a different set of depths for every section
+    C = np.outer(np.linspace(0.1, 1.5, 11), [24, 20, 40, 23, 30])
+
+    results = catalog.ec2_stress_block(FCD, 2, EU, EC2, C)
+
+    for j, section in enumerate(sections):
+        expected = ec2_stress_block_batch(section.segments, FCD, 2, EU, EC2, C[:,j])
+        assert np.allclose(results[:,j], expected, rtol=1e-10, atol=1e-12*_max_abs(expected))
+
+    # small chunks of depths give the same results
+    assert np.array_equal(catalog.ec2_stress_block(FCD, 2, EU, EC2, C, max_elements=50), results)
+
+
+def test_centroidal_save_and_load(tmp_path):
+    catalog = SectionCatalog.from_sections(_sections())
+
+    centered = catalog.centroidal()
+    props = centered.properties()
+
+    assert np.allclose(props[:,1:3], 0, atol=1e-12)
+    assert np.allclose(props[:,0], catalog.properties()[:,0], rtol=1e-12)
+
+    centered.save(str(tmp_path))
+    loaded = SectionCatalog.load(str(tmp_path))
+
+    # still the read only mapped files, not copies
+    assert not loaded.x.flags.writeable and not loaded.x.flags.owndata
+    assert len(loaded) == len(catalog)
+    assert np.array_equal(loaded.properties(), props)
+
+    for i in range(len(catalog)):
+        for a, b in zip(loaded.section_vertices(i), centered.section_vertices(i)):
+            assert np.array_equal(a, b)
+
+
+def test_invalid_offsets_raise():
+    x = [0, 12, 12, 0, 0]
+    y = [0, 0, 24, 24, 0]
+
+    # offsets not ending at the vertex count
+    with pytest.raises(ValueError):
+        SectionCatalog(x, y, [0, 4])
+
+    # a closed ring of only two vertices
+    with pytest.raises(ValueError):
+        SectionCatalog([0, 12, 0], [0, 0, 0], [0, 3])
+
+    # more sections than rings
+
+    with pytest.raises(ValueError):
+        SectionCatalog(x, y, [0, 5], [0, 2])
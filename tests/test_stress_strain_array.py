@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+
+from concretexsection.stress_strain import stress_strain as ss
+from concretexsection.stress_strain import stress_strain_array as sa
+
+# numpy's power differs from math.pow in the last bit for a few percent
+# of random bases, enough strains that the comparisons below would see it
+STRAINS = np.concatenate((np.linspace(-0.005, 0.006, 2001), [0, 0.002, 0.003, 0.0035],
+                          np.random.default_rng(16).uniform(-0.001, 0.004, 5000)))
+
+
+def test_ec2_matches_scalar():
+    for n in (1, 1.4, 1.75, 2):
+        ref = [ss.stress_strain_ec2(4250, 0.002, 0.0035, n, e) for e in STRAINS]
+        assert np.array_equal(sa.stress_strain_ec2_array(4250, 0.002, 0.0035, n, STRAINS), ref)
+
+
+def test_pca_matches_scalar():
+    Ec = 57000*math.sqrt(5000)
+    ref = [ss.stress_strain_pca(5000, 0.003, Ec, e) for e in STRAINS]
+    assert np.array_equal(sa.stress_strain_pca_array(5000, 0.003, Ec, STRAINS), ref)
+
+
+def test_parabolic_curves_match_scalar():
+    for k in (0.8, 0.85, 0.9):
+        ref = [ss.stress_strain_desayi_krishnan(5000, 0.003, k, e) for e in STRAINS]
+        assert np.array_equal(sa.stress_strain_desayi_krishnan_array(5000, 0.003, k, STRAINS), ref)
+
+    for fc in (4000, 9000, 12000):
+        ref = [ss.stress_strain_collins_et_all(fc, 0.003, e) for e in STRAINS]
+        assert np.array_equal(sa.stress_strain_collins_et_all_array(fc, 0.003, STRAINS), ref)
+
+        stress, beta1 = sa.stress_strain_whitney_array(fc, 0.003, STRAINS)
+        assert np.array_equal(stress, [ss.stress_strain_whitney(fc, 0.003, e)[0] for e in STRAINS])
+        assert beta1 == ss.stress_strain_whitney(fc, 0.003, 0)[1]
+
+
+def test_steel_and_strain_at_depth_match_scalar():
+    strains = STRAINS[STRAINS != 0]
+    ref = [ss.stress_strain_steel(60000, 60000/29e6, 29e6, e) for e in strains]
+    assert np.array_equal(sa.stress_strain_steel_array(60000, 60000/29e6, 29e6, strains), ref)
+
+    depths = np.linspace(0, 30, 41)
+    c = np.linspace(0, 40, 33)
+    ref = [[ss.strain_at_depth(0.003, ci, d) for d in depths] for ci in c]
+    assert np.array_equal(sa.strain_at_depth_array(0.003, c[:, None], depths), ref)
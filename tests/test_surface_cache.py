@@ -0,0 +1,22 @@
+import numpy as np
+
+from concretexsection.storage.surface_cache import SurfaceCache
+
+
+def test_read_order_survives_without_close(tmp_path):
+    cache = SurfaceCache(str(tmp_path))
+    cache.put('a', P=np.zeros(1000))
+    cache.put('b', P=np.zeros(1000))
+
+    assert cache.get('a') is not None
+
+    # a second process opening the store sees the read of a, it was not closed
+    other = SurfaceCache(str(tmp_path), max_bytes=cache.size + 100)
+    other.put('c', P=np.zeros(1000))
+
+    assert 'a' in other
+    assert 'b' not in other
+    assert 'c' in other
+
+    other.close()
+    cache.close()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from concretexsection.stress_strain.p_m_by_segment import ec2_stress_block_batch
+from concretexsection.stress_strain.sweep_integrator import StressBlockSweep, ec2_stress_block_sweep
+
+SEGMENTS = np.array([[[0, 0], [12, 0]], [[12, 0], [12, 16]], [[12, 16], [84, 16]], [[84, 16], [84, 24]],
+                     [[84, 24], [-16, 24]], [[-16, 24], [-16, 16]], [[-16, 16], [0, 16]], [[0, 16], [0, 0]]],
+                    dtype=float)
+
+
+@pytest.mark.parametrize('n', [2, 1.75])
+def test_sweep_matches_batch(n):
+    c = np.linspace(0.05, 40, 120)
+
+    ref = ec2_stress_block_batch(SEGMENTS, 4250, n, 0.0035, 0.002, c)
+    got = ec2_stress_block_sweep(SEGMENTS, 4250, n, 0.0035, 0.002, c)
+
+    assert np.allclose(got, ref, rtol=1e-12, atol=1e-6)
+
+
+@pytest.mark.parametrize('n', [2, 1.75])
+def test_zero_depth_gives_zero_resultants(n):
+    sweep = StressBlockSweep(SEGMENTS, 4250, n, 0.0035, 0.002)
+
+    assert np.array_equal(sweep.step(0), np.zeros(3))
+    assert np.array_equal(sweep.step(0.0), np.zeros(3))
+
+    ref = ec2_stress_block_batch(SEGMENTS, 4250, n, 0.0035, 0.002, 5.0)[0]
+    assert np.allclose(sweep.step(5.0), ref, rtol=1e-12)
+
+
+def test_decreasing_depth_raises():
+    sweep = StressBlockSweep(SEGMENTS, 4250, 2, 0.0035, 0.002)
+    sweep.step(5.0)
+
+    with pytest.raises(ValueError):
+        sweep.step(0)
+
+    sweep.reset()
+    assert np.array_equal(sweep.step(-1.0), np.zeros(3))